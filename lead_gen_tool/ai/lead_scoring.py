@@ -1,7 +1,15 @@
 import os
+import re
+import json
+import time
+import random
 import openai
 import logging
-from typing import Dict, Any, Union, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Union, Tuple
+
+from ai.score_cache import ScoreCache
+from ai.pre_scorer import get_pre_scorer
 
 # Configure Logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -9,55 +17,25 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(
 # Initialize OpenAI API
 openai.api_key = os.getenv("OPENAI_API_KEY")
 
-def score_lead(lead: Dict[str, Any]) -> Tuple[int, str]:
-    """
-    Score a lead from 1-10 based on their likelihood to purchase a coaching course.
-    
-    Args:
-        lead: Dictionary containing lead information with some of these keys:
-              - name: Lead's name
-              - job_title: Lead's job title (LinkedIn)
-              - description: Lead's description or bio
-              - comment: Lead's comment (Instagram)
-              - text: Lead's tweet text (Twitter)
-              - content: Lead's full content (Twitter)
-              - platform: Source platform (LinkedIn, Twitter, Instagram)
-    
-    Returns:
-        Tuple containing:
-          - Integer score from 1-10
-          - String rationale for the score
-    """
-    try:
-        # Extract relevant information from the lead
-        name = lead.get('name', '')
-        platform = lead.get('platform', 'unknown')
-        
-        # Compile all available text data about the lead
-        text_data = []
-        
-        if platform == 'linkedin':
-            job_title = lead.get('job_title', '')
-            description = lead.get('description', '')
-            text_data.extend([f"Name: {name}", f"Job Title: {job_title}", f"Description: {description}"])
-        
-        elif platform == 'twitter':
-            tweet_text = lead.get('text', '')
-            content = lead.get('content', '')
-            text_data.extend([f"Username: {name}", f"Tweet: {tweet_text}", f"Content: {content}"])
-        
-        elif platform == 'instagram':
-            username = lead.get('username', '')
-            comment = lead.get('comment', '')
-            text_data.extend([f"Username: {username}", f"Comment: {comment}"])
-        
-        # Create a prompt for the AI
-        prompt = f"""
-        Analyze this potential lead for a personal development/career coaching course:
-        
-        {' '.join(text_data)}
-        
-        Score this lead from 1-10 based on their likelihood to purchase a coaching course, where:
+# Concurrency settings for bulk scoring
+MAX_CONCURRENT_REQUESTS = int(os.getenv("SCORING_MAX_CONCURRENCY", "8"))  # Cap on in-flight GPT-4 calls
+MAX_RATE_LIMIT_RETRIES = 5
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+
+# Batch scoring settings
+BATCH_PROMPT_TOKEN_BUDGET = int(os.getenv("SCORING_BATCH_TOKEN_BUDGET", "3000"))  # Prompt tokens per batched request
+MAX_BATCH_SIZE = 20
+RESPONSE_TOKENS_PER_LEAD = 70  # Room for one {id, score, rationale} item in the reply
+
+QUALIFIED_SCORE = 4  # Minimum score for a qualified lead
+
+SCORING_MODEL = "gpt-4"
+SCORING_PROMPT_VERSION = "2"  # Bump whenever the prompts or rubric change to invalidate cached scores
+SCORING_SYSTEM_PROMPT = "You are a lead scoring assistant that analyzes potential coaching clients."
+
+# Scale and factors shared by the single-lead and batched prompts
+SCORING_RUBRIC = """
         1-3: Very low interest - Not a good fit for coaching
         4-6: Moderate interest - Some potential but not ideal
         7-8: High interest - Strong potential for coaching services
@@ -69,19 +47,82 @@ def score_lead(lead: Dict[str, Any]) -> Tuple[int, str]:
         - Feeling stuck or overwhelmed
         - Receptiveness to guidance
         - Not being a competitor (coach, mentor, consultant)
+"""
+
+# Content-addressed cache of scores, shared by every scoring entry point
+score_cache = ScoreCache(model=SCORING_MODEL, prompt_version=SCORING_PROMPT_VERSION)
+
+
+def _chat_completion_with_backoff(**kwargs):
+    """
+    Call openai.ChatCompletion.create, retrying with exponential backoff and jitter
+    when the API reports a rate limit or a transient overload.
+    """
+    for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+        try:
+            return openai.ChatCompletion.create(**kwargs)
+        except (openai.error.RateLimitError, openai.error.ServiceUnavailableError, openai.error.Timeout) as e:
+            if attempt == MAX_RATE_LIMIT_RETRIES:
+                raise
+            delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt))
+            delay = random.uniform(delay / 2, delay)
+            logging.warning(f"⚠️ OpenAI rate limited ({e.__class__.__name__}). Retrying in {delay:.1f}s...")
+            time.sleep(delay)
+
+def _lead_text(lead: Dict[str, Any]) -> str:
+    """Compile the platform-specific text fields of a lead into a single line for the prompt."""
+    name = lead.get('name', '')
+    platform = lead.get('platform', 'unknown')
+    
+    text_data = []
+    
+    if platform == 'linkedin':
+        job_title = lead.get('job_title', '')
+        description = lead.get('description', '')
+        text_data.extend([f"Name: {name}", f"Job Title: {job_title}", f"Description: {description}"])
+    
+    elif platform == 'twitter':
+        tweet_text = lead.get('text', '')
+        content = lead.get('content', '')
+        text_data.extend([f"Username: {name}", f"Tweet: {tweet_text}", f"Content: {content}"])
+    
+    elif platform == 'instagram':
+        username = lead.get('username', '')
+        comment = lead.get('comment', '')
+        text_data.extend([f"Username: {username}", f"Comment: {comment}"])
+    
+    return ' '.join(text_data)
+
+def _error_result(message: str) -> Dict[str, Any]:
+    return {"score": 0, "rationale": f"Error: {message}", "is_competitor": False}
+
+
+def _request_score(lead_text: str) -> Dict[str, Any]:
+    """
+    Send a single-lead prompt to the LLM, bypassing the cache. The lead is
+    classified as competitor or not and scored in the same request.
+    """
+    try:
+        # Create a prompt for the AI
+        prompt = f"""
+        Analyze this potential lead for a personal development/career coaching course:
         
+        {lead_text}
+        
+        Score this lead from 1-10 based on their likelihood to purchase a coaching course, where:{SCORING_RUBRIC}
         Respond with ONLY a JSON object containing:
         {{
+            "is_competitor": [true if the lead is a coach, mentor, consultant or similar competitor, otherwise false],
             "score": [numeric score 1-10],
             "rationale": [brief explanation for the score]
         }}
         """
         
         # Call the OpenAI API
-        response = openai.ChatCompletion.create(
-            model="gpt-4",
+        response = _chat_completion_with_backoff(
+            model=SCORING_MODEL,
             messages=[
-                {"role": "system", "content": "You are a lead scoring assistant that analyzes potential coaching clients."},
+                {"role": "system", "content": SCORING_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ],
             max_tokens=150,
@@ -93,7 +134,6 @@ def score_lead(lead: Dict[str, Any]) -> Tuple[int, str]:
         
         # Handle possible JSON parsing errors
         try:
-            import json
             result = json.loads(result_text)
             score = int(result.get('score', 0))
             rationale = result.get('rationale', 'No rationale provided')
@@ -101,18 +141,329 @@ def score_lead(lead: Dict[str, Any]) -> Tuple[int, str]:
             # Ensure score is within bounds
             score = max(1, min(10, score))
             
-            return score, rationale
+            return {"score": score, "rationale": rationale, "is_competitor": bool(result.get('is_competitor', False))}
             
         except json.JSONDecodeError:
             logging.error(f"Failed to parse AI response as JSON: {result_text}")
-            return 0, "Error: Failed to parse AI response"
+            return _error_result("Failed to parse AI response")
         except ValueError:
             logging.error(f"Invalid score value in AI response: {result_text}")
-            return 0, "Error: Invalid score value"
+            return _error_result("Invalid score value")
             
     except Exception as e:
         logging.error(f"Error in lead scoring: {str(e)}")
-        return 0, f"Error: {str(e)}"
+        return _error_result(str(e))
+
+
+def score_lead(lead: Dict[str, Any]) -> Tuple[int, str]:
+    """
+    Score a lead from 1-10 based on their likelihood to purchase a coaching course.
+    
+    Args:
+        lead: Dictionary containing lead information with some of these keys:
+              - name: Lead's name
+              - job_title: Lead's job title (LinkedIn)
+              - description: Lead's description or bio
+              - comment: Lead's comment (Instagram)
+              - text: Lead's tweet text (Twitter)
+              - content: Lead's full content (Twitter)
+              - platform: Source platform (LinkedIn, Twitter, Instagram)
+    
+    Returns:
+        Tuple containing:
+          - Integer score from 1-10
+          - String rationale for the score
+    """
+    result = classify_and_score_lead(lead)
+    return result["score"], result["rationale"]
+
+
+def classify_and_score_lead(lead: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Classify a lead as competitor or not and score it in a single LLM request.
+    
+    Args:
+        lead: Dictionary containing lead information (see score_lead)
+        
+    Returns:
+        Dictionary with "is_competitor", "score" and "rationale"
+    """
+    lead_text = _lead_text(lead)
+    cached = score_cache.get(lead_text)
+    if cached:
+        return cached
+
+    result = _request_score(lead_text)
+    if result["score"] > 0:  # Never cache error results
+        score_cache.set(lead_text, result)
+    return result
+
+
+def _apply_result(lead: Dict[str, Any], result: Dict[str, Any]):
+    lead["score"] = result["score"]
+    lead["rationale"] = result["rationale"]
+    if "is_competitor" in result:
+        lead["is_competitor"] = result["is_competitor"]
+
+
+def _apply_cached_scores(leads: List[Dict[str, Any]], lead_texts: List[str],
+                         use_cache: bool = True) -> Tuple[List[int], Dict[int, int]]:
+    """
+    Fill in scores for cached leads (with use_cache=False only duplicates are collapsed).
+    
+    Returns:
+        Tuple containing:
+          - Indices of leads with unique, uncached content that still need scoring
+          - Mapping of duplicate-content lead indices to the pending index they copy
+    """
+    cached = score_cache.get_many(lead_texts) if use_cache else {}
+    pending = []
+    duplicates = {}
+    first_seen = {}
+    for index, text in enumerate(lead_texts):
+        if text in cached:
+            _apply_result(leads[index], cached[text])
+            continue
+        key = score_cache.key(text)
+        if key in first_seen:
+            duplicates[index] = first_seen[key]
+        else:
+            first_seen[key] = index
+            pending.append(index)
+    return pending, duplicates
+
+
+def _apply_pre_scorer(leads: List[Dict[str, Any]], pending: List[int]) -> List[int]:
+    """Resolve confident leads with the local pre-scorer and return the indices still needing the LLM."""
+    pre_scorer = get_pre_scorer()
+    if pre_scorer is None:
+        return pending
+
+    uncertain = []
+    for index in pending:
+        decision = pre_scorer.decide(leads[index])
+        # Leads awaiting a competitor check still need the combined LLM call unless discarded
+        awaiting_check = leads[index].get("competitor_check") == "pending"
+        if decision is None or (awaiting_check and decision[0] >= QUALIFIED_SCORE):
+            uncertain.append(index)
+        else:
+            leads[index]["score"], leads[index]["rationale"] = decision
+
+    if len(uncertain) < len(pending):
+        logging.info(f"⚡ Pre-scorer resolved {len(pending) - len(uncertain)} of {len(pending)} leads without the LLM.")
+    return uncertain
+
+
+def _copy_duplicate_scores(leads: List[Dict[str, Any]], duplicates: Dict[int, int]):
+    """Give duplicate-content leads the score of the lead that was actually sent."""
+    for index, source in duplicates.items():
+        _apply_result(leads[index], leads[source])
+
+
+def _store_scores(leads: List[Dict[str, Any]], lead_texts: List[str], indices: List[int]):
+    """Write freshly computed, non-error scores back to the cache."""
+    score_cache.set_many([
+        (lead_texts[i], {"score": leads[i]["score"], "rationale": leads[i]["rationale"], "is_competitor": leads[i].get("is_competitor", False)})
+        for i in indices if leads[i].get("score", 0) > 0
+    ])
+
+
+def score_leads(leads: List[Dict[str, Any]], max_concurrency: int = MAX_CONCURRENT_REQUESTS) -> List[Dict[str, Any]]:
+    """
+    Score many leads concurrently, with at most `max_concurrency` requests in flight.
+    
+    Args:
+        leads: List of lead dictionaries (see score_lead)
+        max_concurrency: Maximum number of simultaneous OpenAI requests
+        
+    Returns:
+        The same leads, in input order, each with "score" and "rationale" set
+        (plus "is_competitor" when the LLM or the cache classified them)
+    """
+    if not leads:
+        return leads
+
+    lead_texts = [_lead_text(lead) for lead in leads]
+    pending, duplicates = _apply_cached_scores(leads, lead_texts)
+    pending = _apply_pre_scorer(leads, pending)
+    if pending:
+        _score_individually(leads, lead_texts, pending, max_concurrency)
+        logging.info(f"📊 Scored {len(pending)} leads individually ({len(leads) - len(pending)} cached, duplicate or pre-scored).")
+    _copy_duplicate_scores(leads, duplicates)
+    return leads
+
+
+def _score_individually(leads: List[Dict[str, Any]], lead_texts: List[str], indices: List[int], max_concurrency: int):
+    """Score the given leads with one concurrent request each and cache the results."""
+    workers = max(1, min(max_concurrency, len(indices)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lead-scoring") as executor:
+        # executor.map yields results in submission order
+        results = executor.map(_request_score, [lead_texts[i] for i in indices])
+        for index, result in zip(indices, results):
+            _apply_result(leads[index], result)
+
+    _store_scores(leads, lead_texts, indices)
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token for English text)."""
+    return len(text) // 4 + 1
+
+
+def _build_batches(lead_texts: List[str], token_budget: int) -> List[List[int]]:
+    """
+    Pack lead indices into batches whose prompt text fits within `token_budget`.
+    The fixed rubric is counted once per batch; a lead that exceeds the budget
+    on its own is placed in a batch by itself.
+    """
+    overhead = _estimate_tokens(SCORING_RUBRIC) + 100  # Rubric, instructions and system prompt
+    batches = []
+    current = []
+    current_tokens = overhead
+
+    for index, text in enumerate(lead_texts):
+        lead_tokens = _estimate_tokens(text) + 5  # "[id] " prefix and newline
+        if current and (current_tokens + lead_tokens > token_budget or len(current) >= MAX_BATCH_SIZE):
+            batches.append(current)
+            current = []
+            current_tokens = overhead
+        current.append(index)
+        current_tokens += lead_tokens
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _score_batch(lead_texts: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Classify and score several leads in a single request.
+    
+    Args:
+        lead_texts: Prompt text for each lead (see _lead_text)
+        
+    Returns:
+        One {is_competitor, score, rationale} dict per lead, or None for leads whose
+        result could not be parsed from the response
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(lead_texts)
+    # One line per lead so ids stay unambiguous
+    numbered_leads = "\n".join(f"[{i}] {' '.join(text.split())}" for i, text in enumerate(lead_texts))
+
+    prompt = f"""
+        Analyze each of these potential leads for a personal development/career coaching course.
+        Each lead is prefixed with its numeric id in square brackets:
+        
+        {numbered_leads}
+        
+        Score each lead independently from 1-10 based on their likelihood to purchase a coaching course, where:{SCORING_RUBRIC}
+        Also decide whether each lead is a coach, mentor, consultant or similar competitor.
+        
+        Respond with ONLY a JSON array containing one object per lead:
+        [
+            {{"id": [lead id], "is_competitor": [true or false], "score": [numeric score 1-10], "rationale": [brief explanation for the score]}}
+        ]
+        """
+
+    try:
+        response = _chat_completion_with_backoff(
+            model=SCORING_MODEL,
+            messages=[
+                {"role": "system", "content": SCORING_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=RESPONSE_TOKENS_PER_LEAD * len(lead_texts) + 50,
+            temperature=0.3
+        )
+        result_text = response.choices[0].message.content.strip()
+    except Exception as e:
+        logging.error(f"Error in batch lead scoring: {str(e)}")
+        return results
+
+    # Tolerate code fences or stray text around the array
+    match = re.search(r"\[.*\]", result_text, re.DOTALL)
+    try:
+        items = json.loads(match.group(0) if match else result_text)
+    except json.JSONDecodeError:
+        logging.error(f"Failed to parse batch AI response as JSON: {result_text}")
+        return results
+
+    if not isinstance(items, list):
+        return results
+
+    for item in items:
+        try:
+            index = int(item["id"])
+            score = max(1, min(10, int(item["score"])))
+        except (KeyError, TypeError, ValueError):
+            continue
+        if 0 <= index < len(results):
+            results[index] = {
+                "score": score,
+                "rationale": item.get("rationale", "No rationale provided"),
+                "is_competitor": bool(item.get("is_competitor", False))
+            }
+
+    return results
+
+
+def score_leads_batched(leads: List[Dict[str, Any]],
+                        token_budget: int = BATCH_PROMPT_TOKEN_BUDGET,
+                        max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+                        fresh: bool = False) -> List[Dict[str, Any]]:
+    """
+    Score many leads by packing them into multi-lead requests, so the rubric is
+    sent once per batch instead of once per lead. Batches are sent concurrently
+    and any lead missing from a batch response is re-scored individually.
+    
+    Args:
+        leads: List of lead dictionaries (see score_lead)
+        token_budget: Approximate prompt token budget per batched request
+        max_concurrency: Maximum number of simultaneous OpenAI requests
+        fresh: Ask the LLM for every lead, skipping the score cache and the
+               pre-scorer (explicit rescores); the new scores replace cached ones
+        
+    Returns:
+        The same leads, in input order, each with "score" and "rationale" set
+        (plus "is_competitor" when the LLM or the cache classified them)
+    """
+    if not leads:
+        return leads
+
+    lead_texts = [_lead_text(lead) for lead in leads]
+    pending, duplicates = _apply_cached_scores(leads, lead_texts, use_cache=not fresh)
+    if not fresh:
+        pending = _apply_pre_scorer(leads, pending)
+    if not pending:
+        _copy_duplicate_scores(leads, duplicates)
+        logging.info(f"📊 All {len(leads)} leads resolved without the LLM.")
+        return leads
+
+    batches = [[pending[i] for i in batch] for batch in _build_batches([lead_texts[i] for i in pending], token_budget)]
+
+    workers = max(1, min(max_concurrency, len(batches)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lead-scoring") as executor:
+        batch_results = executor.map(lambda batch: _score_batch([lead_texts[i] for i in batch]), batches)
+
+        parsed = []
+        unparsed = []
+        for batch, results in zip(batches, batch_results):
+            for index, result in zip(batch, results):
+                if result is None:
+                    unparsed.append(index)
+                else:
+                    _apply_result(leads[index], result)
+                    parsed.append(index)
+
+    _store_scores(leads, lead_texts, parsed)
+
+    if unparsed:
+        logging.warning(f"⚠️ {len(unparsed)} leads missing from batch responses. Falling back to per-lead scoring.")
+        _score_individually(leads, lead_texts, unparsed, max_concurrency)
+
+    _copy_duplicate_scores(leads, duplicates)
+    logging.info(f"📊 Scored {len(pending)} leads in {len(batches)} batched requests ({len(leads) - len(pending)} cached, duplicate or pre-scored).")
+    return leads
 
 
 def is_qualified_lead(lead: Dict[str, Any], min_score: int = 4) -> bool:
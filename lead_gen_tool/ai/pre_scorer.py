@@ -0,0 +1,282 @@
+import os
+import re
+import json
+import math
+import random
+import logging
+import argparse
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+# Configure Logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# Pre-scorer settings
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PRE_SCORER_MODEL_PATH = os.getenv("PRE_SCORER_MODEL_PATH", os.path.join(BASE_DIR, "../config/pre_scorer_model.json"))
+PRE_SCORER_ENABLED = os.getenv("PRE_SCORER_ENABLED", "1") == "1"
+QUALIFIED_SCORE = 4  # Same cut-off as /scrape-all
+TARGET_AGREEMENT = 0.95  # Required agreement with the LLM inside the auto-accept/auto-discard bands
+MIN_BAND_SUPPORT = 20  # Minimum calibration samples required to open a band
+CALIBRATION_FRACTION = 0.2
+EPOCHS = 15
+LEARNING_RATE = 0.5
+L2_PENALTY = 1e-4
+
+TEXT_FIELDS = ["name", "username", "job_title", "description", "comment", "post_text", "text", "content"]
+TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+
+def lead_document_text(lead: Dict[str, Any]) -> str:
+    """Concatenate every text field the scorer looks at."""
+    return " ".join(str(lead.get(field, "")) for field in TEXT_FIELDS if lead.get(field))
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word unigrams and bigrams."""
+    words = TOKEN_PATTERN.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def _sigmoid(x: float) -> float:
+    if x < -35:
+        return 0.0
+    if x > 35:
+        return 1.0
+    return 1.0 / (1.0 + math.exp(-x))
+
+
+class PreScorer:
+    """
+    CPU-only TF-IDF + logistic regression model that predicts whether the LLM
+    would qualify a lead (score >= 4).
+
+    Leads whose probability falls inside the calibrated confident bands are
+    accepted or discarded locally; everything in between still goes to GPT-4.
+    """
+
+    def __init__(self):
+        self.idf: Dict[str, float] = {}
+        self.weights: Dict[str, float] = {}
+        self.bias = 0.0
+        self.accept_threshold = 1.01  # Bands start closed until calibrated
+        self.discard_threshold = -0.01
+        self.accept_score = 7
+        self.discard_score = 2
+        self.metadata: Dict[str, Any] = {}
+
+    # --- Features -------------------------------------------------------
+
+    def _vectorize(self, text: str) -> Dict[str, float]:
+        counts = Counter(token for token in tokenize(text) if token in self.idf)
+        vector = {token: (1 + math.log(count)) * self.idf[token] for token, count in counts.items()}
+        norm = math.sqrt(sum(value * value for value in vector.values()))
+        if norm:
+            vector = {token: value / norm for token, value in vector.items()}
+        return vector
+
+    def _fit_idf(self, texts: List[str], min_df: int = 2):
+        document_frequency = Counter()
+        for text in texts:
+            document_frequency.update(set(tokenize(text)))
+        total = len(texts)
+        self.idf = {
+            token: math.log((1 + total) / (1 + df)) + 1
+            for token, df in document_frequency.items() if df >= min_df
+        }
+
+    # --- Training -------------------------------------------------------
+
+    def predict_proba(self, lead: Dict[str, Any]) -> float:
+        """Probability that the LLM would score this lead as qualified."""
+        vector = self._vectorize(lead_document_text(lead))
+        return _sigmoid(self.bias + sum(self.weights.get(token, 0.0) * value for token, value in vector.items()))
+
+    def _train_weights(self, samples: List[Tuple[Dict[str, float], int]], seed: int):
+        rng = random.Random(seed)
+        self.weights = {}
+        self.bias = 0.0
+        order = list(range(len(samples)))
+
+        for epoch in range(EPOCHS):
+            rng.shuffle(order)
+            rate = LEARNING_RATE / (1 + epoch)
+            for i in order:
+                vector, label = samples[i]
+                error = _sigmoid(self.bias + sum(self.weights.get(t, 0.0) * v for t, v in vector.items())) - label
+                self.bias -= rate * error
+                for token, value in vector.items():
+                    weight = self.weights.get(token, 0.0)
+                    self.weights[token] = weight - rate * (error * value + L2_PENALTY * weight)
+
+    def _calibrate(self, leads: List[Dict[str, Any]]):
+        """Pick the widest bands whose agreement with the stored LLM labels meets TARGET_AGREEMENT."""
+        scored = sorted(((self.predict_proba(lead), lead["score"] >= QUALIFIED_SCORE) for lead in leads), key=lambda x: x[0])
+
+        self.discard_threshold = -0.01
+        negatives = 0
+        for count, (probability, qualified) in enumerate(scored, start=1):
+            negatives += not qualified
+            if probability >= 0.5:
+                break
+            if count >= MIN_BAND_SUPPORT and negatives / count >= TARGET_AGREEMENT:
+                self.discard_threshold = probability
+
+        self.accept_threshold = 1.01
+        positives = 0
+        for count, (probability, qualified) in enumerate(reversed(scored), start=1):
+            positives += qualified
+            if probability < 0.5:
+                break
+            if count >= MIN_BAND_SUPPORT and positives / count >= TARGET_AGREEMENT:
+                self.accept_threshold = probability
+
+    def fit(self, leads: List[Dict[str, Any]], seed: int = 42) -> "PreScorer":
+        """
+        Train on leads carrying an LLM score, holding out a slice to calibrate the bands.
+
+        Args:
+            leads: Historical leads with a numeric "score"
+            seed: Random seed for the split and SGD order
+        """
+        leads = list(leads)
+        random.Random(seed).shuffle(leads)
+        split = max(1, int(len(leads) * CALIBRATION_FRACTION))
+        calibration, training = leads[:split], leads[split:]
+
+        self._fit_idf([lead_document_text(lead) for lead in training])
+        samples = [(self._vectorize(lead_document_text(lead)), int(lead["score"] >= QUALIFIED_SCORE)) for lead in training]
+        self._train_weights(samples, seed)
+        self._calibrate(calibration)
+
+        qualified_scores = sorted(lead["score"] for lead in leads if lead["score"] >= QUALIFIED_SCORE)
+        discarded_scores = sorted(lead["score"] for lead in leads if lead["score"] < QUALIFIED_SCORE)
+        if qualified_scores:
+            self.accept_score = qualified_scores[len(qualified_scores) // 2]
+        if discarded_scores:
+            self.discard_score = discarded_scores[len(discarded_scores) // 2]
+
+        self.metadata = {"trained_at": datetime.utcnow().isoformat(), "samples": len(leads)}
+        return self
+
+    # --- Inference ------------------------------------------------------
+
+    def decide(self, lead: Dict[str, Any]) -> Optional[Tuple[int, str]]:
+        """
+        Return a local (score, rationale) for confident cases, or None if the lead
+        should be sent to the LLM.
+        """
+        probability = self.predict_proba(lead)
+        if probability >= self.accept_threshold:
+            return self.accept_score, f"Pre-scorer: auto-accepted (p={probability:.2f})"
+        if probability <= self.discard_threshold:
+            return self.discard_score, f"Pre-scorer: auto-discarded (p={probability:.2f})"
+        return None
+
+    def save(self, path: str = PRE_SCORER_MODEL_PATH):
+        with open(path, "w") as f:
+            json.dump({
+                "idf": self.idf,
+                "weights": {token: round(weight, 6) for token, weight in self.weights.items() if abs(weight) > 1e-6},
+                "bias": self.bias,
+                "accept_threshold": self.accept_threshold,
+                "discard_threshold": self.discard_threshold,
+                "accept_score": self.accept_score,
+                "discard_score": self.discard_score,
+                "metadata": self.metadata
+            }, f)
+        logging.info(f"✅ Pre-scorer model saved to {path}")
+
+    @classmethod
+    def load(cls, path: str = PRE_SCORER_MODEL_PATH) -> "PreScorer":
+        with open(path, "r") as f:
+            data = json.load(f)
+        model = cls()
+        model.idf = data["idf"]
+        model.weights = data["weights"]
+        model.bias = data["bias"]
+        model.accept_threshold = data["accept_threshold"]
+        model.discard_threshold = data["discard_threshold"]
+        model.accept_score = data["accept_score"]
+        model.discard_score = data["discard_score"]
+        model.metadata = data.get("metadata", {})
+        return model
+
+
+_pre_scorer = None
+_pre_scorer_loaded = False
+
+
+def get_pre_scorer() -> Optional[PreScorer]:
+    """Return the trained pre-scorer, or None if it is disabled or has not been trained yet."""
+    global _pre_scorer, _pre_scorer_loaded
+    if not _pre_scorer_loaded:
+        _pre_scorer_loaded = True
+        if PRE_SCORER_ENABLED and os.path.exists(PRE_SCORER_MODEL_PATH):
+            try:
+                _pre_scorer = PreScorer.load()
+                logging.info(f"✅ Loaded pre-scorer model ({_pre_scorer.metadata.get('samples', '?')} training samples).")
+            except Exception as e:
+                logging.warning(f"⚠️ Failed to load pre-scorer model: {e}. All leads will go to the LLM.")
+    return _pre_scorer
+
+
+def load_training_leads() -> List[Dict[str, Any]]:
+    """Fetch every LLM-scored lead from the leads and discarded_leads collections."""
+    from database.mongodb import get_db
+    db = get_db()
+    projection = {field: 1 for field in TEXT_FIELDS + ["score", "rationale"]}
+    query = {"score": {"$gt": 0}}
+    leads = []
+    for collection in ("leads", "discarded_leads"):
+        for lead in db[collection].find(query, projection):
+            # Skip labels produced by the pre-scorer itself
+            if not str(lead.get("rationale", "")).startswith("Pre-scorer"):
+                leads.append(lead)
+    return leads
+
+
+def evaluate(leads: List[Dict[str, Any]], test_fraction: float = 0.2, seed: int = 7) -> Dict[str, Any]:
+    """
+    Train on part of the history and report, on the held-out part, how often the
+    pre-scorer agrees with the LLM and what fraction of LLM calls it would save.
+    """
+    leads = list(leads)
+    random.Random(seed).shuffle(leads)
+    split = max(1, int(len(leads) * test_fraction))
+    test, train = leads[:split], leads[split:]
+
+    model = PreScorer().fit(train)
+    decided = agreed = 0
+    for lead in test:
+        decision = model.decide(lead)
+        if decision is None:
+            continue
+        decided += 1
+        agreed += (decision[0] >= QUALIFIED_SCORE) == (lead["score"] >= QUALIFIED_SCORE)
+
+    return {
+        "train_samples": len(train),
+        "test_samples": len(test),
+        "accept_threshold": round(model.accept_threshold, 4),
+        "discard_threshold": round(model.discard_threshold, 4),
+        "agreement_rate": round(agreed / decided, 4) if decided else None,
+        "llm_calls_saved": round(decided / len(test), 4) if test else 0.0
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train or evaluate the local lead pre-scorer.")
+    parser.add_argument("command", choices=["train", "evaluate"])
+    args = parser.parse_args()
+
+    history = load_training_leads()
+    logging.info(f"📚 Loaded {len(history)} LLM-scored leads.")
+
+    if args.command == "train":
+        PreScorer().fit(history).save()
+    else:
+        report = evaluate(history)
+        logging.info(f"📈 Agreement with LLM: {report['agreement_rate']} | LLM calls saved: {report['llm_calls_saved']}")
+        print(json.dumps(report, indent=2))
@@ -0,0 +1,156 @@
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pymongo import UpdateOne, errors
+
+# Configure Logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# Cache settings
+SCORE_CACHE_COLLECTION = "score_cache"
+SCORE_CACHE_TTL_SECONDS = int(os.getenv("SCORE_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))  # 30 days
+SCORE_CACHE_MAX_ENTRIES = int(os.getenv("SCORE_CACHE_MAX_ENTRIES", "10000"))  # In-process LRU size
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse whitespace so formatting-only changes share a cache entry."""
+    return " ".join(text.lower().split())
+
+
+class ScoreCache:
+    """
+    Two-level cache of lead scores keyed on a hash of the normalized scoring input,
+    the model and the prompt version.
+
+    Lookups go to an in-process LRU first and then to a MongoDB collection with a
+    TTL index, so identical content is only ever sent to the LLM once per TTL window.
+    """
+
+    def __init__(self, model: str, prompt_version: str, max_entries: int = SCORE_CACHE_MAX_ENTRIES):
+        self.model = model
+        self.prompt_version = prompt_version
+        self.max_entries = max_entries
+        self._lru: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._collection = None
+        self._mongo_disabled = False
+        self._stats = {"memory_hits": 0, "mongo_hits": 0, "misses": 0}
+
+    def key(self, text: str) -> str:
+        """Return the content address for a piece of scoring input."""
+        payload = f"{self.model}\x00{self.prompt_version}\x00{normalize_text(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _get_collection(self):
+        """Lazily resolve the Mongo collection; fall back to memory-only on failure."""
+        if self._collection is None and not self._mongo_disabled:
+            try:
+                # Imported here to avoid a circular import with database.mongodb
+                from database.mongodb import get_db
+                collection = get_db()[SCORE_CACHE_COLLECTION]
+                collection.create_index("created_at", expireAfterSeconds=SCORE_CACHE_TTL_SECONDS)
+                self._collection = collection
+            except Exception as e:
+                logging.warning(f"⚠️ Score cache unavailable in MongoDB ({e}). Using in-process cache only.")
+                self._mongo_disabled = True
+        return self._collection
+
+    def _remember(self, key: str, value: Dict[str, Any]):
+        with self._lock:
+            self._lru[key] = value
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def get_many(self, texts: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up cached scores for several inputs with at most one Mongo round trip.
+
+        Args:
+            texts: Scoring inputs
+
+        Returns:
+            Mapping of input text to its cached result ({score, rationale, is_competitor}) for every hit
+        """
+        found = {}
+        missing = {}
+
+        with self._lock:
+            for text in texts:
+                key = self.key(text)
+                if key in self._lru:
+                    self._lru.move_to_end(key)
+                    found[text] = self._lru[key]
+                    self._stats["memory_hits"] += 1
+                else:
+                    missing.setdefault(key, []).append(text)
+
+        collection = self._get_collection() if missing else None
+        if collection is not None:
+            try:
+                for doc in collection.find({"_id": {"$in": list(missing)}}, {"score": 1, "rationale": 1, "is_competitor": 1}):
+                    value = {"score": doc["score"], "rationale": doc["rationale"], "is_competitor": doc.get("is_competitor", False)}
+                    self._remember(doc["_id"], value)
+                    for text in missing.pop(doc["_id"]):
+                        found[text] = value
+                        with self._lock:
+                            self._stats["mongo_hits"] += 1
+            except errors.PyMongoError as e:
+                logging.warning(f"⚠️ Score cache lookup failed: {e}")
+
+        with self._lock:
+            self._stats["misses"] += sum(len(pending) for pending in missing.values())
+        return found
+
+    def get(self, text: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for a scoring input, or None."""
+        return self.get_many([text]).get(text)
+
+    def set_many(self, items: List[Tuple[str, Dict[str, Any]]]):
+        """
+        Store several (text, {score, rationale, is_competitor}) results in both cache layers.
+        """
+        if not items:
+            return
+
+        operations = []
+        now = datetime.utcnow()
+        for text, result in items:
+            key = self.key(text)
+            value = {"score": result["score"], "rationale": result["rationale"], "is_competitor": result.get("is_competitor", False)}
+            self._remember(key, value)
+            operations.append(UpdateOne(
+                {"_id": key},
+                {"$set": {
+                    **value,
+                    "model": self.model,
+                    "prompt_version": self.prompt_version,
+                    "created_at": now
+                }},
+                upsert=True
+            ))
+
+        collection = self._get_collection()
+        if collection is not None:
+            try:
+                collection.bulk_write(operations, ordered=False)
+            except errors.PyMongoError as e:
+                logging.warning(f"⚠️ Score cache write failed: {e}")
+
+    def set(self, text: str, result: Dict[str, Any]):
+        """Store a single scoring result."""
+        self.set_many([(text, result)])
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and the overall hit rate."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._lru)
+        lookups = stats["memory_hits"] + stats["mongo_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["mongo_hits"]) / lookups, 4) if lookups else 0.0
+        return stats
@@ -0,0 +1,113 @@
+import os
+import uuid
+import logging
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+# Configure Logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+JOB_WORKERS = int(os.getenv("SCRAPE_JOB_WORKERS", "2"))  # Scrape jobs allowed to run at once
+MAX_FINISHED_JOBS = 100  # Finished jobs kept for status polling
+
+
+class Job:
+    """A background job with thread-safe progress counters."""
+
+    def __init__(self, name: str):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.status = "queued"
+        self.stage = None
+        self.progress: Dict[str, int] = {}
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    def set_stage(self, stage: str):
+        with self._lock:
+            self.stage = stage
+
+    def update(self, **counters: int):
+        """Set progress counters (e.g. leads_found=120)."""
+        with self._lock:
+            self.progress.update(counters)
+
+    def increment(self, counter: str, amount: int = 1):
+        with self._lock:
+            self.progress[counter] = self.progress.get(counter, 0) + amount
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "id": self.id,
+                "name": self.name,
+                "status": self.status,
+                "stage": self.stage,
+                "progress": dict(self.progress),
+                "result": self.result,
+                "error": self.error,
+                "created_at": self.created_at.isoformat(),
+                "started_at": self.started_at.isoformat() if self.started_at else None,
+                "finished_at": self.finished_at.isoformat() if self.finished_at else None
+            }
+
+
+class JobManager:
+    """
+    Runs blocking work (scrapers, LLM calls, pymongo) in a worker pool off the
+    event loop and keeps job state in memory for status polling.
+    """
+
+    def __init__(self, max_workers: int = JOB_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, name: str, work: Callable[[Job], Dict[str, Any]]) -> Job:
+        """
+        Queue `work(job)` on the worker pool. Its return value becomes the job result.
+        """
+        job = Job(name)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job, work)
+        logging.info(f"🗂️ Queued {name} job {job.id}")
+        return job
+
+    def _run(self, job: Job, work: Callable[[Job], Dict[str, Any]]):
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        try:
+            job.result = work(job)
+            job.status = "completed"
+            logging.info(f"✅ {job.name} job {job.id} completed")
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+            logging.error(f"❌ {job.name} job {job.id} failed: {e}")
+        finally:
+            job.finished_at = datetime.utcnow()
+
+    def _prune(self):
+        """Drop the oldest finished jobs beyond MAX_FINISHED_JOBS."""
+        finished = [job for job in self._jobs.values() if job.finished_at is not None]
+        for job in sorted(finished, key=lambda j: j.finished_at)[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job.id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> List[Job]:
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda j: j.created_at, reverse=True)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
@@ -1,19 +1,27 @@
-from fastapi import FastAPI, HTTPException
-from pymongo import MongoClient
+from fastapi import Body, FastAPI, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from bson import ObjectId
-import openai
 import os
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-from time import sleep
+import asyncio
 import logging
-
-# Import Scrapers & Database Functions
-from scrapers.linkedin_scraper import scrape_google_for_linkedin_profiles
-from scrapers.instagram_scraper import scrape_instagram_comments
-from scrapers.twitter_scraper import scrape_serpapi_for_tweets
+import threading
+from typing import Any, Dict, List, Literal, Optional, Tuple
+
+# Import Database Functions. Scrapers (Selenium, Chrome tooling) and scoring (OpenAI)
+# are imported where they are used, so the API starts without loading them.
+from scrapers.pipeline import run_pipeline
+from scrapers.serpapi_cache import get_serpapi_cache
+from scrapers.sheets_sink import get_sheets_sink, close_sheets_sinks
+from scrapers.sheets_client import open_worksheet
+from scrapers.browser_pool import close_browser_pools
+from api.jobs import Job, JobManager
+from api.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursor, build_filter, fetch_page, stream_ndjson
 from database.mongodb import get_db
-from ai.lead_scoring import score_lead, is_qualified_lead
+from database.async_mongodb import async_mongodb
+from database.lead_writer import LeadWriter
+from database.sheet_index import SheetUrlIndex
+from database.pool_stats import pool_stats
 
 # Configure Logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -21,31 +29,50 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(
 # Initialize FastAPI app
 app = FastAPI()
 
-# Connect to MongoDB
-db = get_db()
-leads_collection = db["leads"]
-blacklist_collection = db["blacklist"]
-discarded_collection = db["discarded_leads"]  # New collection for low-scoring leads
+# Background worker pool for scrape jobs, so blocking work never runs on the event loop
+job_manager = JobManager()
+
+# MongoDB: request handlers use the async (Motor) client so database calls never block the
+# event loop; scrape jobs on worker threads use the synchronous get_db(). Both connect on first use.
 
 # Google Sheets API Setup
 SHEET_NAME = "Master Leads Sheet"
-GOOGLE_SHEETS_CREDENTIALS = "config/google_sheets_credentials.json"
-scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+SHEET_HEADER = ["Name", "Platform", "URL", "Score", "Rationale"]  # Added Score and Rationale columns
+
+MAX_BULK_LEADS = int(os.getenv("MAX_BULK_LEADS", "5000"))  # Lead ids accepted by one bulk blacklist/rescore request
+
+
+def get_master_sheet():
+    """Open (or create) the master sheet on first use."""
+    return open_worksheet(SHEET_NAME, header=SHEET_HEADER)
+
+
+def index_written_rows(rows):
+    """Index the URLs of rows once they are in the sheet."""
+    sheet_url_index = get_sheet_url_index()
+    sheet_url_index.add_many(sheet_url_index.row_urls(rows))
 
-# Ensure the credentials file exists before proceeding
-if not os.path.exists(GOOGLE_SHEETS_CREDENTIALS):
-    logging.error(f"❌ Google Sheets credentials file not found: {GOOGLE_SHEETS_CREDENTIALS}")
-    raise FileNotFoundError(f"Google Sheets credentials file not found: {GOOGLE_SHEETS_CREDENTIALS}")
 
-creds = ServiceAccountCredentials.from_json_keyfile_name(GOOGLE_SHEETS_CREDENTIALS, scope)
-client = gspread.authorize(creds)
+def forget_dropped_rows(rows):
+    """Rows the sink gave up on are not in the sheet; let their URLs be added again."""
+    sheet_url_index = get_sheet_url_index()
+    sheet_url_index.discard_queued(sheet_url_index.row_urls(rows))
 
-# Ensure the master sheet exists
-try:
-    sheet = client.open(SHEET_NAME).sheet1
-except gspread.exceptions.SpreadsheetNotFound:
-    sheet = client.create(SHEET_NAME).sheet1
-    sheet.append_row(["Name", "Platform", "URL", "Score", "Rationale"])  # Added Score and Rationale columns
+
+# New rows are appended in batches from a background thread
+sheet_sink = get_sheets_sink(SHEET_NAME, get_master_sheet, on_written=index_written_rows, on_dropped=forget_dropped_rows)
+
+_sheet_url_index = None
+_sheet_url_index_lock = threading.Lock()
+
+
+def get_sheet_url_index() -> SheetUrlIndex:
+    """URLs already in the sheet, so dedup never has to read the whole sheet."""
+    global _sheet_url_index
+    with _sheet_url_index_lock:
+        if _sheet_url_index is None:
+            _sheet_url_index = SheetUrlIndex(get_db(), SHEET_NAME, url_column=3)
+        return _sheet_url_index
 
 
 # ✅ Check if service is running
@@ -54,99 +81,251 @@ async def root():
     return {"message": "Lead Generation API is running!"}
 
 
-# 🔄 Run all scrapers sequentially
-@app.get("/scrape-all")
+# 🔄 Run all scrapers concurrently as a background job
+@app.post("/scrape-all", status_code=202)
 async def scrape_all():
-    total_leads = []
-    qualified_leads = []
-    discarded_leads = []
-
-    logging.info("🚀 Running LinkedIn Scraper...")
-    linkedin_leads = scrape_google_for_linkedin_profiles(max_profiles=50)
-    total_leads.extend(linkedin_leads)
-    sleep(2)  # Prevent rate-limiting
-
-    logging.info("🚀 Running Instagram Scraper...")
-    instagram_leads = scrape_instagram_comments(max_comments=50)
-    total_leads.extend(instagram_leads)
-    sleep(2)
-
-    logging.info("🚀 Running Twitter Scraper...")
-    twitter_leads = scrape_serpapi_for_tweets(max_tweets=50)
-    total_leads.extend(twitter_leads)
-
-    # Score and filter leads
-    for lead in total_leads:
-        score, rationale = score_lead(lead)
-        lead["score"] = score
-        lead["rationale"] = rationale
-        
-        if score >= 4:
-            qualified_leads.append(lead)
-            logging.info(f"✅ Qualified lead: {lead.get('name', lead.get('username', 'Unknown'))} - Score: {score}")
-        else:
-            discarded_leads.append(lead)
-            logging.info(f"❌ Discarded lead: {lead.get('name', lead.get('username', 'Unknown'))} - Score: {score}")
-            
-            # Store discarded lead in separate collection for analysis
-            discarded_collection.insert_one(lead)
-
-    # Consolidate qualified leads into Google Sheets
-    cleaned_leads = consolidate_leads_to_sheet(qualified_leads)
+    job = job_manager.submit("scrape-all", run_scrape_all)
+    return {"job_id": job.id, "status": job.status}
+
+
+# 🗂️ Poll a background job
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+# 🗂️ List recent background jobs
+@app.get("/jobs")
+async def list_jobs():
+    return [job.to_dict() for job in job_manager.list()]
+
+
+# 🔁 Rebuild the sheet URL index from the sheet (on demand)
+@app.post("/sheet-index/resync", status_code=202)
+async def resync_sheet_index():
+    def resync(job: Job):
+        job.set_stage("flushing")
+        sheet_sink.flush(timeout=60)
+        job.set_stage("resyncing")
+        return {"urls_indexed": get_sheet_url_index().resync(get_master_sheet())}
+
+    job = job_manager.submit("sheet-index-resync", resync)
+    return {"job_id": job.id, "status": job.status}
+
+
+@app.on_event("startup")
+async def ensure_async_indexes():
+    # In the background, so the API starts (and serves non-database routes) while Mongo is unreachable
+    app.state.index_task = asyncio.create_task(async_mongodb.ensure_indexes())
+
+
+@app.on_event("shutdown")
+def shutdown_jobs():
+    index_task = getattr(app.state, "index_task", None)
+    if index_task:
+        index_task.cancel()
+    job_manager.shutdown()
+    close_sheets_sinks()  # Final flush of queued sheet rows
+    close_browser_pools()
+    async_mongodb.close_connection()
+
+
+def run_scrape_all(job: Job):
+    """
+    Scrape, score and save leads; runs on the job worker pool and reports progress on `job`.
+
+    Leads stream from the scrapers through dedup, scoring and saving in small
+    batches (see scrapers.pipeline), so qualified leads reach the sheet while
+    the scrapers are still running.
+    """
+    from scrapers import linkedin_scraper, instagram_scraper
+    from scrapers.linkedin_scraper import iter_google_linkedin_profiles, competitor_detector as linkedin_competitor_detector
+    from scrapers.instagram_scraper import iter_instagram_comments, competitor_detector as instagram_competitor_detector
+    from scrapers.twitter_scraper import iter_serpapi_tweets
+    from ai.lead_scoring import score_leads_batched
+
+    job.update(leads_found=0, duplicates=0, scored=0, qualified=0, discarded=0, saved=0)
+    job.set_stage("streaming")
+
+    def score_batch(batch):
+        # Classify and score leads in concurrent multi-lead requests.
+        # Ambiguous competitor checks were deferred by the scrapers and are answered here.
+        score_leads_batched(batch)
+        job.increment("scored", len(batch))
+        linkedin_leads = [lead for lead in batch if lead.get("platform") == "linkedin"]
+        instagram_leads = [lead for lead in batch if lead.get("platform") == "instagram"]
+        linkedin_competitor_detector.record_combined_verdicts(linkedin_leads)
+        instagram_competitor_detector.record_combined_verdicts(instagram_leads)
+        # Deferred leads were stored as pending: drop the competitors, release the rest to the scraper sheet
+        linkedin_scraper.confirm_pending_leads(linkedin_leads)
+        instagram_scraper.confirm_pending_leads(instagram_leads)
+
+    # Discarded leads are stored in a separate collection for analysis, in batched upserts
+    with LeadWriter(get_db()["discarded_leads"]) as discarded_writer:
+
+        def persist(batch):
+            qualified_leads = []
+            for lead in batch:
+                score = lead["score"]
+
+                if lead.get("is_competitor"):
+                    logging.info(f"⏩ Discarded competitor: {lead.get('name', lead.get('username', 'Unknown'))}")
+                    discarded_writer.add(lead)
+                    job.increment("discarded")
+
+                elif score >= 4:
+                    qualified_leads.append(lead)
+                    job.increment("qualified")
+                    logging.info(f"✅ Qualified lead: {lead.get('name', lead.get('username', 'Unknown'))} - Score: {score}")
+                else:
+                    logging.info(f"❌ Discarded lead: {lead.get('name', lead.get('username', 'Unknown'))} - Score: {score}")
+                    discarded_writer.add(lead)
+                    job.increment("discarded")
+
+            # Consolidate qualified leads into Google Sheets as each batch is scored
+            if qualified_leads:
+                job.increment("saved", len(consolidate_leads_to_sheet(qualified_leads)))
+
+        # Each scraper runs in parallel under its own rate-limit budget
+        result = run_pipeline({
+            "linkedin": lambda: iter_google_linkedin_profiles(max_profiles=50, defer_competitor_check=True),
+            "instagram": lambda: iter_instagram_comments(max_comments=50, defer_competitor_check=True),
+            "twitter": lambda: iter_serpapi_tweets(max_tweets=50)
+        }, score=score_batch, persist=persist,
+            on_lead=lambda platform, lead: job.increment("leads_found"),
+            on_duplicate=lambda lead, original: job.increment("duplicates"))
+
+        # Duplicates carry the verdict of the lead they repeat but never reach the sheet.
+        # The scrapers already stored them in leads (pending or unscored), so they are moved
+        # to discarded_leads: written there first, then removed from leads.
+        discarded_writer.flush()
+        errors_before = discarded_writer.totals["errors"]
+        for lead, original in result.duplicates:
+            lead["score"] = original.get("score", 0)
+            lead["rationale"] = f"Duplicate of {original.get('url')}"
+            lead["is_competitor"] = original.get("is_competitor", False)
+            lead.pop("competitor_check", None)  # Settled by the original's verdict
+            discarded_writer.add(lead)
+        discarded_writer.flush()
+        duplicate_ids = [lead["_id"] for lead, _ in result.duplicates if "_id" in lead]
+        if discarded_writer.totals["errors"] > errors_before:
+            logging.error("❌ Some duplicates could not be written to discarded_leads; leaving them in leads.")
+        elif duplicate_ids:
+            get_db()["leads"].delete_many({"_id": {"$in": duplicate_ids}})
+        job.increment("discarded", len(result.duplicates))
+
+    job.set_stage("done")
+    counters = job.to_dict()["progress"]
 
     return {
-        "message": f"Scraped {len(total_leads)} leads across all platforms.",
-        "qualified": len(qualified_leads),
-        "discarded": len(discarded_leads),
-        "saved": len(cleaned_leads)
+        "message": f"Scraped {sum(result.leads_found.values())} leads across all platforms.",
+        "duplicates": len(result.duplicates),
+        "qualified": counters["qualified"],
+        "discarded": counters["discarded"],
+        "saved": counters["saved"],
+        "timings": result.timings,
+        "queue_peaks": result.queue_peaks,
+        "errors": result.errors
     }
 
 
 # 📋 Retrieve all stored leads
 @app.get("/leads")
-async def get_leads():
-    leads = list(leads_collection.find({}, {"_id": 1, "name": 1, "platform": 1, "url": 1, "score": 1, "rationale": 1}))
-    return [{
-        "id": str(lead["_id"]), 
-        "name": lead.get("name", lead.get("username", "Unknown")), 
-        "platform": lead["platform"], 
-        "url": lead["url"],
-        "score": lead.get("score", "Not scored"),
-        "rationale": lead.get("rationale", "")
-    } for lead in leads]
+async def get_leads(platform: Optional[str] = None, min_score: Optional[float] = None, max_score: Optional[float] = None,
+                    sort: Literal["id", "score"] = "id", cursor: Optional[str] = None,
+                    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                    format: Literal["json", "ndjson"] = "json"):
+    # Leads still awaiting their deferred competitor check are not listed yet
+    return await list_leads(async_mongodb.get_db()["leads"], platform, min_score, max_score, sort, cursor, limit, format,
+                            extra_filter={"competitor_check": {"$ne": "pending"}})
+
+
+async def list_leads(collection, platform, min_score, max_score, sort, cursor, limit, format,
+                     extra_filter: Optional[Dict[str, Any]] = None):
+    """
+    Keyset-paginated lead listing shared by /leads and /discarded-leads.
+
+    Pages are ordered by _id (sort=id) or by (score, _id) descending (sort=score)
+    and continue from the opaque `next_cursor` of the previous page, so every page
+    is an indexed range scan however deep it is. format=ndjson streams every
+    matching lead (from `cursor` on) as newline-delimited JSON instead.
+    `extra_filter` is merged into the query (e.g. to hide leads still being checked).
+    """
+    try:
+        query = build_filter(platform, min_score, max_score, sort, cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    query.update(extra_filter or {})
+
+    if format == "ndjson":
+        return StreamingResponse(stream_ndjson(collection, query, sort), media_type="application/x-ndjson")
+
+    leads, next_cursor = await fetch_page(collection, query, sort, limit)
+    return {"leads": leads, "next_cursor": next_cursor}
+
+
+def parse_lead_ids(lead_ids: List[str]) -> List[ObjectId]:
+    """Validate lead ids from a request, dropping repeats."""
+    if not lead_ids:
+        raise HTTPException(status_code=400, detail="No lead ids given")
+    if len(lead_ids) > MAX_BULK_LEADS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_LEADS} lead ids per request")
+    invalid = [lead_id for lead_id in lead_ids if not ObjectId.is_valid(lead_id)]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Invalid lead ids: {', '.join(invalid[:10])}")
+    return list(dict.fromkeys(ObjectId(lead_id) for lead_id in lead_ids))
 
 
 # 🚫 Blacklist a lead
 @app.post("/blacklist/{lead_id}")
 async def blacklist_lead(lead_id: str):
-    lead = leads_collection.find_one({"_id": ObjectId(lead_id)})
-    if not lead:
+    if not await async_mongodb.blacklist_leads(parse_lead_ids([lead_id])):
         raise HTTPException(status_code=404, detail="Lead not found")
 
-    blacklist_collection.insert_one(lead)
-    leads_collection.delete_one({"_id": ObjectId(lead_id)})
-
     return {"message": "Lead blacklisted successfully"}
 
 
+# 🚫 Blacklist many leads in one batched move
+@app.post("/blacklist")
+async def blacklist_leads(lead_ids: List[str] = Body(..., embed=True)):
+    ids = parse_lead_ids(lead_ids)
+    blacklisted = {lead["_id"] for lead in await async_mongodb.blacklist_leads(ids)}
+    return {
+        "blacklisted": len(blacklisted),
+        "not_found": [str(lead_id) for lead_id in ids if lead_id not in blacklisted]
+    }
+
+
 # 📊 Consolidate leads into Google Sheets
 def consolidate_leads_to_sheet(leads):
-    all_leads = list(leads_collection.find({}, {"name": 1, "username": 1, "platform": 1, "url": 1, "score": 1, "rationale": 1}))
+    sheet_url_index = get_sheet_url_index()
+
+    # Re-check the URL index against the sheet only when it is due (daily by default).
+    # Sheets being unavailable must not abort the scrape: keep deduping from the index.
+    if sheet_url_index.verification_due():
+        try:
+            sheet_sink.flush(timeout=60)
+            sheet_url_index.verify(get_master_sheet())
+        except Exception as e:
+            logging.error(f"❌ Sheet URL index verification failed ({e}). Deduping from the index until the next check.")
+            sheet_url_index.postpone_verification()
 
-    # Fetch existing rows
-    existing_rows = sheet.get_all_values()[1:]  # Skip headers
-    existing_urls = {row[2] for row in existing_rows}  # Set of URLs in sheet
+    # Look up only this batch's URLs in the index
+    existing_urls = sheet_url_index.existing(lead["url"] for lead in leads if "url" in lead)
 
     new_leads = []
     for lead in leads:
         if "url" in lead and lead["url"] not in existing_urls:
-            # Add to MongoDB if not already present
-            if not leads_collection.find_one({"url": lead["url"]}):
-                leads_collection.insert_one(lead)
-                
-            # Add to list of new leads
+            existing_urls.add(lead["url"])
             new_leads.append(lead)
 
+    # Add to MongoDB if not already present (and keep the stored score current) in one bulk write
+    with LeadWriter(get_db()["leads"], update_fields=("score", "rationale"), flush_interval=0) as writer:
+        writer.add_many(new_leads)
+
     if new_leads:
         rows_to_append = []
         for lead in new_leads:
@@ -157,58 +336,116 @@ def consolidate_leads_to_sheet(leads):
             rationale = lead.get("rationale", "")
             rows_to_append.append([name, platform, url, score, rationale])
             
-        sheet.append_rows(rows_to_append)
+        sheet_url_index.queue_many(lead["url"] for lead in new_leads)
+        sheet_sink.append_many(rows_to_append)
 
     return new_leads
 
 
 # 📈 Get discarded leads for analysis
 @app.get("/discarded-leads")
-async def get_discarded_leads():
-    discarded = list(discarded_collection.find({}, {"_id": 1, "name": 1, "username": 1, "platform": 1, "url": 1, "score": 1, "rationale": 1}))
-    return [{
-        "id": str(lead["_id"]), 
-        "name": lead.get("name", lead.get("username", "Unknown")), 
-        "platform": lead["platform"], 
-        "url": lead["url"],
-        "score": lead.get("score", "Not scored"),
-        "rationale": lead.get("rationale", "")
-    } for lead in discarded]
+async def get_discarded_leads(platform: Optional[str] = None, min_score: Optional[float] = None,
+                              max_score: Optional[float] = None, sort: Literal["id", "score"] = "id",
+                              cursor: Optional[str] = None, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                              format: Literal["json", "ndjson"] = "json"):
+    return await list_leads(async_mongodb.get_db()["discarded_leads"], platform, min_score, max_score, sort, cursor, limit, format)
+
+
+# 🗃️ Score cache statistics
+@app.get("/score-cache/stats")
+async def get_score_cache_stats():
+    from ai.lead_scoring import score_cache
+    return score_cache.stats()
+
+
+@app.get("/serpapi-cache/stats")
+async def get_serpapi_cache_stats():
+    cache = get_serpapi_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+
+@app.get("/db/pool-stats")
+async def get_db_pool_stats():
+    """Connection pool usage per MongoDB client (checked-out connections, checkout wait times)."""
+    return pool_stats()
+
+
+async def rescore(lead_ids: List[ObjectId]) -> Tuple[List[Dict[str, Any]], List[ObjectId]]:
+    """
+    Rescore leads from either collection in batched LLM requests and store the new
+    scores, moving leads between the qualified and discarded collections as needed.
+    A rescore is an explicit request for a fresh score, so the score cache and the
+    pre-scorer are bypassed.
+
+    Leads whose scoring failed (score 0, "Error: ..." rationale) keep their stored
+    score and collection; they are reported with "failed": True.
+
+    Returns:
+        (one {"id", "score", "rationale", "previous_collection", "collection"} per lead found, ids not found).
+        "collection" is None for a lead that was deleted or moved elsewhere while it was being rescored.
+    """
+    from ai.lead_scoring import score_leads_batched
+
+    found = await async_mongodb.find_leads(lead_ids)
+    leads = [lead for lead, _ in found.values()]
+    # OpenAI is called synchronously, so off the event loop
+    await run_in_threadpool(score_leads_batched, leads, fresh=True)
+
+    rescored, failed = {}, []
+    for lead, collection in found.values():
+        updates = {"score": lead.get("score", 0), "rationale": lead.get("rationale", "")}
+        if updates["score"] <= 0 or str(updates["rationale"]).startswith("Error:"):
+            # An OpenAI failure is not a score: never discard or overwrite a lead because of it
+            failed.append({"id": str(lead["_id"]), **updates, "previous_collection": collection,
+                           "collection": collection, "failed": True})
+        else:
+            rescored[lead["_id"]] = (collection, updates)
+
+    placement = await async_mongodb.save_rescored_leads(rescored)
+    results = [
+        {"id": str(lead_id), **updates, "previous_collection": collection, "collection": placement.get(lead_id)}
+        for lead_id, (collection, updates) in rescored.items()
+    ]
+    return results + failed, [lead_id for lead_id in lead_ids if lead_id not in found]
 
 
 # 🔄 Rescore a specific lead
 @app.post("/rescore/{lead_id}")
 async def rescore_lead(lead_id: str):
-    # Check in both collections
-    lead = leads_collection.find_one({"_id": ObjectId(lead_id)})
-    collection = leads_collection
-    
-    if not lead:
-        lead = discarded_collection.find_one({"_id": ObjectId(lead_id)})
-        collection = discarded_collection
-        
-    if not lead:
+    results, _ = await rescore(parse_lead_ids([lead_id]))
+    if not results:
         raise HTTPException(status_code=404, detail="Lead not found")
-    
-    # Rescore the lead
-    score, rationale = score_lead(lead)
-    lead["score"] = score
-    lead["rationale"] = rationale
-    
-    # Update the lead in its current collection
-    collection.update_one({"_id": ObjectId(lead_id)}, {"$set": {"score": score, "rationale": rationale}})
-    
-    # Move between collections if necessary
-    if score >= 4 and collection == discarded_collection:
-        # Move to qualified leads
-        leads_collection.insert_one(lead)
-        discarded_collection.delete_one({"_id": ObjectId(lead_id)})
+
+    result = results[0]
+    score, rationale = result["score"], result["rationale"]
+    if result.get("failed"):
+        raise HTTPException(status_code=502, detail=f"Scoring failed, lead left unchanged: {rationale}")
+    if result["collection"] is None:
+        raise HTTPException(status_code=404, detail="Lead no longer present (deleted or moved while it was rescored)")
+    if result["collection"] == result["previous_collection"]:
+        return {"message": "Lead rescored", "score": score, "rationale": rationale}
+    if result["collection"] == "leads":
         return {"message": "Lead rescored and moved to qualified leads", "score": score, "rationale": rationale}
-        
-    elif score < 4 and collection == leads_collection:
-        # Move to discarded leads
-        discarded_collection.insert_one(lead)
-        leads_collection.delete_one({"_id": ObjectId(lead_id)})
-        return {"message": "Lead rescored and moved to discarded leads", "score": score, "rationale": rationale}
-    
-    return {"message": "Lead rescored", "score": score, "rationale": rationale}
\ No newline at end of file
+    return {"message": "Lead rescored and moved to discarded leads", "score": score, "rationale": rationale}
+
+
+# 🔄 Rescore many leads: batched scoring, then batched moves and updates
+@app.post("/rescore")
+async def rescore_leads(lead_ids: List[str] = Body(..., embed=True)):
+    ids = parse_lead_ids(lead_ids)
+    results, not_found = await rescore(ids)
+    failed = [{"id": result["id"], "error": result["rationale"]} for result in results if result.get("failed")]
+    gone = [result["id"] for result in results if result["collection"] is None]
+    results = [result for result in results if result["collection"] is not None and not result.get("failed")]
+    moved = [result for result in results if result["collection"] != result["previous_collection"]]
+    return {
+        "rescored": len(results),
+        "failed": failed,
+        "moved_to_leads": sum(1 for result in moved if result["collection"] == "leads"),
+        "moved_to_discarded": sum(1 for result in moved if result["collection"] == "discarded_leads"),
+        "not_found": [str(lead_id) for lead_id in not_found],
+        "no_longer_present": gone,
+        "leads": results
+    }
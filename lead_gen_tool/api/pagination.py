@@ -0,0 +1,111 @@
+import json
+import base64
+import binascii
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+LEAD_PROJECTION = {"_id": 1, "name": 1, "username": 1, "platform": 1, "url": 1, "score": 1, "rationale": 1}
+
+# Sort orders and the index keys they page over
+SORTS = {
+    "id": [("_id", 1)],                   # Oldest first
+    "score": [("score", -1), ("_id", -1)]  # Best first; only leads that have a score
+}
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def serialize_lead(lead: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": str(lead["_id"]),
+        "name": lead.get("name", lead.get("username", "Unknown")),
+        "platform": lead.get("platform"),
+        "url": lead.get("url"),
+        "score": lead.get("score", "Not scored"),
+        "rationale": lead.get("rationale", "")
+    }
+
+
+def encode_cursor(lead: Dict[str, Any], sort: str) -> str:
+    """Opaque cursor pointing just past `lead` in the given sort order."""
+    position = {"id": str(lead["_id"])}
+    if sort == "score":
+        position["score"] = lead["score"]
+    return base64.urlsafe_b64encode(json.dumps(position).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, sort: str) -> Dict[str, Any]:
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        position["id"] = ObjectId(position["id"])
+        if sort == "score" and not isinstance(position.get("score"), (int, float)):
+            raise InvalidCursor("cursor was not issued for sort=score")
+    except (ValueError, TypeError, KeyError, InvalidId, binascii.Error) as e:
+        raise InvalidCursor(f"Invalid cursor: {e}")
+    return position
+
+
+def build_filter(platform: Optional[str] = None, min_score: Optional[float] = None,
+                 max_score: Optional[float] = None, sort: str = "id",
+                 cursor: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Combine the platform/score filters with the keyset condition for `cursor`.
+
+    Raises:
+        InvalidCursor: If the cursor cannot be decoded for this sort order
+    """
+    query: Dict[str, Any] = {}
+    if platform:
+        query["platform"] = platform
+
+    score: Dict[str, Any] = {}
+    if min_score is not None:
+        score["$gte"] = min_score
+    if max_score is not None:
+        score["$lte"] = max_score
+    if sort == "score":
+        score["$type"] = "number"  # "Not scored" leads have no position in score order
+    if score:
+        query["score"] = score
+
+    if cursor:
+        position = decode_cursor(cursor, sort)
+        if sort == "score":
+            keyset = {"$or": [
+                {"score": {"$lt": position["score"]}},
+                {"score": position["score"], "_id": {"$lt": position["id"]}}
+            ]}
+        else:
+            keyset = {"_id": {"$gt": position["id"]}}
+        query = {"$and": [query, keyset]} if query else keyset
+    return query
+
+
+async def fetch_page(collection, query: Dict[str, Any], sort: str, limit: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Read one page in keyset order from a Motor collection.
+
+    Returns:
+        (serialized leads, cursor for the next page or None on the last page)
+    """
+    docs = await collection.find(query, LEAD_PROJECTION).sort(SORTS[sort]).limit(limit + 1).to_list(length=limit + 1)
+    next_cursor = encode_cursor(docs[limit - 1], sort) if len(docs) > limit else None
+    return [serialize_lead(doc) for doc in docs[:limit]], next_cursor
+
+
+async def stream_ndjson(collection, query: Dict[str, Any], sort: str,
+                        batch_size: int = DEFAULT_PAGE_SIZE) -> AsyncIterator[bytes]:
+    """Yield every matching lead as one JSON line, as the Motor cursor produces them."""
+    cursor = collection.find(query, LEAD_PROJECTION).sort(SORTS[sort]).batch_size(batch_size)
+    try:
+        async for doc in cursor:
+            yield (json.dumps(serialize_lead(doc)) + "\n").encode("utf-8")
+    finally:
+        await cursor.close()
@@ -0,0 +1,163 @@
+"""
+Load test: lead-listing throughput with blocking pymongo calls inside
+`async def` handlers (before) versus awaited Motor calls (after).
+
+The default mode seeds a scratch database on a local mongod and runs the
+/leads page query the way each handler version does, from --concurrency
+simultaneous clients on one event loop (one API worker). With pymongo every
+query blocks the loop, so requests are served one at a time; with Motor they
+overlap.
+
+--url load-tests a running API over HTTP instead; run it once against each
+build to compare.
+
+Run from the lead_gen_tool directory:
+    python -m benchmarks.api_load_test [--leads 20000] [--requests 2000] [--concurrency 50]
+    python -m benchmarks.api_load_test --url http://localhost:8000 [--seconds 20] [--concurrency 50]
+"""
+import time
+import random
+import asyncio
+import argparse
+import statistics
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from database.mongodb import MONGO_URI, client_options
+from database.pool_stats import pool_stats
+
+LOAD_TEST_DATABASE = "lead_generator_loadtest"
+PLATFORMS = ["linkedin", "instagram", "twitter"]
+
+
+def seed(sync_db, count):
+    from pymongo import ASCENDING, DESCENDING
+
+    collection = sync_db["leads"]
+    collection.drop()
+    rng = random.Random(1)
+    collection.insert_many([
+        {"name": f"lead {i}", "platform": rng.choice(PLATFORMS), "url": f"https://example.com/{i}",
+         "score": rng.randint(1, 10), "rationale": "load test"}
+        for i in range(count)
+    ])
+    collection.create_index([("platform", ASCENDING), ("score", DESCENDING), ("_id", DESCENDING)])
+    collection.create_index([("score", DESCENDING), ("_id", DESCENDING)])
+
+
+def random_query(rng):
+    from api.pagination import build_filter
+
+    return build_filter(platform=rng.choice(PLATFORMS + [None]), min_score=rng.randint(1, 6), sort="score")
+
+
+async def run_clients(handler, total, concurrency):
+    """Fire `total` requests from `concurrency` clients; returns (requests/s, latencies in ms)."""
+    rng = random.Random(2)
+    remaining = total
+    latencies = []
+
+    async def client():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            query = random_query(rng)
+            start = time.perf_counter()
+            await handler(query)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return total / (time.perf_counter() - start), latencies
+
+
+def report(name, throughput, latencies):
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{name:<22} {throughput:>9.0f} {statistics.median(latencies):>9.1f} {p95:>9.1f}")
+
+
+def run_in_process(args):
+    from pymongo import MongoClient
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from api.pagination import LEAD_PROJECTION, SORTS, fetch_page, serialize_lead
+
+    sync_client = MongoClient(MONGO_URI, **client_options("loadtest-sync"))
+    sync_collection = sync_client[LOAD_TEST_DATABASE]["leads"]
+    print(f"Seeding {args.leads} leads into {LOAD_TEST_DATABASE}...")
+    seed(sync_client[LOAD_TEST_DATABASE], args.leads)
+
+    # Previous handler body: synchronous pymongo inside `async def`
+    async def pymongo_handler(query):
+        docs = list(sync_collection.find(query, LEAD_PROJECTION).sort(SORTS["score"]).limit(args.page_size + 1))
+        return [serialize_lead(doc) for doc in docs[:args.page_size]]
+
+    async def main():
+        motor_client = AsyncIOMotorClient(MONGO_URI, **client_options("loadtest-async"))
+        motor_collection = motor_client[LOAD_TEST_DATABASE]["leads"]
+
+        async def motor_handler(query):
+            return await fetch_page(motor_collection, query, "score", args.page_size)
+
+        print(f"{args.requests} requests, {args.concurrency} concurrent clients, {args.page_size} leads per page")
+        print(f"{'handler':<22} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9}")
+        for name, handler in [("pymongo (blocking)", pymongo_handler), ("motor (async)", motor_handler)]:
+            await handler(random_query(random.Random(0)))  # Warm up the pool
+            report(name, *await run_clients(handler, args.requests, args.concurrency))
+        motor_client.close()
+
+        print(f"\n{'pool':<22} {'peak out':>9} {'avg wait':>9} {'max wait':>9} {'timeouts':>9}")
+        for name, stats in pool_stats().items():
+            print(f"{name:<22} {stats['peak_checked_out']:>9} {stats['avg_wait_ms']:>9.2f} "
+                  f"{stats['max_wait_ms']:>9.2f} {stats['checkout_timeouts']:>9}")
+
+    try:
+        asyncio.run(main())
+    finally:
+        sync_client.drop_database(LOAD_TEST_DATABASE)
+        sync_client.close()
+
+
+def run_http(args):
+    url = f"{args.url.rstrip('/')}/leads?sort=score&limit={args.page_size}"
+    deadline = time.monotonic() + args.seconds
+    latencies, errors = [], 0
+
+    def client():
+        nonlocal errors
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(url, timeout=30) as response:
+                    response.read()
+            except OSError:
+                errors += 1
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        for _ in range(args.concurrency):
+            executor.submit(client)
+    elapsed = time.perf_counter() - start
+
+    print(f"GET {url} for {args.seconds}s, {args.concurrency} concurrent clients ({errors} errors)")
+    print(f"{'target':<22} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    if latencies:
+        report(args.url, len(latencies) / elapsed, latencies)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leads", type=int, default=20_000, help="Leads to seed (in-process mode)")
+    parser.add_argument("--requests", type=int, default=2_000, help="Requests per handler (in-process mode)")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--url", help="Load-test a running API instead")
+    parser.add_argument("--seconds", type=float, default=20, help="Duration of the HTTP load test")
+    args = parser.parse_args()
+
+    if args.url:
+        run_http(args)
+    else:
+        run_in_process(args)
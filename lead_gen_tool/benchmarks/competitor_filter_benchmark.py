@@ -0,0 +1,99 @@
+"""
+Micro-benchmark: per-comment cost of the shared single-pass competitor matchers
+versus the per-keyword `in` loops the scrapers used before.
+
+Run from the lead_gen_tool directory:
+    python -m benchmarks.competitor_filter_benchmark [--comments 100000]
+"""
+import re
+import time
+import random
+import argparse
+
+from scrapers.competitor_filter import (
+    EXCLUDED_TITLES, COACH_EXCLUSION_KEYWORDS, PROMO_PATTERNS, COMPETITOR_KEYWORDS, COACH_PATTERNS,
+    OFFERING_TERMS, TRANSFORMATION_TERMS, PERSONAL_DEV_TERMS,
+    LINKEDIN_TITLE_MATCHER, INSTAGRAM_KEYWORD_MATCHER, INSTAGRAM_PROMO_MATCHER,
+    TWITTER_COMPETITOR_MATCHER, match_offering_transformation
+)
+
+FILLER = ("i feel so stuck at work lately and honestly the commute is killing me this post "
+          "really hit home thank you for sharing needed this today great advice my manager "
+          "never listens burnout is real weekend cannot come soon enough").split()
+SIGNALS = ["life coach", "link in bio", "dm me", "free consultation", "I help women to grow", "mentoring"]
+
+
+def build_corpus(size: int, seed: int = 1):
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        words = rng.choices(FILLER, k=rng.randint(8, 40))
+        if rng.random() < 0.15:
+            words.insert(rng.randrange(len(words)), rng.choice(SIGNALS))
+        corpus.append(" ".join(words))
+    return corpus
+
+
+# --- Previous implementations (kept verbatim for comparison) -------------
+
+def legacy_linkedin(text):
+    return any(excluded.lower() in text.lower() for excluded in EXCLUDED_TITLES)
+
+
+def legacy_instagram(text):
+    if any(excluded.lower() in text.lower() for excluded in COACH_EXCLUSION_KEYWORDS):
+        return True
+    return any(pattern in text.lower() for pattern in PROMO_PATTERNS)
+
+
+def legacy_twitter(text):
+    text = text.lower()
+    for keyword in COMPETITOR_KEYWORDS:
+        if keyword in text:
+            return True
+    for pattern in COACH_PATTERNS:
+        if re.search(pattern, text):
+            return True
+    if any(term in text for term in OFFERING_TERMS) and any(term in text for term in TRANSFORMATION_TERMS):
+        if any(term in text for term in PERSONAL_DEV_TERMS):
+            return True
+    return False
+
+
+# --- Current implementations ---------------------------------------------
+
+def matcher_linkedin(text):
+    return LINKEDIN_TITLE_MATCHER.match(text) is not None
+
+
+def matcher_instagram(text):
+    return INSTAGRAM_KEYWORD_MATCHER.match(text) is not None or INSTAGRAM_PROMO_MATCHER.match(text) is not None
+
+
+def matcher_twitter(text):
+    return TWITTER_COMPETITOR_MATCHER.match(text) is not None or match_offering_transformation(text) is not None
+
+
+def time_per_item(function, corpus):
+    start = time.perf_counter()
+    flagged = sum(1 for text in corpus if function(text))
+    elapsed = time.perf_counter() - start
+    return elapsed / len(corpus) * 1e6, flagged
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--comments", type=int, default=100_000)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.comments)
+    print(f"{'filter':<10} {'legacy µs/item':>15} {'matcher µs/item':>16} {'speedup':>8} {'flagged (legacy/new)':>22}")
+    for name, legacy, current in [
+        ("linkedin", legacy_linkedin, matcher_linkedin),
+        ("instagram", legacy_instagram, matcher_instagram),
+        ("twitter", legacy_twitter, matcher_twitter),
+    ]:
+        legacy_us, legacy_flagged = time_per_item(legacy, corpus)
+        current_us, current_flagged = time_per_item(current, corpus)
+        print(f"{name:<10} {legacy_us:>15.2f} {current_us:>16.2f} {legacy_us / current_us:>7.1f}x "
+              f"{f'{legacy_flagged}/{current_flagged}':>22}")
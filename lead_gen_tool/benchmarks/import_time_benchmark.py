@@ -0,0 +1,93 @@
+"""
+Benchmark: cold-start cost of importing the API and scraper modules.
+
+Each module is imported in a fresh interpreter with `python -X importtime`.
+The table shows wall-clock time (including any connections made at import),
+the cumulative import time of the module itself, whether the import succeeded,
+and the heaviest packages it pulled in.
+
+Run from the lead_gen_tool directory:
+    python -m benchmarks.import_time_benchmark [--runs 3] [--top 5] [module ...]
+"""
+import re
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+DEFAULT_MODULES = [
+    "database.mongodb",
+    "scrapers.linkedin_scraper",
+    "scrapers.instagram_scraper",
+    "scrapers.twitter_scraper",
+    "api.main",
+]
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)$")
+
+
+def import_once(module, timeout):
+    """
+    Returns:
+        (wall seconds, parsed importtime lines as (cumulative us, depth, name), error line or None)
+    """
+    start = time.perf_counter()
+    try:
+        completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                   capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return time.perf_counter() - start, [], f"timed out after {timeout}s"
+    wall = time.perf_counter() - start
+
+    lines = []
+    for line in completed.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            lines.append((int(match.group(2)), len(match.group(3)) // 2, match.group(4)))
+    error = None
+    if completed.returncode != 0:
+        error = (completed.stderr.strip().splitlines() or ["failed"])[-1]
+    return wall, lines, error
+
+
+def cumulative_us(lines, module):
+    return next((cumulative for cumulative, _, name in lines if name == module), 0)
+
+
+def heaviest(lines, module, top):
+    """
+    Time spent per top-level package, counting only the imports a different
+    package triggered (nested imports are listed before the import that caused them).
+    """
+    root = module.split(".")[0]
+    totals = {}
+    parents = []  # (depth, package) of the enclosing imports while walking backwards
+    for cumulative, depth, name in reversed(lines):
+        while parents and parents[-1][0] >= depth:
+            parents.pop()
+        package = name.split(".")[0]
+        if (not parents or parents[-1][1] != package) and package != root:
+            totals[package] = totals.get(package, 0) + cumulative
+        parents.append((depth, package))
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+    return ", ".join(f"{package} {cumulative / 1000:.0f}ms" for package, cumulative in ranked)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters per module (median reported)")
+    parser.add_argument("--top", type=int, default=5, help="Heaviest packages listed per module")
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args()
+
+    print(f"{'module':<28} {'wall ms':>8} {'import ms':>10}  {'status':<8} heaviest imports")
+    for module in args.modules:
+        runs = [import_once(module, args.timeout) for _ in range(args.runs)]
+        wall = statistics.median(run[0] for run in runs)
+        lines, error = runs[-1][1], runs[-1][2]
+        cumulative = statistics.median(cumulative_us(run[1], module) for run in runs) / 1000
+        status = "ok" if error is None else "error"
+        print(f"{module:<28} {wall * 1000:>8.0f} {cumulative:>10.0f}  {status:<8} {heaviest(lines, module, args.top)}")
+        if error:
+            print(f"{'':<28} {error[:120]}")
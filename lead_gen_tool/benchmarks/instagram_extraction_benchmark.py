@@ -0,0 +1,163 @@
+"""
+Benchmark: per-post Instagram comment extraction with per-element WebDriver
+calls (before) versus one execute_script call or one page_source parse (after).
+
+Every WebDriver command is an HTTP round trip to chromedriver, so by default
+the benchmark runs against a simulated driver that charges --rtt-ms per command
+and counts them. Pass --post with a post URL to time both paths on a real,
+logged-in browser from the Instagram pool instead.
+
+Run from the lead_gen_tool directory:
+    python -m benchmarks.instagram_extraction_benchmark [--comments 50] [--posts 20] [--rtt-ms 2]
+    python -m benchmarks.instagram_extraction_benchmark --post https://www.instagram.com/p/<id>/
+"""
+import json
+import time
+import random
+import argparse
+from html import escape
+
+from selenium.webdriver.common.by import By
+
+from scrapers.instagram_scraper import (
+    COMMENT_SELECTOR, COMMENT_USERNAME_SELECTOR, COMMENT_TEXT_SELECTOR,
+    extract_comments, parse_comments_html
+)
+
+WORDS = ("so true needed this today my job is draining me thank you for sharing "
+         "feeling stuck lately how do you stay motivated love this").split()
+
+
+class SimulatedElement:
+    def __init__(self, driver, children=None, text=""):
+        self._driver = driver
+        self._children = children or {}
+        self._text = text
+
+    def find_element(self, by, selector):
+        self._driver.round_trip()
+        return SimulatedElement(self._driver, text=self._children[selector])
+
+    @property
+    def text(self):
+        self._driver.round_trip()
+        return self._text
+
+
+class SimulatedDriver:
+    """Stands in for a WebDriver on a post page; every command costs one round trip."""
+
+    def __init__(self, comments, rtt):
+        self.comments = comments
+        self.rtt = rtt
+        self.round_trips = 0
+        self._html = "<html><body>" + "".join(
+            f'<div class="_a9zr"><h3 class="_a9zc"><a>{escape(username)}</a></h3>'
+            f'<div class="xt0psk2"><span>{escape(text)}</span></div></div>'
+            for username, text in comments
+        ) + "</body></html>"
+
+    def round_trip(self):
+        self.round_trips += 1
+        time.sleep(self.rtt)
+
+    def find_elements(self, by, selector):
+        self.round_trip()
+        return [
+            SimulatedElement(self, {COMMENT_USERNAME_SELECTOR: username, COMMENT_TEXT_SELECTOR: text})
+            for username, text in self.comments
+        ]
+
+    def execute_script(self, script, *args):
+        self.round_trip()
+        return json.loads(json.dumps(self.comments))  # Results come back JSON-encoded
+
+    @property
+    def page_source(self):
+        self.round_trip()
+        return self._html
+
+
+def build_post(size, rng):
+    return [(f"user_{rng.randrange(10 ** 6)}", " ".join(rng.choices(WORDS, k=rng.randint(3, 30)))) for _ in range(size)]
+
+
+# --- Previous implementation (kept verbatim for comparison) --------------
+
+def legacy_extract(driver):
+    comments = []
+    for comment_element in driver.find_elements(By.CSS_SELECTOR, COMMENT_SELECTOR):
+        try:
+            # Extract username and comment text
+            username_element = comment_element.find_element(By.CSS_SELECTOR, "._a9zc")
+            username = username_element.text.strip() if username_element else "Unknown"
+
+            comment_text_element = comment_element.find_element(By.CSS_SELECTOR, "div.xt0psk2 span")
+            comment_text = comment_text_element.text.strip() if comment_text_element else ""
+            comments.append((username, comment_text))
+        except Exception:
+            pass
+    return comments
+
+
+def parse_page_source(driver):
+    return parse_comments_html(driver.page_source)
+
+
+def time_extraction(function, driver):
+    start = time.perf_counter()
+    comments = function(driver)
+    return (time.perf_counter() - start) * 1000, comments
+
+
+def run_simulated(args):
+    rng = random.Random(1)
+    posts = [build_post(args.comments, rng) for _ in range(args.posts)]
+    paths = [
+        ("per-element", legacy_extract),
+        ("execute_script", extract_comments),
+        ("page_source", parse_page_source),
+    ]
+    print(f"{args.posts} posts x {args.comments} comments, {args.rtt_ms} ms per WebDriver round trip")
+    print(f"{'path':<15} {'ms/post':>9} {'round trips/post':>17} {'speedup':>8}")
+    baseline = None
+    for name, function in paths:
+        total_ms, round_trips = 0.0, 0
+        for comments in posts:
+            driver = SimulatedDriver(comments, args.rtt_ms / 1000)
+            elapsed, extracted = time_extraction(function, driver)
+            assert extracted == comments, f"{name} extracted different comments"
+            total_ms += elapsed
+            round_trips += driver.round_trips
+        per_post = total_ms / len(posts)
+        baseline = baseline or per_post
+        print(f"{name:<15} {per_post:>9.2f} {round_trips / len(posts):>17.0f} {baseline / per_post:>7.1f}x")
+
+
+def run_live(args):
+    from scrapers.instagram_scraper import browser_pool, load_post_comments
+
+    with browser_pool.driver() as driver:
+        load_post_comments(driver, args.post)  # Load and expand the post once
+        print(f"{'path':<15} {'ms':>9} {'comments':>9}")
+        for name, function in [
+            ("per-element", legacy_extract),
+            ("execute_script", extract_comments),
+            ("page_source", parse_page_source),
+        ]:
+            elapsed, comments = time_extraction(function, driver)
+            print(f"{name:<15} {elapsed:>9.1f} {len(comments):>9}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--comments", type=int, default=50, help="Comments per simulated post")
+    parser.add_argument("--posts", type=int, default=20)
+    parser.add_argument("--rtt-ms", type=float, default=2.0, help="Simulated cost of one WebDriver command")
+    parser.add_argument("--post", help="Time a real post instead of the simulation")
+    args = parser.parse_args()
+
+    if args.post:
+        run_live(args)
+    else:
+        run_simulated(args)
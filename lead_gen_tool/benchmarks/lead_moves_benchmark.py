@@ -0,0 +1,91 @@
+"""
+Benchmark: blacklisting leads one document at a time (find_one + insert_one +
+delete_one per lead, the previous /blacklist handler) versus the batched
+AsyncMongoDB.move_leads used by POST /blacklist.
+
+Seeds a scratch database on a local mongod, blacklists --leads leads with each
+version and reports wall time and the number of commands sent to the server
+(counted with a pymongo CommandListener). On a replica set move_leads also runs
+in a transaction, which adds the commitTransaction command.
+
+Run from the lead_gen_tool directory:
+    python -m benchmarks.lead_moves_benchmark [--leads 2000]
+"""
+import time
+import asyncio
+import argparse
+
+from pymongo import monitoring
+
+from database.mongodb import MONGO_URI, client_options
+from database.async_mongodb import async_mongodb
+
+BENCHMARK_DATABASE = "lead_generator_moves_benchmark"
+
+
+class CommandCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+async def seed(db, count):
+    for name in ("leads", "blacklist"):
+        await db[name].drop()
+    await db["blacklist"].create_index("url", unique=True)
+    result = await db["leads"].insert_many([
+        {"name": f"lead {i}", "platform": "linkedin", "url": f"https://example.com/{i}", "score": 5}
+        for i in range(count)
+    ])
+    return result.inserted_ids
+
+
+async def per_lead(db, lead_ids):
+    # Previous handler body, once per lead
+    for lead_id in lead_ids:
+        lead = await db["leads"].find_one({"_id": lead_id})
+        await db["blacklist"].insert_one(lead)
+        await db["leads"].delete_one({"_id": lead["_id"]})
+
+
+async def main(args):
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    counter = CommandCounter()
+    options = client_options("benchmark")
+    options["event_listeners"] = options["event_listeners"] + [counter]
+    client = AsyncIOMotorClient(MONGO_URI, **options)
+    db = client[BENCHMARK_DATABASE]
+    # Point the shared async layer at the scratch database
+    async_mongodb._client, async_mongodb._db = client, db
+    transactions = await async_mongodb.supports_transactions()
+
+    print(f"Blacklisting {args.leads} leads ({'transactions' if transactions else 'standalone server, no transactions'})")
+    print(f"{'version':<24} {'seconds':>9} {'commands':>9}")
+    try:
+        for name, run in [("per lead (before)", per_lead),
+                          ("move_leads (after)", lambda db, ids: async_mongodb.move_leads(ids, "leads", "blacklist"))]:
+            lead_ids = await seed(db, args.leads)
+            counter.count = 0
+            start = time.perf_counter()
+            await run(db, lead_ids)
+            elapsed = time.perf_counter() - start
+            assert await db["blacklist"].count_documents({}) == args.leads
+            print(f"{name:<24} {elapsed:>9.3f} {counter.count:>9}")
+    finally:
+        await client.drop_database(BENCHMARK_DATABASE)
+        async_mongodb.close_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leads", type=int, default=2_000, help="Leads to blacklist with each version")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,261 @@
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReplaceOne, UpdateOne, errors
+
+from database.mongodb import DATABASE_NAME, INDEXES, MONGO_URI, MongoDB, client_options
+
+# Configure Logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# Collections where a URL can only appear once; moving a lead into them merges it into an existing one
+UNIQUE_URL_COLLECTIONS = {collection for collection, keys, options in INDEXES if keys == "url" and options.get("unique")}
+
+
+class AsyncMongoDB:
+    """
+    Motor (asyncio) counterpart of MongoDB for the FastAPI handlers, so database
+    calls await on the event loop instead of blocking it. Same database, pool
+    settings and indexes as the synchronous class.
+    """
+    _instance = None
+    MIN_SCORE_THRESHOLD = MongoDB.MIN_SCORE_THRESHOLD
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(AsyncMongoDB, cls).__new__(cls)
+            cls._instance._client = None
+            cls._instance._db = None
+            cls._instance._transactions = None  # Whether the server supports transactions, checked on first move
+        return cls._instance
+
+    def connect(self):
+        """Create the Motor client; it connects on first use."""
+        self._client = AsyncIOMotorClient(MONGO_URI, **client_options("async"))
+        self._db = self._client[DATABASE_NAME]
+
+    async def ensure_indexes(self) -> bool:
+        """
+        Create the indexes MongoDB.connect() creates (no-op for existing ones).
+
+        Returns:
+            False if MongoDB could not be reached (logged, not raised)
+        """
+        db = self.get_db()
+        try:
+            for collection, keys, options in INDEXES:
+                await db[collection].create_index(keys, **options)
+        except errors.PyMongoError as e:
+            logging.error(f"❌ MongoDB (async) index setup failed: {e}")
+            return False
+        logging.info("✅ Connected to MongoDB (async) successfully.")
+        return True
+
+    def get_db(self):
+        """Return the Motor database instance."""
+        if self._db is None:
+            self.connect()
+        return self._db
+
+    async def add_lead(self, lead_data: Dict[str, Any]) -> bool:
+        """
+        Score a lead and upsert it if it meets MIN_SCORE_THRESHOLD (see MongoDB.add_lead).
+        Scoring calls OpenAI synchronously, so it runs in a worker thread.
+
+        Returns:
+            True if the lead was added or its score refreshed
+        """
+        from ai.lead_scoring import score_lead  # Pulls in openai; only needed when scoring
+
+        name = lead_data.get("name", lead_data.get("username", "Unknown"))
+        platform = lead_data.get("platform", "unknown")
+
+        score, rationale = await asyncio.to_thread(score_lead, lead_data)
+        lead_data["score"] = score
+        lead_data["rationale"] = rationale
+
+        if score < self.MIN_SCORE_THRESHOLD:
+            logging.info(f"⏩ Skipping low-scoring lead: {name} - Score: {score}")
+            return False
+
+        try:
+            result = await self.get_db()["leads"].update_one(
+                {"url": lead_data["url"]},
+                {
+                    "$setOnInsert": {k: v for k, v in lead_data.items() if k not in ("score", "rationale")},
+                    "$set": {"score": score, "rationale": rationale}
+                },
+                upsert=True
+            )
+        except Exception as e:
+            logging.error(f"❌ Error adding lead: {e}")
+            return False
+        if result.upserted_id is None:
+            logging.info(f"📊 Updated lead score: {name} - Score: {score}")
+        else:
+            logging.info(f"✅ Added lead: {name} from {platform} - Score: {score}")
+        return True
+
+    async def get_leads_by_score(self, min_score=None, max_score=None) -> List[Dict[str, Any]]:
+        """Retrieve leads within a score range (see MongoDB.get_leads_by_score)."""
+        query: Dict[str, Any] = {}
+        if min_score is not None:
+            query.setdefault("score", {})["$gte"] = min_score
+        if max_score is not None:
+            query.setdefault("score", {})["$lte"] = max_score
+        return await self.get_db()["leads"].find(query).to_list(length=None)
+
+    async def supports_transactions(self) -> bool:
+        """True on a replica set or sharded cluster; a standalone server has no transactions."""
+        if self._transactions is None:
+            hello = await self.get_db().command("hello")
+            self._transactions = "setName" in hello or hello.get("msg") == "isdbgrid"
+        return self._transactions
+
+    async def find_leads(self, lead_ids: Iterable[ObjectId],
+                         collections=("leads", "discarded_leads")) -> Dict[ObjectId, Tuple[Dict[str, Any], str]]:
+        """
+        Look leads up by id, with one query per collection for all of them.
+
+        Returns:
+            {lead id: (lead, collection name)} for the ids found; the first collection wins
+        """
+        found: Dict[ObjectId, Tuple[Dict[str, Any], str]] = {}
+        missing = list(lead_ids)
+        for name in collections:
+            if not missing:
+                break
+            async for lead in self.get_db()[name].find({"_id": {"$in": missing}}):
+                found[lead["_id"]] = (lead, name)
+            missing = [lead_id for lead_id in missing if lead_id not in found]
+        return found
+
+    async def move_leads(self, lead_ids: Iterable[ObjectId], source: str, target: str,
+                         updates: Optional[Dict[ObjectId, Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """
+        Move leads (keeping their _id) from one collection to another with a fixed
+        number of round trips however many there are: one find, one bulk upsert into
+        `target` and one delete_many (plus a URL lookup for unique-URL targets).
+
+        On a replica set or sharded cluster the steps run in one transaction, so a
+        move happens completely or not at all. A standalone server has no
+        transactions; there `target` is written before `source` is cleaned up and
+        every write is keyed on _id, so re-running a move that failed halfway
+        completes it without duplicating anything.
+
+        A lead whose URL is already in a unique-URL target (leads, blacklist) is
+        merged into the existing document: it gets the updates and the source copy
+        is removed.
+
+        Args:
+            lead_ids: Lead ObjectIds
+            source: Collection holding the leads
+            target: Collection to move them to
+            updates: Fields to set on each moved lead, by lead id
+
+        Returns:
+            The moved leads, with their updates applied; ids not in `source` are skipped
+        """
+        lead_ids = list(lead_ids)
+        if not lead_ids:
+            return []
+        updates = updates or {}
+        db = self.get_db()
+
+        async def move(session=None):
+            leads = await db[source].find({"_id": {"$in": lead_ids}}, session=session).to_list(length=None)
+            if not leads:
+                return leads
+
+            existing = set()
+            if target in UNIQUE_URL_COLLECTIONS:
+                urls = [lead["url"] for lead in leads if lead.get("url")]
+                existing = set(await db[target].distinct("url", {"url": {"$in": urls}}, session=session))
+
+            operations = []
+            for lead in leads:
+                fields = updates.get(lead["_id"], {})
+                lead.update(fields)
+                url = lead.get("url")
+                if url in existing:
+                    if fields:
+                        operations.append(UpdateOne({"url": url}, {"$set": fields}))
+                    continue
+                operations.append(ReplaceOne({"_id": lead["_id"]}, lead, upsert=True))
+                if url and target in UNIQUE_URL_COLLECTIONS:
+                    existing.add(url)  # Later leads with the same URL merge into this one
+
+            if operations:
+                await db[target].bulk_write(operations, ordered=False, session=session)
+            await db[source].delete_many({"_id": {"$in": [lead["_id"] for lead in leads]}}, session=session)
+            return leads
+
+        if await self.supports_transactions():
+            async with await self._client.start_session() as session:
+                return await session.with_transaction(move)
+        return await move()
+
+    async def blacklist_leads(self, lead_ids: Iterable[ObjectId]) -> List[Dict[str, Any]]:
+        return await self.move_leads(lead_ids, "leads", "blacklist")
+
+    async def save_rescored_leads(self, rescored: Dict[ObjectId, Tuple[str, Dict[str, Any]]]) -> Dict[ObjectId, str]:
+        """
+        Store new scores, moving leads that crossed MIN_SCORE_THRESHOLD between the
+        leads and discarded_leads collections. Two batched moves and one bulk update
+        per collection, however many leads there are.
+
+        Args:
+            rescored: {lead id: (collection it is in, {"score": ..., "rationale": ...})};
+                only successful scores, as a failed one (score 0) would discard the lead
+
+        Returns:
+            {lead id: collection the lead is in now}; leads deleted or moved elsewhere
+            since they were read are left out
+        """
+        restore, discard = {}, {}
+        in_place: Dict[str, List[UpdateOne]] = {}
+        placement = {}
+        for lead_id, (collection, updates) in rescored.items():
+            qualified = updates["score"] >= self.MIN_SCORE_THRESHOLD
+            if qualified and collection == "discarded_leads":
+                restore[lead_id] = updates
+            elif not qualified and collection == "leads":
+                discard[lead_id] = updates
+            else:
+                in_place.setdefault(collection, []).append(UpdateOne({"_id": lead_id}, {"$set": updates}))
+                placement[lead_id] = collection
+
+        for lead in await self.move_leads(restore, "discarded_leads", "leads", restore):
+            placement[lead["_id"]] = "leads"
+        for lead in await self.move_leads(discard, "leads", "discarded_leads", discard):
+            placement[lead["_id"]] = "discarded_leads"
+        for collection, operations in in_place.items():
+            result = await self.get_db()[collection].bulk_write(operations, ordered=False)
+            if result.matched_count < len(operations):
+                # Some leads vanished meanwhile; find out which are still there
+                lead_ids = [lead_id for lead_id, name in placement.items() if name == collection]
+                present = {doc["_id"] for doc in await self.get_db()[collection].find(
+                    {"_id": {"$in": lead_ids}}, {"_id": 1}).to_list(length=None)}
+                for lead_id in lead_ids:
+                    if lead_id not in present:
+                        del placement[lead_id]
+        return placement
+
+    def close_connection(self):
+        """Close the Motor client."""
+        if self._client:
+            self._client.close()
+            self._client = None
+            self._db = None
+            self._transactions = None
+            logging.info("✅ Async MongoDB connection closed.")
+
+
+# Initialize the async singleton (connects lazily, on the first awaited call)
+async_mongodb = AsyncMongoDB()
+
+def get_async_db():
+    return async_mongodb.get_db()
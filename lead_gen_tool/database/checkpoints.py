@@ -0,0 +1,90 @@
+import os
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+# Configure Logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+CHECKPOINTS_COLLECTION = "scrape_checkpoints"
+# Set to "false" to ignore stored checkpoints and rescan every source from scratch
+CHECKPOINTS_ENABLED = os.getenv("SCRAPE_CHECKPOINTS_ENABLED", "true").lower() == "true"
+
+
+class CheckpointStore:
+    """
+    Per-source scrape progress stored in MongoDB, one document per (source, key):
+    e.g. ("instagram_post", post URL) -> comments already processed, or
+    ("serpapi_twitter", query) -> next result page to fetch.
+
+    Scrapers save a checkpoint as soon as a unit of work is finished (after its
+    leads are flushed), so the next run - or a restarted crashed run - skips it.
+    """
+
+    def __init__(self, collection=None, enabled: bool = CHECKPOINTS_ENABLED):
+        """
+        Args:
+            collection: pymongo collection; defaults to CHECKPOINTS_COLLECTION, resolved on first use
+            enabled: Ignore stored checkpoints (and store none) when False
+        """
+        self._collection = collection
+        self.enabled = enabled
+
+    @property
+    def collection(self):
+        if self._collection is None:
+            from database.mongodb import get_db
+            self._collection = get_db()[CHECKPOINTS_COLLECTION]
+        return self._collection
+
+    @staticmethod
+    def _id(source: str, key: str) -> str:
+        return f"{source}:{key}"
+
+    def get(self, source: str, key: str) -> Dict[str, Any]:
+        return self.get_many(source, [key]).get(key, {})
+
+    def get_many(self, source: str, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Load the checkpoints for several keys in one query; missing keys are omitted."""
+        keys = list(keys)
+        if not self.enabled or not keys:
+            return {}
+        try:
+            docs = self.collection.find({"_id": {"$in": [self._id(source, key) for key in keys]}})
+            return {doc["key"]: doc for doc in docs}
+        except Exception as e:
+            logging.warning(f"⚠️ Could not load {source} checkpoints ({e}). Scanning from scratch.")
+            return {}
+
+    def save(self, source: str, key: str, state: Dict[str, Any], append: Optional[Dict[str, List[Any]]] = None,
+             max_items: int = 1000):
+        """
+        Update a checkpoint.
+
+        Args:
+            source: Checkpoint namespace (e.g. "instagram_post")
+            key: Item within the source (e.g. an influencer or query)
+            state: Fields to overwrite
+            append: List fields to extend (e.g. processed comment fingerprints)
+            max_items: Appended lists keep only their newest `max_items` entries
+        """
+        if not self.enabled:
+            return
+        now = datetime.utcnow()
+        update: Dict[str, Any] = {
+            "$set": {**state, "updated_at": now},
+            "$setOnInsert": {"source": source, "key": key, "created_at": now}
+        }
+        if append:
+            update["$push"] = {field: {"$each": values, "$slice": -max_items} for field, values in append.items() if values}
+            if not update["$push"]:
+                del update["$push"]
+        try:
+            self.collection.update_one({"_id": self._id(source, key)}, update, upsert=True)
+        except Exception as e:
+            logging.warning(f"⚠️ Could not save {source} checkpoint for {key}: {e}")
+
+    def reset(self, source: Optional[str] = None) -> int:
+        """Delete the checkpoints of one source (or all of them) so the next run starts over."""
+        result = self.collection.delete_many({"source": source} if source else {})
+        return result.deleted_count
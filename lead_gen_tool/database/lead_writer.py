@@ -0,0 +1,221 @@
+import os
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from pymongo import DeleteOne, UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+
+# Configure Logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+LEAD_WRITE_BATCH_SIZE = int(os.getenv("LEAD_WRITE_BATCH_SIZE", "100"))
+LEAD_WRITE_FLUSH_SECONDS = float(os.getenv("LEAD_WRITE_FLUSH_SECONDS", "5"))
+DUPLICATE_KEY_ERROR = 11000
+
+
+class FlushStats(NamedTuple):
+    """Outcome of one bulk flush."""
+    inserted: int    # New documents created by the upsert
+    updated: int     # Existing documents whose $set fields changed
+    duplicates: int  # Leads that already existed unchanged (in MongoDB or earlier in the same batch)
+    errors: int      # Writes rejected for any other reason
+
+
+class LeadWriter:
+    """
+    Buffers leads and writes them with one unordered bulk_write of upserts per
+    batch, instead of a find_one + insert_one round trip pair per lead.
+
+    Each lead becomes UpdateOne(filter on the key fields, $setOnInsert the lead,
+    $set the `update_fields`, upsert=True), so existing leads are left alone
+    apart from the fields the caller asks to refresh (e.g. score and rationale).
+    The buffer is flushed when it reaches `batch_size`, every `flush_interval`
+    seconds from a background thread, and on close().
+
+    Usage:
+        with LeadWriter(db["leads"], on_insert=save_rows) as writer:
+            for lead in leads:
+                writer.add(lead)
+    """
+
+    def __init__(self, collection, key_fields: Sequence[str] = ("url",), update_fields: Sequence[str] = (),
+                 batch_size: int = LEAD_WRITE_BATCH_SIZE, flush_interval: float = LEAD_WRITE_FLUSH_SECONDS,
+                 on_insert: Optional[Callable[[List[Dict[str, Any]]], None]] = None):
+        """
+        Args:
+            collection: pymongo collection to write to
+            key_fields: Fields identifying a lead (backed by a unique index for "url")
+            update_fields: Fields overwritten on leads that already exist
+            batch_size: Buffered leads that trigger a flush
+            flush_interval: Seconds between background flushes (0 disables them)
+            on_insert: Called after each flush with the leads that were newly inserted
+        """
+        self.collection = collection
+        self.key_fields = tuple(key_fields)
+        self.update_fields = tuple(update_fields)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_insert = on_insert
+        self.totals = {"inserted": 0, "updated": 0, "duplicates": 0, "errors": 0, "batches": 0}
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread = None
+        if flush_interval > 0:
+            self._thread = threading.Thread(target=self._flush_periodically, name="lead-writer", daemon=True)
+            self._thread.start()
+
+    def _key(self, lead: Dict[str, Any]) -> Tuple:
+        return tuple(lead.get(field) for field in self.key_fields)
+
+    def _own_key_conflict(self, error: Dict[str, Any]) -> bool:
+        """True if a duplicate key error is on the key fields' own unique index."""
+        key_pattern = error.get("keyPattern")
+        if key_pattern is not None:
+            return set(key_pattern) == set(self.key_fields)
+        # Servers before 4.4 only name the index in the message, e.g. "index: url_1 dup key"
+        index = "_".join(f"{field}_1" for field in self.key_fields)
+        return f"index: {index} " in error.get("errmsg", "")
+
+    def _operation(self, lead: Dict[str, Any]) -> UpdateOne:
+        update = {"$setOnInsert": {k: v for k, v in lead.items() if k not in self.update_fields}}
+        updates = {k: lead[k] for k in self.update_fields if k in lead}
+        if updates:
+            update["$set"] = updates
+        return UpdateOne({field: lead.get(field) for field in self.key_fields}, update, upsert=True)
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._buffer)
+
+    def add(self, lead: Dict[str, Any]):
+        """Buffer a lead, flushing if the batch is full."""
+        with self._lock:
+            self._buffer.append(lead)
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self.flush()
+
+    def add_many(self, leads: Iterable[Dict[str, Any]]):
+        for lead in leads:
+            self.add(lead)
+
+    def flush(self) -> FlushStats:
+        """Write everything buffered so far in one unordered bulk_write."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+            if not batch:
+                return FlushStats(0, 0, 0, 0)
+
+            # Collapse repeats within the batch; the last copy of a lead wins
+            unique: Dict[Tuple, Dict[str, Any]] = {}
+            for lead in batch:
+                unique[self._key(lead)] = lead
+            leads = list(unique.values())
+            duplicates = len(batch) - len(leads)
+
+            errors = 0
+            try:
+                result = self.collection.bulk_write([self._operation(lead) for lead in leads], ordered=False)
+                upserted_ids = result.upserted_ids
+                matched, modified = result.matched_count, result.modified_count
+            except BulkWriteError as e:
+                # Unordered: every other write still went through
+                details = e.details
+                upserted_ids = {u["index"]: u["_id"] for u in details.get("upserted", [])}
+                matched, modified = details.get("nMatched", 0), details.get("nModified", 0)
+                for error in details.get("writeErrors", []):
+                    if error.get("code") == DUPLICATE_KEY_ERROR and self._own_key_conflict(error):
+                        duplicates += 1  # Lost an upsert race with another writer
+                    else:
+                        errors += 1
+                        logging.error(f"❌ Lead write failed: {error.get('errmsg')}")
+            except PyMongoError as e:
+                logging.error(f"❌ Bulk lead write of {len(leads)} leads failed: {e}")
+                stats = FlushStats(0, 0, duplicates, len(leads))
+                self._record(stats)
+                return stats
+
+            inserted = []
+            for index, _id in upserted_ids.items():
+                leads[index]["_id"] = _id
+                inserted.append(leads[index])
+
+            # Matched leads whose refreshed fields changed count as updated, the rest as duplicates
+            stats = FlushStats(len(inserted), modified, duplicates + matched - modified, errors)
+            self._record(stats)
+            logging.info(
+                f"💾 {self.collection.name}: flushed {len(batch)} leads - {stats.inserted} inserted, "
+                f"{stats.updated} updated, {stats.duplicates} duplicates, {stats.errors} errors"
+            )
+
+            if inserted and self.on_insert:
+                self.on_insert(inserted)
+            return stats
+
+    def _record(self, stats: FlushStats):
+        with self._lock:
+            for field, value in stats._asdict().items():
+                self.totals[field] += value
+            self.totals["batches"] += 1
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logging.error(f"❌ Background lead flush failed: {e}")
+
+    def close(self) -> Dict[str, int]:
+        """Stop the background flusher, write what is left and return the totals."""
+        self._closed.set()
+        if self._thread:
+            self._thread.join()
+        self.flush()
+        with self._lock:
+            return dict(self.totals)
+
+    def __enter__(self) -> "LeadWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def resolve_pending_leads(collection, leads: Iterable[Dict[str, Any]], key_fields: Sequence[str] = ("url",),
+                          on_confirmed: Optional[Callable[[List[Dict[str, Any]]], None]] = None) -> Tuple[int, int]:
+    """
+    Settle leads that were stored with competitor_check="pending" once combined
+    scoring has classified them: competitors are deleted from `collection`, the
+    rest lose the pending marker and are passed to `on_confirmed` (e.g. to add
+    their sheet rows, which the scrapers hold back for pending leads). Leads
+    without the marker are ignored. One bulk_write for the whole batch.
+
+    Args:
+        collection: pymongo collection the scraper's LeadWriter stored the leads in
+        leads: Scored leads; the competitor_check marker is removed from the dicts
+        key_fields: The writer's key fields
+        on_confirmed: Called with the leads that turned out not to be competitors
+
+    Returns:
+        (confirmed, removed) lead counts
+    """
+    confirmed, operations = [], []
+    for lead in leads:
+        if lead.pop("competitor_check", None) != "pending":
+            continue
+        key = {field: lead.get(field) for field in key_fields}
+        if lead.get("is_competitor"):
+            operations.append(DeleteOne({**key, "competitor_check": "pending"}))
+        else:
+            operations.append(UpdateOne(key, {"$unset": {"competitor_check": ""}}))
+            confirmed.append(lead)
+    if operations:
+        collection.bulk_write(operations, ordered=False)
+    if confirmed and on_confirmed:
+        on_confirmed(confirmed)
+    return len(confirmed), len(operations) - len(confirmed)
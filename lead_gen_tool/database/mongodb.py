@@ -1,11 +1,58 @@
 from pymongo import MongoClient, errors
 import os
 import logging
-from ai.lead_scoring import score_lead
+import threading
+
+from database.pool_stats import get_pool_listener
 
 # Configure Logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
+MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017/")
+DATABASE_NAME = "lead_generator"
+
+# Client settings shared by every MongoDB client in the process (scrapers, API, async API)
+POOL_OPTIONS = {
+    "maxPoolSize": int(os.getenv("MONGO_MAX_POOL_SIZE", "50")),  # Connection Pooling
+    "minPoolSize": int(os.getenv("MONGO_MIN_POOL_SIZE", "10")),
+    "maxIdleTimeMS": int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "0")) or None,  # Close connections idle this long (0 = never)
+    "serverSelectionTimeoutMS": int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000")),  # Timeout to prevent long waits
+    "connectTimeoutMS": int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "20000")),
+    "socketTimeoutMS": int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "0")) or None,  # 0 = no timeout
+}
+MONGO_WRITE_CONCERN = os.getenv("MONGO_WRITE_CONCERN", "1")  # "majority" or a number of nodes
+WRITE_CONCERN_OPTIONS = {
+    "w": int(MONGO_WRITE_CONCERN) if MONGO_WRITE_CONCERN.isdigit() else MONGO_WRITE_CONCERN,
+    "wTimeoutMS": int(os.getenv("MONGO_WRITE_TIMEOUT_MS", "0")),  # 0 = wait indefinitely for the write concern
+}
+
+# (collection, keys, options) created on connect by MongoDB and AsyncMongoDB
+INDEXES = [
+    ("leads", "url", {"unique": True}),  # Prevent duplicate leads
+    ("leads", "platform", {}),  # Optimized search by platform
+    ("blacklist", "url", {"unique": True}),  # Prevent duplicate blacklisting
+    ("leads", "score", {}),  # Index for score-based queries
+    ("discarded_leads", "url", {}),  # Discarded lead upserts
+] + [
+    # Keyset pagination in score order, optionally filtered by platform
+    (collection, keys, {})
+    for collection in ("leads", "discarded_leads")
+    for keys in ([("score", -1), ("_id", -1)], [("platform", 1), ("score", -1), ("_id", -1)])
+]
+
+
+def client_options(name: str):
+    """
+    Keyword arguments for a MongoClient/AsyncIOMotorClient: the shared pool,
+    timeout and write concern settings, plus the pool listener that collects
+    the client's statistics (see database.pool_stats).
+
+    Args:
+        name: Client name the statistics are reported under
+    """
+    return {**POOL_OPTIONS, **WRITE_CONCERN_OPTIONS, "event_listeners": [get_pool_listener(name)]}
+
+
 class MongoDB:
     _instance = None
     MIN_SCORE_THRESHOLD = 4  # Minimum score threshold for keeping leads
@@ -15,34 +62,34 @@ class MongoDB:
             cls._instance = super(MongoDB, cls).__new__(cls)
             cls._instance._client = None
             cls._instance._db = None
+            cls._instance._lock = threading.Lock()
         return cls._instance
 
     def connect(self):
         """Initialize MongoDB connection with error handling and connection pooling."""
+        client = MongoClient(MONGO_URI, **client_options("sync"))
         try:
-            self._client = MongoClient(
-                os.getenv("MONGO_URI", "mongodb://localhost:27017/"),
-                maxPoolSize=50,  # Connection Pooling
-                minPoolSize=10,
-                serverSelectionTimeoutMS=5000  # Timeout to prevent long waits
-            )
-            self._db = self._client["lead_generator"]
-            logging.info("✅ Connected to MongoDB successfully.")
-            
+            db = client[DATABASE_NAME]
+
             # Ensure indexes for faster queries
-            self._db["leads"].create_index("url", unique=True)  # Prevent duplicate leads
-            self._db["leads"].create_index("platform")  # Optimized search by platform
-            self._db["blacklist"].create_index("url", unique=True)  # Prevent duplicate blacklisting
-            self._db["leads"].create_index("score")  # Index for score-based queries
+            for collection, keys, options in INDEXES:
+                db[collection].create_index(keys, **options)
 
         except errors.ServerSelectionTimeoutError:
             logging.error("❌ MongoDB connection failed! Check your MONGO_URI.")
+            client.close()
             raise
 
+        # Published only once the indexes exist, so a failed first use is retried by the next one
+        self._client, self._db = client, db
+        logging.info("✅ Connected to MongoDB successfully.")
+
     def get_db(self):
-        """Return the database instance."""
+        """Return the database instance, connecting on first use."""
         if self._db is None:
-            self.connect()
+            with self._lock:
+                if self._db is None:
+                    self.connect()
         return self._db
     
     def add_lead(self, lead_data):
@@ -56,45 +103,34 @@ class MongoDB:
         Returns:
             bool: True if lead was added, False otherwise
         """
-        if self._db is None:
-            self.connect()
-        
-        # Extract relevant information for scoring
+        from ai.lead_scoring import score_lead  # Pulls in openai; only needed when scoring
+
+        db = self.get_db()
         name = lead_data.get("name", lead_data.get("username", "Unknown"))
         platform = lead_data.get("platform", "unknown")
         
-        # Gather all available text content
-        title = lead_data.get("job_title", "")
-        description = lead_data.get("description", "")
-        comment = lead_data.get("comment", "")
-        post_text = lead_data.get("post_text", "")
-        content = lead_data.get("content", "")
-        
-        # Combine all text content for scoring
-        combined_content = f"{title} {description} {comment} {post_text} {content}".strip()
-        
-        # Score the lead
-        score = score_lead(name, title, combined_content)
+        # Score the lead (served from the score cache when the content is unchanged)
+        score, rationale = score_lead(lead_data)
         lead_data["score"] = score
+        lead_data["rationale"] = rationale
         
         # Only add leads that meet minimum score threshold
         if score >= self.MIN_SCORE_THRESHOLD:
             try:
-                # Check if the lead already exists
-                existing_lead = self._db["leads"].find_one({"url": lead_data["url"]})
-                if existing_lead:
-                    # Update existing lead's score
-                    self._db["leads"].update_one(
-                        {"_id": existing_lead["_id"]},
-                        {"$set": {"score": score}}
-                    )
+                # One upsert round trip: insert new leads, refresh the score of existing ones
+                result = db["leads"].update_one(
+                    {"url": lead_data["url"]},
+                    {
+                        "$setOnInsert": {k: v for k, v in lead_data.items() if k not in ("score", "rationale")},
+                        "$set": {"score": score, "rationale": rationale}
+                    },
+                    upsert=True
+                )
+                if result.upserted_id is None:
                     logging.info(f"📊 Updated lead score: {name} - Score: {score}")
-                    return True
                 else:
-                    # Insert new lead
-                    self._db["leads"].insert_one(lead_data)
                     logging.info(f"✅ Added lead: {name} from {platform} - Score: {score}")
-                    return True
+                return True
             except Exception as e:
                 logging.error(f"❌ Error adding lead: {e}")
                 return False
@@ -113,9 +149,6 @@ class MongoDB:
         Returns:
             list: Leads matching the score criteria
         """
-        if self._db is None:
-            self.connect()
-            
         query = {}
         if min_score is not None:
             query["score"] = {"$gte": min_score}
@@ -125,7 +158,7 @@ class MongoDB:
             else:
                 query["score"] = {"$lte": max_score}
                 
-        leads = list(self._db["leads"].find(query))
+        leads = list(self.get_db()["leads"].find(query))
         return leads
     
     def close_connection(self):
@@ -134,9 +167,8 @@ class MongoDB:
             self._client.close()
             logging.info("✅ MongoDB connection closed.")
 
-# Initialize MongoDB singleton instance
+# Initialize MongoDB singleton instance (connects on first use, not at import)
 mongodb = MongoDB()
-mongodb.connect()
 
 def get_db():
     return mongodb.get_db()
@@ -0,0 +1,114 @@
+import time
+import threading
+from typing import Any, Dict
+
+from pymongo import monitoring
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """
+    Connection pool listener registered on a MongoDB client (see
+    database.mongodb.client_options). Tracks how many connections are checked
+    out and how long callers wait for one, so an undersized pool shows up as
+    growing wait times and checkout timeouts instead of slow requests.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._waiting = threading.local()  # Checkout start time; pymongo checks out on the caller's thread
+        self._stats: Dict[str, Any] = {
+            "pools": 0,
+            "connections_open": 0,
+            "checked_out": 0,
+            "peak_checked_out": 0,
+            "checkouts": 0,
+            "checkout_failures": 0,
+            "checkout_timeouts": 0,
+            "pool_clears": 0,
+        }
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _add(self, key: str, amount: int = 1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def _waited(self, event) -> float:
+        duration = getattr(event, "duration", None)  # Reported by pymongo >= 4.7
+        start = getattr(self._waiting, "start", None)
+        self._waiting.start = None
+        if duration is None:
+            duration = time.perf_counter() - start if start is not None else 0.0
+        return duration
+
+    def pool_created(self, event):
+        self._add("pools")
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._add("pool_clears")
+
+    def pool_closed(self, event):
+        self._add("pools", -1)
+
+    def connection_created(self, event):
+        self._add("connections_open")
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._add("connections_open", -1)
+
+    def connection_check_out_started(self, event):
+        self._waiting.start = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        self._waited(event)
+        with self._lock:
+            self._stats["checkout_failures"] += 1
+            if event.reason == monitoring.ConnectionCheckOutFailedReason.TIMEOUT:
+                self._stats["checkout_timeouts"] += 1
+
+    def connection_checked_out(self, event):
+        waited = self._waited(event)
+        with self._lock:
+            self._stats["checkouts"] += 1
+            self._stats["checked_out"] += 1
+            self._stats["peak_checked_out"] = max(self._stats["peak_checked_out"], self._stats["checked_out"])
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+    def connection_checked_in(self, event):
+        self._add("checked_out", -1)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            checkouts = self._stats["checkouts"]
+            return {
+                **self._stats,
+                "avg_wait_ms": round(self._wait_total / checkouts * 1000, 3) if checkouts else 0.0,
+                "max_wait_ms": round(self._wait_max * 1000, 3),
+            }
+
+
+_listeners: Dict[str, PoolStats] = {}
+_listeners_lock = threading.Lock()
+
+
+def get_pool_listener(name: str) -> PoolStats:
+    """Return the process-wide listener for the client called `name` ("sync", "async")."""
+    with _listeners_lock:
+        if name not in _listeners:
+            _listeners[name] = PoolStats(name)
+        return _listeners[name]
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Pool statistics of every client created so far, by client name."""
+    with _listeners_lock:
+        listeners = list(_listeners.values())
+    return {listener.name: listener.stats() for listener in listeners}
@@ -0,0 +1,176 @@
+import os
+import zlib
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from pymongo import UpdateOne, errors
+
+# Configure Logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+SHEET_INDEX_COLLECTION = "sheet_url_index"
+SHEET_INDEX_META_COLLECTION = "sheet_url_index_meta"
+# How often the index is checked against the sheet's URL column (0 = only on demand)
+SHEET_INDEX_VERIFY_SECONDS = int(os.getenv("SHEET_INDEX_VERIFY_SECONDS", str(24 * 3600)))
+# How long to keep deduping from the index alone after a failed verification
+SHEET_INDEX_VERIFY_RETRY_SECONDS = int(os.getenv("SHEET_INDEX_VERIFY_RETRY_SECONDS", "3600"))
+
+
+def url_checksum(urls: Iterable[str]) -> Dict[str, int]:
+    """
+    Order-independent fingerprint of a set of URLs: their count and the sum of
+    their CRC32s. Both can be maintained incrementally with $inc.
+    """
+    unique = set(urls)
+    return {"count": len(unique), "checksum": sum(zlib.crc32(url.encode("utf-8")) for url in unique)}
+
+
+class SheetUrlIndex:
+    """
+    Persisted index of the URLs already written to a Google Sheet.
+
+    Dedup checks query only the URLs being added (one indexed $in lookup), so
+    their cost does not grow with the sheet. URLs of rows queued for the sheet
+    are held in memory (queue_many) and only indexed once the rows have been
+    written (add_many), so rows the sheet writer drops are not treated as
+    present (discard_queued). The index is rebuilt from the sheet's URL column
+    only on demand or when the stored count/checksum no longer matches the sheet
+    (checked at most every SHEET_INDEX_VERIFY_SECONDS). Rows still queued for the
+    sheet must be flushed before verify() or resync() read it.
+    """
+
+    def __init__(self, db, sheet_name: str, url_column: int):
+        """
+        Args:
+            db: MongoDB database
+            sheet_name: Sheet the index belongs to
+            url_column: 1-based column holding the lead URL
+        """
+        self.sheet_name = sheet_name
+        self.url_column = url_column
+        self._urls = db[SHEET_INDEX_COLLECTION]
+        self._meta = db[SHEET_INDEX_META_COLLECTION]
+        self._urls.create_index([("sheet", 1), ("url", 1)], unique=True)
+        self._queued: Set[str] = set()  # Queued for the sheet, not written yet
+        self._queued_lock = threading.Lock()
+        self._verify_after: Optional[datetime] = None  # Set when a verification fails
+
+    def _meta_doc(self) -> Optional[Dict[str, Any]]:
+        return self._meta.find_one({"_id": self.sheet_name})
+
+    def existing(self, urls: Iterable[str]) -> Set[str]:
+        """Return which of `urls` are already in the sheet or queued for it."""
+        urls = list(set(urls))
+        if not urls:
+            return set()
+        with self._queued_lock:
+            queued = self._queued.intersection(urls)
+        cursor = self._urls.find({"sheet": self.sheet_name, "url": {"$in": urls}}, {"url": 1, "_id": 0})
+        return queued | {doc["url"] for doc in cursor}
+
+    def row_urls(self, rows: Iterable[List[Any]]) -> List[str]:
+        """The URLs in sheet rows."""
+        return [row[self.url_column - 1] for row in rows if len(row) >= self.url_column and row[self.url_column - 1]]
+
+    def queue_many(self, urls: Iterable[str]):
+        """Mark URLs whose rows were queued for the sheet, until add_many or discard_queued."""
+        with self._queued_lock:
+            self._queued.update(urls)
+
+    def discard_queued(self, urls: Iterable[str]):
+        """Forget queued URLs whose rows were never written."""
+        with self._queued_lock:
+            self._queued.difference_update(urls)
+
+    def add_many(self, urls: Iterable[str]) -> int:
+        """
+        Record URLs appended to the sheet and fold the new ones into the checksum.
+
+        Returns:
+            Number of URLs that were not indexed yet
+        """
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return 0
+        operations = [
+            UpdateOne({"sheet": self.sheet_name, "url": url}, {"$setOnInsert": {"added_at": datetime.utcnow()}}, upsert=True)
+            for url in urls
+        ]
+        try:
+            upserted = self._urls.bulk_write(operations, ordered=False).upserted_ids
+        except errors.BulkWriteError as e:
+            # Concurrent adds of the same URL; the other writer counted it
+            upserted = {u["index"]: u["_id"] for u in e.details.get("upserted", [])}
+        finally:
+            self.discard_queued(urls)
+        added = [urls[index] for index in upserted]
+        if added:
+            self._meta.update_one({"_id": self.sheet_name}, {"$inc": url_checksum(added)}, upsert=True)
+        return len(added)
+
+    def resync(self, worksheet, urls: Optional[List[str]] = None) -> int:
+        """
+        Rebuild the index from the sheet's URL column.
+
+        Args:
+            worksheet: gspread worksheet
+            urls: The column's URLs if they were already read
+
+        Returns:
+            Number of URLs indexed
+        """
+        if urls is None:
+            urls = self._read_sheet_urls(worksheet)
+        unique = sorted(set(urls))
+        self._urls.delete_many({"sheet": self.sheet_name})
+        if unique:
+            self._urls.insert_many(
+                [{"sheet": self.sheet_name, "url": url, "added_at": datetime.utcnow()} for url in unique],
+                ordered=False
+            )
+        self._meta.replace_one(
+            {"_id": self.sheet_name},
+            {**url_checksum(unique), "verified_at": datetime.utcnow()},
+            upsert=True
+        )
+        logging.info(f"🔁 Rebuilt sheet URL index for {self.sheet_name}: {len(unique)} URLs")
+        return len(unique)
+
+    def _read_sheet_urls(self, worksheet) -> List[str]:
+        return [url for url in worksheet.col_values(self.url_column)[1:] if url]  # Skip header
+
+    def verify(self, worksheet) -> bool:
+        """
+        Compare the index with the sheet's URL column and rebuild it on drift.
+
+        Returns:
+            True if the index had drifted and was rebuilt
+        """
+        urls = self._read_sheet_urls(worksheet)
+        expected = url_checksum(urls)
+        meta = self._meta_doc() or {}
+        if meta.get("count") == expected["count"] and meta.get("checksum") == expected["checksum"]:
+            self._meta.update_one({"_id": self.sheet_name}, {"$set": {"verified_at": datetime.utcnow()}})
+            return False
+        logging.warning(
+            f"⚠️ Sheet URL index for {self.sheet_name} drifted "
+            f"({meta.get('count', 0)} indexed vs {expected['count']} in sheet). Resyncing..."
+        )
+        self.resync(worksheet, urls)
+        return True
+
+    def postpone_verification(self):
+        """After a failed verification, wait SHEET_INDEX_VERIFY_RETRY_SECONDS before trying again."""
+        self._verify_after = datetime.utcnow() + timedelta(seconds=SHEET_INDEX_VERIFY_RETRY_SECONDS)
+
+    def verification_due(self) -> bool:
+        """True if the index was never built or was last checked against the sheet too long ago."""
+        if self._verify_after and datetime.utcnow() < self._verify_after:
+            return False
+        meta = self._meta_doc()
+        if meta is None or "verified_at" not in meta:
+            return True
+        return bool(SHEET_INDEX_VERIFY_SECONDS) and \
+            datetime.utcnow() - meta["verified_at"] > timedelta(seconds=SHEET_INDEX_VERIFY_SECONDS)
@@ -0,0 +1,234 @@
+import os
+import time
+import atexit
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+# Configure Logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))  # Drivers per platform pool
+BROWSER_HEADLESS = os.getenv("BROWSER_HEADLESS", "true").lower() == "true"
+BROWSER_MAX_USES = int(os.getenv("BROWSER_MAX_USES", "50"))  # Checkouts before a driver is recycled anyway
+BROWSER_ACQUIRE_TIMEOUT = 300
+
+_driver_path: Optional[str] = None
+_driver_path_lock = threading.Lock()
+
+
+class BrowserSetupError(RuntimeError):
+    """Raised when a new driver cannot be started or its session set up (e.g. login failed)."""
+
+
+def get_driver_path() -> str:
+    """Resolve (and if needed download) chromedriver once per process."""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            from webdriver_manager.chrome import ChromeDriverManager
+            _driver_path = ChromeDriverManager().install()
+        return _driver_path
+
+
+class PooledDriver:
+    """A pooled driver and how many times it has been checked out."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+
+
+class BrowserPool:
+    """
+    Pool of warm Chrome drivers for one platform.
+
+    Each driver is started once and set up once (e.g. cookies loaded and the
+    login verified) by the `setup` callback, then checked out and back in by
+    the scrapers. Drivers that fail a health check or reach BROWSER_MAX_USES
+    are quit and replaced on the next checkout. Up to `size` drivers exist at
+    a time, so several workers can crawl in parallel.
+    """
+
+    def __init__(self, name: str, size: int = BROWSER_POOL_SIZE, setup: Optional[Callable] = None,
+                 headless: bool = BROWSER_HEADLESS, max_uses: int = BROWSER_MAX_USES):
+        """
+        Args:
+            name: Platform name, used in logs
+            size: Maximum drivers alive at once
+            setup: Called with each new driver; returns False if the session could not be set up
+            headless: Start Chrome without a window
+            max_uses: Checkouts after which a driver is recycled
+        """
+        self.name = name
+        self.size = size
+        self.setup = setup
+        self.headless = headless
+        self.max_uses = max_uses
+        self._idle: "deque[PooledDriver]" = deque()
+        self._checked_out: Dict[int, PooledDriver] = {}
+        self._starting = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def _start(self) -> PooledDriver:
+        # Chrome tooling is imported on the first driver start, not when the scrapers are imported
+        import undetected_chromedriver as uc
+        from selenium.webdriver.chrome.service import Service
+
+        options = uc.ChromeOptions()
+        if self.headless:
+            options.add_argument("--headless=new")
+        started = time.perf_counter()
+        try:
+            driver = uc.Chrome(service=Service(get_driver_path()), options=options)
+        except Exception as e:
+            raise BrowserSetupError(f"Could not start Chrome for {self.name}: {e}")
+
+        try:
+            ready = self.setup(driver) if self.setup else True
+        except Exception as e:
+            logging.error(f"❌ {self.name} browser setup failed: {e}")
+            ready = False
+        if not ready:
+            self._quit(driver)
+            raise BrowserSetupError(f"{self.name} browser session could not be set up")
+
+        logging.info(f"🌐 Started {self.name} browser in {time.perf_counter() - started:.1f}s")
+        return PooledDriver(driver)
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logging.warning(f"⚠️ Error while closing WebDriver: {e}")
+
+    @staticmethod
+    def is_healthy(driver) -> bool:
+        """True if the browser still answers commands."""
+        try:
+            driver.execute_script("return document.readyState")
+            return bool(driver.window_handles)
+        except Exception:
+            return False
+
+    def acquire(self, timeout: float = BROWSER_ACQUIRE_TIMEOUT):
+        """
+        Check out a healthy driver, starting one if the pool has room.
+
+        Raises:
+            BrowserSetupError: If a new driver could not be started or set up
+            TimeoutError: If no driver became available within `timeout`
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._condition:
+                while not self._closed and not self._idle and len(self._checked_out) + self._starting >= self.size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"No {self.name} browser available after {timeout}s")
+                    self._condition.wait(remaining)
+                if self._closed:
+                    raise BrowserSetupError(f"{self.name} browser pool is closed")
+                pooled = self._idle.pop() if self._idle else None
+                if pooled is None:
+                    self._starting += 1
+
+            if pooled is None:
+                try:
+                    pooled = self._start()
+                finally:
+                    with self._condition:
+                        self._starting -= 1
+                        self._condition.notify()
+            elif not self.is_healthy(pooled.driver):
+                logging.warning(f"♻️ Recycling unhealthy {self.name} browser")
+                self._quit(pooled.driver)
+                continue
+
+            with self._condition:
+                pooled.uses += 1
+                self._checked_out[id(pooled.driver)] = pooled
+            return pooled.driver
+
+    def release(self, driver, healthy: bool = True):
+        """Return a driver to the pool; unhealthy or worn-out drivers are quit instead."""
+        with self._condition:
+            pooled = self._checked_out.pop(id(driver), None)
+            keep = pooled is not None and healthy and not self._closed and pooled.uses < self.max_uses
+            if keep:
+                self._idle.append(pooled)
+            self._condition.notify()
+        if not keep:
+            self._quit(driver)
+
+    @contextmanager
+    def driver(self, timeout: float = BROWSER_ACQUIRE_TIMEOUT) -> Iterator:
+        """Check out a driver for the duration of a `with` block."""
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def warm(self, count: Optional[int] = None):
+        """Start drivers up front (in parallel) so the first checkouts do not pay for startup."""
+        count = min(count or self.size, self.size)
+        drivers = []
+        lock = threading.Lock()
+
+        def start():
+            try:
+                driver = self.acquire()
+            except BrowserSetupError as e:
+                logging.error(f"❌ {e}")
+                return
+            with lock:
+                drivers.append(driver)
+
+        threads = [threading.Thread(target=start) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for driver in drivers:
+            self.release(driver)
+
+    def close(self):
+        """Quit idle drivers; checked-out drivers are quit when they are released."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            self._condition.notify_all()
+        for pooled in idle:
+            self._quit(pooled.driver)
+
+
+_pools: Dict[str, BrowserPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_browser_pool(name: str, setup: Optional[Callable] = None) -> BrowserPool:
+    """
+    Return the shared pool for a platform. Its size can be overridden with
+    <PLATFORM>_BROWSER_POOL_SIZE (default BROWSER_POOL_SIZE).
+    """
+    with _pools_lock:
+        if name not in _pools:
+            size = int(os.getenv(f"{name.upper()}_BROWSER_POOL_SIZE", BROWSER_POOL_SIZE))
+            _pools[name] = BrowserPool(name, size=size, setup=setup)
+        return _pools[name]
+
+
+def close_browser_pools():
+    """Quit every pooled browser; runs at interpreter exit and on API shutdown."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(close_browser_pools)
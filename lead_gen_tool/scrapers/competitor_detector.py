@@ -0,0 +1,213 @@
+import os
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Callable, List, NamedTuple, Optional
+
+from scrapers.competitor_filter import KeywordMatcher, COACH_PATTERNS, match_offering_transformation, OFFERING_MATCHER, PERSONAL_DEV_MATCHER
+
+# Configure Logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+VERDICT_CACHE_COLLECTION = "competitor_verdicts"
+VERDICT_CACHE_TTL_SECONDS = int(os.getenv("COMPETITOR_VERDICT_TTL_SECONDS", str(30 * 24 * 3600)))  # 30 days
+
+# First-person pain language that coaches rarely use about themselves
+PAIN_SIGNALS = [
+    "i hate my job", "hate my job", "i feel stuck", "feeling stuck", "i'm stuck", "im stuck",
+    "burnout", "burned out", "burnt out", "overwhelmed", "struggling", "i feel lost",
+    "should i quit", "quit my job", "career anxiety", "stressed at work", "so tired of"
+]
+
+COACH_PATTERN_MATCHER = KeywordMatcher(patterns={"coach_pattern": COACH_PATTERNS})
+PAIN_MATCHER = KeywordMatcher(keywords={"pain_signal": PAIN_SIGNALS})
+
+TIERS = ["keyword", "cache", "heuristic", "llm", "deferred", "error"]
+
+# Reason given when the LLM tier is deferred to the combined classify-and-score request
+DEFERRED_REASON = "Deferred to combined classification and scoring"
+
+
+class Verdict(NamedTuple):
+    """Outcome of a competitor check and the tier that decided it."""
+    is_competitor: bool
+    reason: str
+    tier: str
+
+
+class CompetitorDetector:
+    """
+    Tiered coach/competitor detector.
+
+    1. keyword:   the caller's keyword/regex rules (always evaluated, cheapest)
+    2. cache:     verdicts already reached for this username/profile URL
+    3. heuristic: local confidence rules (coach patterns, offering + transformation
+                  language, or first-person pain language with no offering)
+    4. llm:       GPT-4, only for the cases the local tiers cannot settle, or
+                  "deferred" to the lead scoring request when combined
+                  classification is enabled (see ai.lead_scoring.classify_and_score_lead)
+
+    Verdicts from the cache-able tiers are stored per profile in memory and in
+    MongoDB (expiring after VERDICT_CACHE_TTL_SECONDS), so a repeat commenter is
+    not re-classified. A failed LLM call returns an "error" verdict, which is
+    never cached so the profile is checked again next time.
+    """
+
+    def __init__(self, platform: str, llm_prompt: str, key_field: str):
+        """
+        Args:
+            platform: Namespace for cached verdicts (e.g. "linkedin", "instagram")
+            llm_prompt: System prompt asking the LLM to answer 'Yes' for competitors
+            key_field: Lead field holding the cache key (e.g. "url", "username")
+        """
+        self.platform = platform
+        self.key_field = key_field
+        self.llm_prompt = llm_prompt
+        self._verdicts: Dict[str, Verdict] = {}
+        self._collection = None
+        self._mongo_disabled = False
+        self._lock = threading.Lock()
+        self._stats = {tier: 0 for tier in TIERS}
+
+    def _get_collection(self):
+        """Lazily resolve the Mongo collection; fall back to memory-only on failure."""
+        if self._collection is None and not self._mongo_disabled:
+            try:
+                from database.mongodb import get_db
+                collection = get_db()[VERDICT_CACHE_COLLECTION]
+                collection.create_index("updated_at", expireAfterSeconds=VERDICT_CACHE_TTL_SECONDS)
+                self._collection = collection
+            except Exception as e:
+                logging.warning(f"⚠️ Competitor verdict cache unavailable in MongoDB ({e}). Using in-process cache only.")
+                self._mongo_disabled = True
+        return self._collection
+
+    def _cached(self, key: str) -> Optional[Verdict]:
+        verdict = self._verdicts.get(key)
+        if verdict is None and self._get_collection() is not None:
+            try:
+                doc = self._collection.find_one({"_id": f"{self.platform}:{key}"})
+            except Exception as e:
+                logging.warning(f"⚠️ Competitor verdict lookup failed: {e}")
+                doc = None
+            if doc:
+                verdict = Verdict(doc["is_competitor"], doc["reason"], doc["tier"])
+                self._verdicts[key] = verdict
+        return verdict
+
+    def _remember(self, key: str, verdict: Verdict) -> Verdict:
+        if key:
+            self._verdicts[key] = verdict
+            if self._get_collection() is not None:
+                try:
+                    self._collection.update_one(
+                        {"_id": f"{self.platform}:{key}"},
+                        {"$set": {**verdict._asdict(), "platform": self.platform, "updated_at": datetime.utcnow()}},
+                        upsert=True
+                    )
+                except Exception as e:
+                    logging.warning(f"⚠️ Competitor verdict write failed: {e}")
+        return verdict
+
+    def _count(self, verdict: Verdict) -> Verdict:
+        with self._lock:
+            self._stats[verdict.tier] += 1
+        return verdict
+
+    @staticmethod
+    def heuristic(text: str) -> Optional[Verdict]:
+        """Local confidence rules; returns None when the text is ambiguous."""
+        match = COACH_PATTERN_MATCHER.match(text) or match_offering_transformation(text)
+        if match:
+            return Verdict(True, f"Coach language detected by heuristic ('{match.pattern}')", "heuristic")
+
+        offering = OFFERING_MATCHER.match(text)
+        if not offering and PAIN_MATCHER.match(text):
+            return Verdict(False, "First-person pain language with no offering", "heuristic")
+        if not offering and not PERSONAL_DEV_MATCHER.match(text):
+            return Verdict(False, "No offering or personal development language", "heuristic")
+        return None
+
+    def ask_llm(self, profile_info: str) -> Verdict:
+        """Ask GPT-4 whether the profile belongs to a coach/competitor ("error" tier if the call fails)."""
+        import openai  # Only loaded once a check actually reaches the LLM tier
+
+        # OpenAI API Key - Load from environment variable
+        openai.api_key = openai.api_key or os.getenv("OPENAI_API_KEY")
+        try:
+            response = openai.ChatCompletion.create(
+                model="gpt-4",
+                messages=[
+                    {"role": "system", "content": self.llm_prompt},
+                    {"role": "user", "content": profile_info}
+                ],
+                max_tokens=50
+            )
+            ai_decision = response.choices[0].message.content.strip().lower()
+        except Exception as e:
+            logging.warning(f"⚠️ AI filtering error: {e}. Falling back to keyword matching only.")
+            return Verdict(False, f"AI filtering error: {e}", "error")
+        if "yes" in ai_decision:
+            return Verdict(True, "AI detected profile as coach/competitor", "llm")
+        return Verdict(False, "Not detected as coach/competitor", "llm")
+
+    def classify(self, key: str, keyword_check: Callable[[], Optional[str]], text: str, profile_info: str,
+                 defer_llm: bool = False) -> Verdict:
+        """
+        Run the tiers in order and return the first confident verdict.
+
+        Args:
+            key: Username or profile URL the verdict is cached under ("" disables caching)
+            keyword_check: Returns a skip reason if the caller's keyword rules match
+            text: Text for the local heuristic
+            profile_info: Text sent to the LLM if the local tiers are not confident
+            defer_llm: Instead of calling the LLM, return a non-competitor verdict with
+                       DEFERRED_REASON so the check is folded into lead scoring
+        """
+        reason = keyword_check()
+        if reason:
+            return self._count(self._remember(key, Verdict(True, reason, "keyword")))
+
+        cached = self._cached(key) if key else None
+        if cached:
+            return self._count(Verdict(cached.is_competitor, f"{cached.reason} (cached)", "cache"))
+
+        verdict = self.heuristic(text)
+        if verdict is None and defer_llm:
+            return self._count(Verdict(False, DEFERRED_REASON, "deferred"))
+
+        verdict = verdict or self.ask_llm(profile_info)
+        if verdict.tier == "error":
+            return self._count(verdict)  # Not cached: a transient failure must not stick to the profile
+        return self._count(self._remember(key, verdict))
+
+    def record_combined_verdicts(self, leads: List[Dict[str, Any]]):
+        """
+        Cache the competitor verdicts that combined scoring returned for deferred leads.
+        Failed scoring requests (score 0, "Error: ..." rationale) carry no verdict and are skipped.
+        """
+        for lead in leads:
+            failed = lead.get("score") == 0 or str(lead.get("rationale", "")).startswith("Error:")
+            if lead.get("competitor_check") == "pending" and "is_competitor" in lead and not failed:
+                reason = "AI detected profile as coach/competitor" if lead["is_competitor"] else "Not detected as coach/competitor"
+                self._remember(lead.get(self.key_field, ""), Verdict(lead["is_competitor"], reason, "llm"))
+
+    def stats(self) -> Dict[str, int]:
+        """Decisions per tier, plus how many LLM calls the local tiers saved."""
+        with self._lock:
+            stats = dict(self._stats)
+        # Deferred checks ride along with the scoring request, so they cost no extra call either
+        stats["llm_calls_saved"] = sum(stats[tier] for tier in TIERS if tier not in ("llm", "error"))
+        return stats
+
+    def log_stats(self):
+        stats = self.stats()
+        logging.info(
+            f"📉 {self.platform} competitor checks: {stats['keyword']} keyword, {stats['cache']} cache, "
+            f"{stats['heuristic']} heuristic, {stats['llm']} LLM, {stats['deferred']} deferred, {stats['error']} failed "
+            f"({stats['llm_calls_saved']} LLM calls saved)"
+        )
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats = {tier: 0 for tier in TIERS}
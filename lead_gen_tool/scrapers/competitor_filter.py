@@ -0,0 +1,208 @@
+import re
+from typing import Dict, List, NamedTuple, Optional
+
+# Coach/Competitor Exclusion Keywords for LinkedIn job titles
+EXCLUDED_TITLES = [
+    "coach", "mentor", "consultant", "advisor", "trainer", "counselor", "therapist",
+    "life coach", "business coach", "career coach", "executive coach", "personal coach",
+    "leadership coach", "wellness coach", "mindset coach", "transformation coach",
+    "performance coach", "success coach", "professional mentor", "life mentor",
+    "business consultant", "lifestyle consultant", "career counselor",
+    "personal development", "self-help", "motivational speaker", "business advisor",
+    "career strategist", "wellness consultant", "life strategist", "success strategist",
+    "empowerment specialist", "transformation specialist", "mindfulness teacher"
+]
+
+# Coach/Competitor Exclusion Keywords for Instagram commenters
+COACH_EXCLUSION_KEYWORDS = EXCLUDED_TITLES + [
+    "DM for coaching", "coaching services", "book a session", "free consultation",
+    "click link in bio", "link in bio", "sign up now", "register now", "transform your life",
+    "take your life to the next level", "unlock your potential", "growth mindset guru",
+    "webinar", "workshop", "masterclass", "course enrollment", "coaching program"
+]
+
+# Typical promotional patterns in Instagram comments
+PROMO_PATTERNS = [
+    "dm me", "message me", "check out my", "follow me", "visit my profile",
+    "link in bio", "book a call", "free session", "free consultation"
+]
+
+# Enhanced exclusion keywords to filter out competitors and coaches on Twitter
+COMPETITOR_KEYWORDS = [
+    # Personal coaching terms
+    "coach", "coaching", "mentor", "mentoring", "consultant", "consulting",
+    "trainer", "advisor", "strategist", "counselor", "therapist",
+
+    # Specific coaching types
+    "life coach", "career coach", "business coach", "personal coach",
+    "executive coach", "leadership coach", "mindset coach", "transformation coach",
+    "wellness coach", "health coach", "success coach", "performance coach",
+
+    # Marketing phrases used by coaches
+    "grow your", "scale your", "transform your", "unlock your potential",
+    "achieve your goals", "overcome obstacles", "mindfulness practice",
+    "self-improvement", "personal growth", "life changing", "breakthrough",
+
+    # Call-to-action phrases
+    "free webinar", "free consultation", "book a call", "schedule a session",
+    "DM me for", "link in bio", "join my", "follow for more tips",
+    "click the link", "sign up now", "limited spots", "exclusive offer"
+]
+
+# Coach-in-bio patterns
+COACH_PATTERNS = [
+    r"(^|\s)coach(\s|$|ing|ed|es)",
+    r"(^|\s)mentor(\s|$|ing|ed|s)",
+    r"(career|life|business|executive)\s+(coach|mentor|consultant)",
+    r"helping (people|professionals|individuals|clients) (to )?(\w+ ){1,3}(goals|dreams|potential)",
+    r"transform(ing|ative)? (your|lives)",
+    r"I help \w+ (to )?(\w+ )+",  # "I help professionals to achieve their goals" pattern
+]
+
+# Term groups for the offering + transformation + personal development heuristic
+OFFERING_TERMS = ["offer", "provide", "help", "guide", "teach", "support", "coach", "mentor"]
+TRANSFORMATION_TERMS = ["transform", "improve", "change", "develop", "grow", "achieve", "succeed"]
+PERSONAL_DEV_TERMS = ["life", "career", "personal", "professional", "mindset", "growth", "journey"]
+
+
+class FilterMatch(NamedTuple):
+    """The rule that matched a piece of text."""
+    rule: str
+    pattern: str
+
+
+def _trie_pattern(words: List[str]) -> str:
+    """
+    Build a regex that matches any of `words`, factored into a prefix trie so the
+    regex engine never backtracks across keywords that share a prefix.
+    Longer keywords win over their own prefixes at the same position.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}  # End-of-keyword marker
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+def _required_literal(regex: str) -> Optional[str]:
+    """
+    Return the longest lowercase literal that every match of `regex` must contain,
+    taken from the parts of the pattern outside any group, or None if there is none.
+    """
+    if "|" in re.sub(r"\\.|\([^()]*\)", "", regex):
+        return None  # Top-level alternation: no single required literal
+
+    outside = []
+    depth = 0
+    escaped = False
+    for char in regex:
+        if escaped:
+            outside.append("\x00")  # Escapes like \w or \s break a literal run
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == "(":
+            depth += 1
+            outside.append("\x00")
+        elif char == ")":
+            depth -= 1
+            outside.append("\x00")
+        elif depth == 0:
+            outside.append(char)
+
+    # A quantifier makes the preceding character optional or repeatable
+    runs = re.split(r"\x00|.[?*+{]|[\[\].^$?*+{}]", "".join(outside))
+    literals = [run.lower() for run in runs if run.strip()]
+    return max(literals, key=len) if literals else None
+
+
+class KeywordMatcher:
+    """
+    Matches text against many keyword and regex rules in a single scan.
+
+    All keywords are compiled into one prefix-trie regex when the matcher is
+    built, so the per-item cost no longer grows with one substring scan per
+    keyword. Regex rules are only evaluated when the literal they require
+    appears in the text. Text is lowercased before matching, so keywords are
+    case-insensitive (unless lowercase_keywords is off) and regex rules only
+    match their lowercase literals.
+    """
+
+    def __init__(self, keywords: Optional[Dict[str, List[str]]] = None, patterns: Optional[Dict[str, List[str]]] = None,
+                 lowercase_keywords: bool = True):
+        """
+        Args:
+            keywords: Rule name -> literal substrings (matched anywhere in the text)
+            patterns: Rule name -> regular expressions
+            lowercase_keywords: Lowercase the keywords too; when False, keywords
+                with uppercase letters never match (the Twitter filter's legacy behaviour)
+        """
+        self._keyword_rules: Dict[str, str] = {}
+        for rule, words in (keywords or {}).items():
+            for word in words:
+                self._keyword_rules.setdefault(word.lower() if lowercase_keywords else word, rule)
+        self._keyword_regex = re.compile(_trie_pattern(list(self._keyword_rules))) if self._keyword_rules else None
+
+        # (compiled regex, required literal or None, match) in rule order
+        self._patterns = []
+        for rule, regexes in (patterns or {}).items():
+            for regex in regexes:
+                # No IGNORECASE: patterns run against the lowercased text, as the per-pattern loop did
+                self._patterns.append((re.compile(regex), _required_literal(regex), FilterMatch(rule, regex)))
+        literals = {literal for _, literal, _ in self._patterns if literal}
+        # Lookahead so overlapping literals are all reported
+        self._literal_regex = re.compile(f"(?=({_trie_pattern(sorted(literals))}))") if literals else None
+
+    def match(self, text: str) -> Optional[FilterMatch]:
+        """Return the first rule that matches `text`, or None."""
+        text = text.lower()
+
+        if self._keyword_regex is not None:
+            found = self._keyword_regex.search(text)
+            if found:
+                keyword = found.group(0)
+                return FilterMatch(self._keyword_rules[keyword], keyword)
+
+        if self._patterns:
+            present = set(self._literal_regex.findall(text)) if self._literal_regex is not None else set()
+            for regex, literal, rule_match in self._patterns:
+                if (literal is None or literal in present) and regex.search(text):
+                    return rule_match
+
+        return None
+
+
+# Matchers are built once at import and shared by every scraper
+LINKEDIN_TITLE_MATCHER = KeywordMatcher(keywords={"excluded_title": EXCLUDED_TITLES})
+INSTAGRAM_KEYWORD_MATCHER = KeywordMatcher(keywords={"excluded_keyword": COACH_EXCLUSION_KEYWORDS})
+INSTAGRAM_PROMO_MATCHER = KeywordMatcher(keywords={"promotional_language": PROMO_PATTERNS})
+TWITTER_COMPETITOR_MATCHER = KeywordMatcher(
+    keywords={"competitor_keyword": COMPETITOR_KEYWORDS},
+    patterns={"coach_pattern": COACH_PATTERNS},
+    lowercase_keywords=False
+)
+OFFERING_MATCHER = KeywordMatcher(keywords={"offering": OFFERING_TERMS})
+TRANSFORMATION_MATCHER = KeywordMatcher(keywords={"transformation": TRANSFORMATION_TERMS})
+PERSONAL_DEV_MATCHER = KeywordMatcher(keywords={"personal_development": PERSONAL_DEV_TERMS})
+
+
+def match_offering_transformation(text: str) -> Optional[FilterMatch]:
+    """
+    Check for bios that contain both offering + transformation words in a
+    personal development context.
+    """
+    if OFFERING_MATCHER.match(text) and TRANSFORMATION_MATCHER.match(text):
+        personal_dev = PERSONAL_DEV_MATCHER.match(text)
+        if personal_dev:
+            return FilterMatch("offering_transformation", personal_dev.pattern)
+    return None
@@ -0,0 +1,199 @@
+import os
+import re
+import zlib
+import random
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+# Configure Logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+DEDUP_NUM_PERM = 64       # MinHash permutations per signature
+DEDUP_BANDS = 16          # LSH bands (DEDUP_NUM_PERM / DEDUP_BANDS rows each)
+DEDUP_SHINGLE_SIZE = 3    # Word shingles
+DEDUP_MIN_WORDS = int(os.getenv("DEDUP_MIN_WORDS", "8"))  # Shorter texts are too generic to call duplicates
+DEDUP_SIMILARITY = float(os.getenv("DEDUP_SIMILARITY", "0.8"))  # Estimated Jaccard needed to merge
+
+# Lead fields holding the text people actually wrote
+TEXT_FIELDS = ["text", "content", "comment", "post_text", "description"]
+
+# Hosts that serve the same content under another name
+HOST_ALIASES = {
+    "x.com": "twitter.com",
+    "mobile.twitter.com": "twitter.com",
+    "mobile.x.com": "twitter.com",
+    "m.twitter.com": "twitter.com",
+    "instagr.am": "instagram.com",
+    "m.instagram.com": "instagram.com"
+}
+# Platforms whose URLs never need their query string (it only carries tracking/share parameters)
+QUERYLESS_HOSTS = {"twitter.com", "instagram.com", "linkedin.com"}
+TRACKING_PARAM = re.compile(r"^(utm_\w+|fbclid|gclid|igshid|igsh|ref|ref_src|s|t|si|trk)$")
+
+_WORD = re.compile(r"[a-z0-9']+")
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Map equivalent lead URLs to one form: https, no "www."/mobile prefixes,
+    x.com -> twitter.com, LinkedIn country subdomains -> linkedin.com, no
+    tracking parameters, fragment or trailing slash.
+    """
+    if not url:
+        return url
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    host = HOST_ALIASES.get(host, host)
+    if host.endswith(".linkedin.com"):
+        host = "linkedin.com"
+
+    path = parts.path.rstrip("/") or "/"
+    if host == "twitter.com":
+        path = re.sub(r"/status/(\d+).*$", r"/status/\1", path)  # Drop /photo/1, /analytics, ...
+
+    if host in QUERYLESS_HOSTS:
+        query = ""
+    else:
+        query = "&".join(
+            param for param in parts.query.split("&")
+            if param and not TRACKING_PARAM.match(param.split("=", 1)[0].lower())
+        )
+    return urlunsplit(("https", host, path, query, ""))
+
+
+def lead_text(lead: Dict[str, Any]) -> str:
+    return " ".join(str(lead[field]) for field in TEXT_FIELDS if lead.get(field))
+
+
+def shingles(text: str, size: int = DEDUP_SHINGLE_SIZE) -> Set[str]:
+    """Word n-grams of the lowercased, punctuation-free text."""
+    words = _WORD.findall(text.lower())
+    if len(words) < DEDUP_MIN_WORDS:
+        return set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+class MinHasher:
+    """MinHash signatures from universal hashes (a*x + b) mod p over CRC32 shingle hashes."""
+
+    def __init__(self, num_perm: int = DEDUP_NUM_PERM, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._params = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME)) for _ in range(num_perm)]
+
+    def signature(self, shingle_set: Set[str]) -> Tuple[int, ...]:
+        hashes = [zlib.crc32(shingle.encode("utf-8")) for shingle in shingle_set]
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._params
+        )
+
+    @staticmethod
+    def similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+        """Estimated Jaccard similarity of the two shingle sets."""
+        return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+class LSHIndex:
+    """
+    Banded LSH over MinHash signatures. Each signature is split into `bands`
+    bands; items sharing any whole band become candidates, so a query touches
+    only its buckets instead of every indexed item.
+    """
+
+    def __init__(self, num_perm: int = DEDUP_NUM_PERM, bands: int = DEDUP_BANDS):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets: List[Dict[Tuple[int, ...], List[Any]]] = [defaultdict(list) for _ in range(bands)]
+        self._signatures: Dict[Any, Tuple[int, ...]] = {}
+
+    def _band_keys(self, signature: Tuple[int, ...]):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def add(self, key: Any, signature: Tuple[int, ...]):
+        self._signatures[key] = signature
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band][band_key].append(key)
+
+    def query(self, signature: Tuple[int, ...], threshold: float = DEDUP_SIMILARITY) -> Optional[Any]:
+        """Return the most similar indexed key at or above `threshold`, or None."""
+        candidates = set()
+        for band, band_key in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(band_key, ()))
+        best, best_similarity = None, threshold
+        for key in candidates:
+            similarity = MinHasher.similarity(signature, self._signatures[key])
+            if similarity >= best_similarity:
+                best, best_similarity = key, similarity
+        return best
+
+
+class LeadDeduplicator:
+    """
+    Flags leads that repeat one already seen: the same canonical URL, or
+    near-identical text (MinHash/LSH) on any platform.
+    """
+
+    def __init__(self, threshold: float = DEDUP_SIMILARITY):
+        self.threshold = threshold
+        self._hasher = MinHasher()
+        self._index = LSHIndex()
+        self._seen: List[Dict[str, Any]] = []
+        self._exact: Dict[str, int] = {}  # Canonical URL -> first lead with that URL
+
+    def check(self, lead: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Canonicalize the lead's URL and index it.
+
+        Returns:
+            The earlier lead this one duplicates, or None if it is new
+        """
+        if lead.get("url"):
+            lead["url"] = canonicalize_url(lead["url"])
+        exact_key = lead.get("url", "")
+        if exact_key and exact_key in self._exact:
+            return self._seen[self._exact[exact_key]]
+
+        position = len(self._seen)
+        shingle_set = shingles(lead_text(lead))
+        if shingle_set:
+            signature = self._hasher.signature(shingle_set)
+            match = self._index.query(signature, self.threshold)
+            if match is not None:
+                return self._seen[match]
+            self._index.add(position, signature)
+
+        self._seen.append(lead)
+        if exact_key:
+            self._exact[exact_key] = position
+        return None
+
+
+def deduplicate_leads(leads: List[Dict[str, Any]]
+                      ) -> Tuple[List[Dict[str, Any]], List[Tuple[Dict[str, Any], Dict[str, Any]]]]:
+    """
+    Split leads into unique ones and (duplicate, original) pairs, keeping the
+    first occurrence. Duplicates are tagged with the original's URL in
+    `duplicate_of`. Runs before scoring so duplicates never reach the LLM.
+    """
+    deduplicator = LeadDeduplicator()
+    unique, duplicates = [], []
+    for lead in leads:
+        original = deduplicator.check(lead)
+        if original is None:
+            unique.append(lead)
+        else:
+            lead["duplicate_of"] = original.get("url")
+            duplicates.append((lead, original))
+    if duplicates:
+        logging.info(f"🧬 Deduplication: {len(duplicates)} of {len(leads)} leads were duplicates")
+    return unique, duplicates
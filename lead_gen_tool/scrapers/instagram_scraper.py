@@ -1,58 +1,34 @@
-import time
 import json
+import zlib
 import logging
-import undetected_chromedriver as uc
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-from pymongo import MongoClient
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 import os
-import openai
+from scrapers.competitor_filter import INSTAGRAM_KEYWORD_MATCHER, INSTAGRAM_PROMO_MATCHER
+from scrapers.competitor_detector import CompetitorDetector, DEFERRED_REASON
+from scrapers.rate_limit import get_rate_limiter
+from scrapers.browser_pool import BrowserSetupError, get_browser_pool
+from scrapers.sheets_sink import get_sheets_sink
+from scrapers.sheets_client import open_worksheet
+from scrapers.dedup import canonicalize_url
+from database.lead_writer import LeadWriter, resolve_pending_leads
+from database.checkpoints import CheckpointStore
+from database.mongodb import get_db
 
 # Configure Logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
-# MongoDB Setup
-MONGO_URI = "mongodb://localhost:27017/"
-client = MongoClient(MONGO_URI)
-db = client["lead_generator"]
-leads_collection = db["leads"]
+# MongoDB Setup (shared client, connected on first use)
+checkpoints = CheckpointStore()
 
 # Define Explicit Paths
-GOOGLE_SHEETS_CREDENTIALS = r"D:\SCRIPTS\lead_gen_tool\config\google_sheets_credentials.json"
 COOKIES_FILE = r"D:\SCRIPTS\lead_gen_tool\scrapers\instagram_cookies.json"
 SHEET_NAME = "Peak Transformation Coaching Leads"
 
-# OpenAI API Key - Load from environment variable
-openai.api_key = os.getenv("OPENAI_API_KEY")
-
-# Coach/Competitor Exclusion Keywords (expanded list)
-COACH_EXCLUSION_KEYWORDS = [
-    "coach", "mentor", "consultant", "advisor", "trainer", "counselor", "therapist",
-    "life coach", "business coach", "career coach", "executive coach", "personal coach",
-    "leadership coach", "wellness coach", "mindset coach", "transformation coach",
-    "performance coach", "success coach", "professional mentor", "life mentor",
-    "business consultant", "lifestyle consultant", "career counselor", 
-    "personal development", "self-help", "motivational speaker", "business advisor",
-    "career strategist", "wellness consultant", "life strategist", "success strategist",
-    "empowerment specialist", "transformation specialist", "mindfulness teacher",
-    "DM for coaching", "coaching services", "book a session", "free consultation",
-    "click link in bio", "link in bio", "sign up now", "register now", "transform your life",
-    "take your life to the next level", "unlock your potential", "growth mindset guru",
-    "webinar", "workshop", "masterclass", "course enrollment", "coaching program"
-]
-
 def connect_to_google_sheets():
-    creds = ServiceAccountCredentials.from_json_keyfile_name(
-        GOOGLE_SHEETS_CREDENTIALS, 
-        ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-    )
-    client = gspread.authorize(creds)
-    return client.open(SHEET_NAME).sheet1
+    return open_worksheet(SHEET_NAME)
 
 # Load Instagram Cookies
 def load_cookies(driver, cookies_file=COOKIES_FILE):
@@ -71,6 +47,30 @@ def load_cookies(driver, cookies_file=COOKIES_FILE):
         logging.error(f"⚠️ Error loading cookies: {e}")
         return False
 
+def log_in(driver) -> bool:
+    """Load the Instagram session cookies into a new pooled browser and check the login."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    driver.get("https://www.instagram.com")
+    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+
+    if not load_cookies(driver):
+        logging.error("❌ Instagram login required, but cookies are missing.")
+        return False
+
+    driver.refresh()
+    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+
+    if "login" in driver.current_url.lower():
+        logging.error("❌ Login failed! Check Instagram cookies.")
+        return False
+    return True
+
+# Warm, already logged-in browsers shared across scrapes
+browser_pool = get_browser_pool("instagram", setup=log_in)
+
 # Expanded list of influencers to target for comments
 INFLUENCER_PROFILES = [
     "tonyrobbins", "garyvee", "robinsharma", "simon_sinek", "jay_shetty",
@@ -80,175 +80,360 @@ INFLUENCER_PROFILES = [
 # Keywords to filter relevant comments
 KEYWORDS = ["stuck", "lost", "help", "burnout", "struggling", "overwhelmed"]
 
-def is_coach_competitor(username="", bio="", comment_text=""):
+# Crawl settings
+POST_LINK_SELECTOR = "a[href*='/p/']"
+COMMENT_SELECTOR = "div._a9zr"
+COMMENT_USERNAME_SELECTOR = "._a9zc"
+COMMENT_TEXT_SELECTOR = "div.xt0psk2 span"
+POSTS_PER_PROFILE = 10
+PAGE_WAIT_SECONDS = 10  # Explicit wait for posts/comments to render
+COMMENT_EXPAND_WAIT_SECONDS = 5  # Wait for more comments after "View all"
+INSTAGRAM_MAX_PAGE_LOADS = int(os.getenv("INSTAGRAM_MAX_PAGE_LOADS", "120"))  # Per crawl, across all workers
+# Posts first seen within this window are re-opened for new comments; older checkpointed posts are skipped
+INSTAGRAM_POST_REVISIT_HOURS = int(os.getenv("INSTAGRAM_POST_REVISIT_HOURS", "48"))
+MAX_COMMENT_FINGERPRINTS = 2000  # Per post checkpoint
+STORED_POLL_SECONDS = 0.5  # How often iter_instagram_comments hands on leads stored by the workers
+
+# Tiered competitor detection: keywords -> cached verdicts -> local heuristic -> GPT-4
+competitor_detector = CompetitorDetector(
+    platform="instagram",
+    llm_prompt="""Analyze if this person is likely to be a personal coach, 
+                 life coach, career coach, mentor, consultant, or similar competitor in the personal/professional 
+                 development space. They might be promoting services or attempting to attract clients.
+                 Return 'Yes' if they appear to be a coach/competitor, or 'No' otherwise.""",
+    key_field="username"
+)
+
+def is_coach_competitor(username="", bio="", comment_text="", defer_llm=False):
     """
-    AI-powered check to determine if a commenter is a coach/competitor
-    Uses both keyword matching and AI analysis
+    Tiered check to determine if a commenter is a coach/competitor.
+    Keyword matching and a local heuristic settle most comments; the AI is only
+    consulted for ambiguous ones, and verdicts are cached per username.
+    With defer_llm=True ambiguous commenters are returned as (False, DEFERRED_REASON)
+    so the check can be folded into the lead scoring request.
     """
-    # Basic keyword exclusion check
-    combined_text = f"{username} {bio} {comment_text}".lower()
-    if any(excluded.lower() in combined_text for excluded in COACH_EXCLUSION_KEYWORDS):
-        return True, "Excluded keyword found via keyword matching"
-    
-    # Check for typical promotional patterns in comments
-    promo_patterns = [
-        "dm me", "message me", "check out my", "follow me", "visit my profile", 
-        "link in bio", "book a call", "free session", "free consultation"
-    ]
+    def keyword_check():
+        # Basic keyword exclusion check
+        match = INSTAGRAM_KEYWORD_MATCHER.match(f"{username} {bio} {comment_text}")
+        if match:
+            return f"Excluded keyword found via keyword matching ('{match.pattern}')"
+        
+        # Check for typical promotional patterns in comments
+        match = INSTAGRAM_PROMO_MATCHER.match(comment_text)
+        if match:
+            return f"Promotional language detected ('{match.pattern}')"
+        return None
     
-    if any(pattern in comment_text.lower() for pattern in promo_patterns):
-        return True, "Promotional language detected"
+    # Combine available information for AI analysis
+    profile_info = f"Username: {username}\nBio: {bio}\nComment: {comment_text}"
     
-    # Use AI for more sophisticated detection when possible
+    verdict = competitor_detector.classify(
+        key=username if username != "Unknown" else "",
+        keyword_check=keyword_check,
+        text=f"{bio} {comment_text}",
+        profile_info=profile_info,
+        defer_llm=defer_llm
+    )
+    return verdict.is_competitor, verdict.reason
+
+class CrawlBudget:
+    """
+    Navigation budget shared by all crawl workers: every page load takes a token
+    from the Instagram rate limiter, and a crawl makes at most `max_page_loads`.
+    """
+
+    def __init__(self, rate_limiter, max_page_loads: int = INSTAGRAM_MAX_PAGE_LOADS):
+        self.rate_limiter = rate_limiter
+        self.max_page_loads = max_page_loads
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        """Wait for the next navigation slot; False once the crawl's budget is spent."""
+        with self._lock:
+            if self.used >= self.max_page_loads:
+                return False
+            self.used += 1
+        self.rate_limiter.acquire()
+        return True
+
+def recent_post_links(driver, profile):
+    """Open a profile and return its most recent post URLs."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
+
+    driver.get(f"https://www.instagram.com/{profile}/")
     try:
-        # Combine available information for AI analysis
-        profile_info = f"Username: {username}\nBio: {bio}\nComment: {comment_text}"
-        
-        response = openai.ChatCompletion.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": """Analyze if this person is likely to be a personal coach, 
-                 life coach, career coach, mentor, consultant, or similar competitor in the personal/professional 
-                 development space. They might be promoting services or attempting to attract clients.
-                 Return 'Yes' if they appear to be a coach/competitor, or 'No' otherwise."""},
-                {"role": "user", "content": profile_info}
-            ],
-            max_tokens=50
-        )
-        
-        ai_decision = response.choices[0].message.content.strip().lower()
-        
-        if "yes" in ai_decision:
-            return True, "AI detected profile as coach/competitor"
-            
-    except Exception as e:
-        logging.warning(f"⚠️ AI filtering error: {e}. Falling back to keyword matching only.")
-    
-    return False, "Not detected as coach/competitor"
+        WebDriverWait(driver, PAGE_WAIT_SECONDS).until(EC.presence_of_element_located((By.CSS_SELECTOR, POST_LINK_SELECTOR)))
+    except TimeoutException:
+        logging.warning(f"⚠️ No posts rendered for {profile}")
+        return []
+
+    # Scroll to the top to ensure the most recent posts are loaded
+    driver.execute_script("window.scrollTo(0, 0);")
+    posts = driver.find_elements(By.CSS_SELECTOR, POST_LINK_SELECTOR)
+    return [canonicalize_url(post.get_attribute("href")) for post in posts[:POSTS_PER_PROFILE]]
+
+# Reads every rendered comment in one round trip: [[username, text], ...].
+# Comments missing either element are skipped, as the per-element lookups did.
+EXTRACT_COMMENTS_SCRIPT = """
+const [commentSelector, usernameSelector, textSelector] = arguments;
+const pairs = [];
+for (const comment of document.querySelectorAll(commentSelector)) {
+    const username = comment.querySelector(usernameSelector);
+    const text = comment.querySelector(textSelector);
+    if (username && text) {
+        pairs.push([username.innerText.trim(), text.innerText.trim()]);
+    }
+}
+return pairs;
+"""
+
+def parse_comments_html(html):
+    """Extract (username, comment text) pairs from a post's HTML with BeautifulSoup."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    comments = []
+    for comment_element in soup.select(COMMENT_SELECTOR):
+        username_element = comment_element.select_one(COMMENT_USERNAME_SELECTOR)
+        comment_text_element = comment_element.select_one(COMMENT_TEXT_SELECTOR)
+        if username_element and comment_text_element:
+            comments.append((username_element.get_text(strip=True), comment_text_element.get_text(strip=True)))
+    return comments
+
+def extract_comments(driver):
+    """
+    Read all rendered comments of the open post in one WebDriver call, falling
+    back to parsing driver.page_source once if the script fails.
+    """
+    from selenium.common.exceptions import WebDriverException
 
-# Function to scrape Instagram comments
-def scrape_instagram_comments(max_comments=50):
-    options = uc.ChromeOptions()
-    driver = uc.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-    
     try:
-        driver.get("https://www.instagram.com")
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+        pairs = driver.execute_script(EXTRACT_COMMENTS_SCRIPT, COMMENT_SELECTOR, COMMENT_USERNAME_SELECTOR, COMMENT_TEXT_SELECTOR)
+        if isinstance(pairs, list):
+            return [(username, comment_text) for username, comment_text in pairs]
+        logging.warning(f"⚠️ Comment extraction script returned {type(pairs).__name__}; parsing page source instead.")
+    except WebDriverException as e:
+        logging.warning(f"⚠️ Comment extraction script failed ({e.msg}); parsing page source instead.")
+    return parse_comments_html(driver.page_source)
 
-        if not load_cookies(driver):
-            logging.error("❌ Instagram login required, but cookies are missing. Exiting.")
-            driver.quit()
-            return []
-        
-        driver.refresh()
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+def load_post_comments(driver, post_url):
+    """Open a post, expand its comments and return (username, comment text) pairs."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException, WebDriverException
+
+    driver.get(post_url)
+    try:
+        WebDriverWait(driver, PAGE_WAIT_SECONDS).until(EC.presence_of_element_located((By.CSS_SELECTOR, COMMENT_SELECTOR)))
+    except TimeoutException:
+        return []  # No comments on this post
+
+    # Click "View all comments" if available, then wait for more comments to render
+    view_all_buttons = driver.find_elements(By.XPATH, "//span[contains(text(), 'View all')]")
+    if view_all_buttons:
+        shown = len(driver.find_elements(By.CSS_SELECTOR, COMMENT_SELECTOR))
+        try:
+            view_all_buttons[0].click()
+            WebDriverWait(driver, COMMENT_EXPAND_WAIT_SECONDS).until(
+                lambda d: len(d.find_elements(By.CSS_SELECTOR, COMMENT_SELECTOR)) > shown
+            )
+        except (TimeoutException, WebDriverException):
+            pass  # Keep the comments that are already shown
+
+    return extract_comments(driver)
+
+def comment_fingerprint(username, comment_text):
+    return zlib.crc32(f"{username}\x00{comment_text}".encode("utf-8"))
+
+def comment_url(post_url, username, comment_text):
+    """
+    Per-comment lead URL under the post's URL, so each comment gets its own
+    entry in the unique url index (a path segment, which canonicalize_url keeps).
+    """
+    return f"{post_url.rstrip('/')}/c/{comment_fingerprint(username, comment_text):08x}"
 
-        if "login" in driver.current_url.lower():
-            logging.error("❌ Login failed! Check Instagram cookies.")
-            driver.quit()
-            return []
+def post_still_open(checkpoint):
+    """True while a checkpointed post is recent enough to collect new comments."""
+    first_seen = checkpoint.get("first_seen_at")
+    return first_seen is None or datetime.utcnow() - first_seen < timedelta(hours=INSTAGRAM_POST_REVISIT_HOURS)
 
-        sheet = connect_to_google_sheets()
-        comments_collected = []
-        comment_count = 0
+def crawl_profile(profile, budget, stop, on_comment, on_post_done):
+    """
+    Crawl one profile's recent posts on a pooled browser until `stop` is set or
+    the budget runs out.
 
-        for profile in INFLUENCER_PROFILES:
-            if comment_count >= max_comments:
-                break
+    Per-post checkpoints record which comments were already processed: posts
+    past INSTAGRAM_POST_REVISIT_HOURS are skipped without a page load, and on
+    the others only comments not seen before are handled. A post's checkpoint
+    is saved after `on_post_done` has persisted its leads, so an interrupted
+    crawl resumes where it stopped.
+    """
+    if stop.is_set():
+        return
 
-            driver.get(f"https://www.instagram.com/{profile}/")
-            WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            time.sleep(3)
+    with browser_pool.driver() as driver:
+        if not budget.take():
+            stop.set()
+            return
+        post_links = recent_post_links(driver, profile)
+        post_checkpoints = checkpoints.get_many("instagram_post", post_links)
+        logging.info(f"✅ Found {len(post_links)} most recent posts for {profile} "
+                     f"({len(post_links) - len(post_checkpoints)} new)")
 
-            # Scroll to the top to ensure the most recent posts are loaded
-            driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(2)
+        for post_url in post_links:
+            if stop.is_set():
+                return
+            checkpoint = post_checkpoints.get(post_url, {})
+            if checkpoint and not post_still_open(checkpoint):
+                logging.debug(f"⏭️ Skipping finished post {post_url}")
+                continue
+            if not budget.take():
+                logging.info("⏹️ Instagram page-load budget spent; stopping crawl.")
+                stop.set()
+                return
 
-            # Refresh post list after scrolling to the top
-            posts = driver.find_elements(By.CSS_SELECTOR, "a[href*='/p/']")
-            post_links = [post.get_attribute("href") for post in posts[:10]]
-            logging.info(f"✅ Found {len(post_links)} most recent posts for {profile}")
+            try:
+                comments = load_post_comments(driver, post_url)
+            except Exception as e:
+                logging.warning(f"⚠️ Error processing post: {e}")
+                continue  # Skip and move to the next post
 
-            for post_url in post_links:
-                if comment_count >= max_comments:
+            seen = set(checkpoint.get("comments", []))
+            processed = []
+            for username, comment_text in comments:
+                if stop.is_set():
                     break
+                fingerprint = comment_fingerprint(username, comment_text)
+                if fingerprint in seen:
+                    continue
+                seen.add(fingerprint)
+                on_comment(post_url, username, comment_text)
+                processed.append(fingerprint)
+
+            on_post_done()
+            checkpoints.save(
+                "instagram_post", post_url,
+                {"profile": profile, "first_seen_at": checkpoint.get("first_seen_at", datetime.utcnow())},
+                append={"comments": processed},
+                max_items=MAX_COMMENT_FINGERPRINTS
+            )
+
+# Function to scrape Instagram comments
+def scrape_instagram_comments(max_comments=50, defer_competitor_check=False, workers=None):
+    """
+    Crawl recent posts of INFLUENCER_PROFILES for comments from potential leads.
+
+    Profiles are crawled concurrently, one pooled browser per worker (the pool
+    size by default). Page loads wait on the post/comment selectors instead of
+    fixed sleeps and share one budget across workers, and every worker stops as
+    soon as max_comments new leads have been stored. Checkpoints limit each run
+    to new posts and new comments (see crawl_profile).
+    """
+    return list(iter_instagram_comments(max_comments, defer_competitor_check, workers))
 
-                try:
-                    driver.get(post_url)
-                    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-                    time.sleep(3)
-
-                    # Click "View all comments" if available
-                    try:
-                        view_all_buttons = driver.find_elements(By.CSS_SELECTOR, "span")
-                        for button in view_all_buttons:
-                            if "View all" in button.text:
-                                button.click()
-                                time.sleep(3)
-                                break  # Click only once
-                    except:
-                        pass  # No "View all comments" button found
-
-                    # Extract comments using the new selector
-                    comment_elements = driver.find_elements(By.CSS_SELECTOR, "div._a9zr")
-                    
-                    for comment_element in comment_elements:
+def comment_row(lead):
+    return [lead.get("post_url", lead["url"]), lead["username"], lead["comment"]]
+
+def confirm_pending_leads(leads):
+    """
+    Settle comments stored with competitor_check="pending" once combined scoring
+    has classified them: competitors are removed from the leads collection, the
+    others are added to the sheet.
+    """
+    sheet = get_sheets_sink(SHEET_NAME, connect_to_google_sheets)
+    return resolve_pending_leads(get_db()["leads"], leads, ("url",),
+                                 lambda confirmed: sheet.append_many([comment_row(lead) for lead in confirmed]))
+
+def iter_instagram_comments(max_comments=50, defer_competitor_check=False, workers=None):
+    """
+    Generator version of scrape_instagram_comments: yields each new lead as
+    soon as it has been stored while the crawl workers keep going. Closing the
+    generator early stops the crawl.
+    """
+    sheet = get_sheets_sink(SHEET_NAME, connect_to_google_sheets)  # Write-behind; never blocks the scrape
+    competitor_detector.reset_stats()
+    budget = CrawlBudget(get_rate_limiter("instagram"))
+    stop = threading.Event()
+    found = 0
+    stored = deque()  # Filled by the writer's flushes (on any worker), drained by this generator
+
+    def save_new_comments(inserted):
+        nonlocal found
+        # Pending leads reach the sheet once combined scoring clears them (see confirm_pending_leads)
+        sheet.append_many([comment_row(lead) for lead in inserted if lead.get("competitor_check") != "pending"])
+        found += len(inserted)
+        for lead in inserted:
+            stored.append(lead)
+            logging.info(f"✅ Added lead from Instagram: {lead['username']}")
+
+    # New comments are upserted in batches; the sheet is updated once per batch
+    with LeadWriter(get_db()["leads"], on_insert=save_new_comments) as writer:
+
+        def handle_comment(post_url, username, comment_text):
+            # Try to get bio from profile hover if possible - simplified for this example
+            bio = ""  # In a real implementation, you might navigate to profile or use API
+
+            logging.info(f"🔎 Found comment by {username}: {comment_text}")
+
+            # Check if comment matches our target keywords
+            if any(keyword in comment_text.lower() for keyword in KEYWORDS):
+                # Check if commenter is a coach/competitor
+                is_competitor, reason = is_coach_competitor(username, bio, comment_text, defer_competitor_check)
+
+                if is_competitor:
+                    logging.info(f"⏩ Skipping comment from {username} ({reason})")
+                    return
+
+                lead = {
+                    "platform": "instagram",
+                    "url": comment_url(post_url, username, comment_text),
+                    "post_url": post_url,
+                    "username": username,
+                    "comment": comment_text
+                }
+                if reason == DEFERRED_REASON:
+                    lead["competitor_check"] = "pending"
+
+                # Upserted on the per-comment URL to avoid duplication
+                writer.add(lead)
+
+            # Only flush early to find out whether the limit has really been reached
+            if found + writer.pending >= max_comments:
+                writer.flush()
+                if found >= max_comments:
+                    stop.set()
+
+        with ThreadPoolExecutor(max_workers=workers or browser_pool.size, thread_name_prefix="instagram") as executor:
+            futures = {
+                executor.submit(crawl_profile, profile, budget, stop, handle_comment, writer.flush): profile
+                for profile in INFLUENCER_PROFILES
+            }
+            running = set(futures)
+            try:
+                while running:
+                    done, running = wait(running, timeout=STORED_POLL_SECONDS, return_when=FIRST_COMPLETED)
+                    for future in done:
                         try:
-                            # Extract username, comment text and get bio when possible
-                            username_element = comment_element.find_element(By.CSS_SELECTOR, "._a9zc")
-                            username = username_element.text.strip() if username_element else "Unknown"
-                            
-                            comment_text_element = comment_element.find_element(By.CSS_SELECTOR, "div.xt0psk2 span")
-                            comment_text = comment_text_element.text.strip() if comment_text_element else ""
-                            
-                            # Try to get bio from profile hover if possible - simplified for this example
-                            bio = ""  # In a real implementation, you might navigate to profile or use API
-                            
-                            logging.info(f"🔎 Found comment by {username}: {comment_text}")
-
-                            # Check if comment matches our target keywords
-                            if any(keyword in comment_text.lower() for keyword in KEYWORDS):
-                                # Check if commenter is a coach/competitor
-                                is_competitor, reason = is_coach_competitor(username, bio, comment_text)
-                                
-                                if is_competitor:
-                                    logging.info(f"⏩ Skipping comment from {username} ({reason})")
-                                    continue
-                                
-                                lead = {
-                                    "platform": "instagram", 
-                                    "url": post_url, 
-                                    "username": username,
-                                    "comment": comment_text
-                                }
-
-                                # Check for duplicates by username and comment text to avoid duplication
-                                if not leads_collection.find_one({"username": username, "comment": comment_text}):
-                                    leads_collection.insert_one(lead)
-                                    sheet.append_row([post_url, username, comment_text])
-                                    comments_collected.append(lead)
-                                    comment_count += 1
-                                    logging.info(f"✅ Added lead from Instagram: {username}")
-
-                            if comment_count >= max_comments:
-                                break
-                                
+                            future.result()
+                        except (BrowserSetupError, TimeoutError) as e:
+                            logging.error(f"❌ No Instagram browser available: {e}. Exiting.")
+                            stop.set()
                         except Exception as e:
-                            logging.warning(f"⚠️ Error processing comment: {e}")
-                            continue
-
-                except Exception as e:
-                    logging.warning(f"⚠️ Error processing post: {e}")
-                    continue  # Skip and move to the next post
+                            logging.warning(f"⚠️ Error crawling {futures[future]}: {e}")
+                    while stored:
+                        yield stored.popleft()
+            finally:
+                stop.set()  # Also ends the crawl when the consumer stops early
 
-        logging.info(f"✅ Scraped {comment_count} relevant Instagram comments.")
-        return comments_collected
-    
-    finally:
-        try:
-            driver.quit()
-        except Exception as e:
-            logging.error(f"Error while closing WebDriver: {e}")
+    while stored:
+        yield stored.popleft()
+    logging.info(f"✅ Scraped {found} relevant Instagram comments ({budget.used} page loads).")
+    competitor_detector.log_stats()
 
 if __name__ == "__main__":
     scrape_instagram_comments(max_comments=50)
\ No newline at end of file
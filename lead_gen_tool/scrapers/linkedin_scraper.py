@@ -1,55 +1,34 @@
 import time
 import logging
-import random
-import requests
 import os
-import undetected_chromedriver as uc
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-from pymongo import MongoClient
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import openai
+from collections import deque
+from scrapers.competitor_filter import LINKEDIN_TITLE_MATCHER
+from scrapers.competitor_detector import CompetitorDetector, DEFERRED_REASON
+from scrapers.rate_limit import get_rate_limiter
+from scrapers.browser_pool import BrowserSetupError, get_browser_pool
+from scrapers.serpapi_client import get_serpapi_client, next_start_page, SERPAPI_PAGES_PER_QUERY
+from scrapers.serpapi_cache import SERPAPI_REPLAY
+from scrapers.sheets_sink import get_sheets_sink
+from scrapers.sheets_client import open_worksheet
+from scrapers.dedup import canonicalize_url
+from database.lead_writer import LeadWriter, resolve_pending_leads
+from database.checkpoints import CheckpointStore, CHECKPOINTS_ENABLED
+from database.mongodb import get_db
 
 # Configure Advanced Logging
 logging.basicConfig(level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s")
 
-# MongoDB Setup
-MONGO_URI = "mongodb://localhost:27017/"
-client = MongoClient(MONGO_URI)
-db = client["lead_generator"]
-leads_collection = db["leads"]
+# MongoDB Setup (shared client, connected on first use)
+# Replay runs read back cached responses from page 0 and leave the live checkpoints alone
+checkpoints = CheckpointStore(enabled=CHECKPOINTS_ENABLED and not SERPAPI_REPLAY)
 
 # Google Sheets Setup
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # Get current script directory
-GOOGLE_SHEETS_CREDENTIALS = os.path.join(BASE_DIR, "../config/google_sheets_credentials.json")
 SHEET_NAME = "Peak Transformation Coaching Leads"
 
-# OpenAI API Key - Load from environment variable
-openai.api_key = os.getenv("OPENAI_API_KEY")
-
-# Coach/Competitor Exclusion Keywords (expanded list)
-EXCLUDED_TITLES = [
-    "coach", "mentor", "consultant", "advisor", "trainer", "counselor", "therapist",
-    "life coach", "business coach", "career coach", "executive coach", "personal coach",
-    "leadership coach", "wellness coach", "mindset coach", "transformation coach",
-    "performance coach", "success coach", "professional mentor", "life mentor",
-    "business consultant", "lifestyle consultant", "career counselor", 
-    "personal development", "self-help", "motivational speaker", "business advisor",
-    "career strategist", "wellness consultant", "life strategist", "success strategist",
-    "empowerment specialist", "transformation specialist", "mindfulness teacher"
-]
-
 def connect_to_google_sheets():
     """Connect to Google Sheets and return the active sheet."""
     try:
-        creds = ServiceAccountCredentials.from_json_keyfile_name(GOOGLE_SHEETS_CREDENTIALS, 
-            ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"])
-        client = gspread.authorize(creds)
-        return client.open(SHEET_NAME).sheet1
+        return open_worksheet(SHEET_NAME)
     except Exception as e:
         logging.error(f"❌ Failed to connect to Google Sheets: {e}")
         return None
@@ -66,98 +45,165 @@ SEARCH_TERMS = [
     "feeling stuck career site:linkedin.com/in/"
 ]
 
-def is_coach_competitor(name, job_title, description=""):
+# Profile search results barely change within a day, so cached responses are reused that long
+SEARCH_CACHE_TTL = 24 * 3600
+
+# Tiered competitor detection: keywords -> cached verdicts -> local heuristic -> GPT-4
+competitor_detector = CompetitorDetector(
+    platform="linkedin",
+    llm_prompt="""Analyze if this person is a personal coach, life coach, 
+                 career coach, mentor, consultant, or similar competitor in the personal/professional 
+                 development space. Return 'Yes' if they appear to be a coach/competitor, or 'No' otherwise.""",
+    key_field="url"
+)
+
+def is_coach_competitor(name, job_title, description="", profile_url="", defer_llm=False):
     """
-    AI-powered check to determine if a person is a coach/competitor
-    Uses both keyword matching and AI analysis
+    Tiered check to determine if a person is a coach/competitor.
+    Keyword matching and a local heuristic settle most profiles; the AI is only
+    consulted for ambiguous ones, and verdicts are cached per profile.
+    With defer_llm=True ambiguous profiles are returned as (False, DEFERRED_REASON)
+    so the check can be folded into the lead scoring request.
     """
-    # Basic keyword exclusion check
-    if any(excluded.lower() in job_title.lower() for excluded in EXCLUDED_TITLES):
-        return True, "Excluded job title found via keyword matching"
+    def keyword_check():
+        # Basic keyword exclusion check
+        match = LINKEDIN_TITLE_MATCHER.match(job_title)
+        if match:
+            return f"Excluded job title found via keyword matching ('{match.pattern}')"
+        return None
     
     # Combine available information for AI analysis
     profile_info = f"Name: {name}\nJob Title: {job_title}\nDescription: {description}"
     
-    try:
-        # Use OpenAI to detect if profile is a coach/competitor
-        response = openai.ChatCompletion.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": """Analyze if this person is a personal coach, life coach, 
-                 career coach, mentor, consultant, or similar competitor in the personal/professional 
-                 development space. Return 'Yes' if they appear to be a coach/competitor, or 'No' otherwise."""},
-                {"role": "user", "content": profile_info}
-            ],
-            max_tokens=50
-        )
-        
-        ai_decision = response.choices[0].message.content.strip().lower()
-        
-        if "yes" in ai_decision:
-            return True, "AI detected profile as coach/competitor"
-            
-    except Exception as e:
-        logging.warning(f"⚠️ AI filtering error: {e}. Falling back to keyword matching only.")
+    verdict = competitor_detector.classify(
+        key=profile_url or name,
+        keyword_check=keyword_check,
+        text=f"{job_title} {description}",
+        profile_info=profile_info,
+        defer_llm=defer_llm
+    )
+    return verdict.is_competitor, verdict.reason
+
+def scrape_google_for_linkedin_profiles(max_profiles=50, defer_competitor_check=False):
+    """
+    Scrape Google for LinkedIn profiles related to career struggles.
     
-    return False, "Not detected as coach/competitor"
+    With defer_competitor_check=True, profiles the local competitor tiers cannot
+    settle are kept with competitor_check="pending" for combined scoring.
+    """
+    return list(iter_google_linkedin_profiles(max_profiles, defer_competitor_check))
 
-def scrape_google_for_linkedin_profiles(max_profiles=50):
-    """Scrape Google for LinkedIn profiles related to career struggles."""
+def profile_row(lead):
+    return [lead["name"], lead["job_title"], lead["url"]]
+
+def confirm_pending_leads(leads):
+    """
+    Settle profiles stored with competitor_check="pending" once combined scoring
+    has classified them: competitors are removed from the leads collection, the
+    others are added to the sheet.
+    """
+    sheet = get_sheets_sink(SHEET_NAME, connect_to_google_sheets)
+    return resolve_pending_leads(get_db()["leads"], leads, ("url",),
+                                 lambda confirmed: sheet.append_many([profile_row(lead) for lead in confirmed]))
+
+def iter_google_linkedin_profiles(max_profiles=50, defer_competitor_check=False):
+    """
+    Generator version of scrape_google_for_linkedin_profiles: yields each new
+    profile as soon as it has been stored, so scoring can start mid-scrape.
+    """
     logging.debug("Starting Google Search for LinkedIn Profiles")
-    leads = []
-    sheet = connect_to_google_sheets()
+    found = 0
+    stored = deque()  # Filled by the writer's flushes, drained by this generator
+    competitor_detector.reset_stats()
+    sheet = get_sheets_sink(SHEET_NAME, connect_to_google_sheets)  # Write-behind; never blocks the scrape
 
-    if not sheet:
-        logging.error("❌ Google Sheets connection failed. Skipping LinkedIn scraping.")
-        return []
+    # Each term resumes from the result page its checkpoint reached last run
+    start_pages = {
+        term: checkpoint.get("next_page", 0)
+        for term, checkpoint in checkpoints.get_many("serpapi_linkedin", SEARCH_TERMS).items()
+    }
 
-    for term in SEARCH_TERMS:
-        search_url = "https://serpapi.com/search"
-        params = {"engine": "google", "q": term, "api_key": SERPAPI_KEY, "timeout": 10}
-        
-        try:
-            response = requests.get(search_url, params=params, timeout=10)
-            response.raise_for_status()
-            results = response.json().get("organic_results", [])
-        except requests.RequestException as e:
-            logging.error(f"❌ SerpAPI request failed for {term}: {e}")
-            continue
-
-        logging.debug(f"Google Search found {len(results)} results for {term}")
+    # All search terms (and result pages) are fetched concurrently over one pooled
+    # session, paced by the LinkedIn request budget instead of fixed sleeps
+    searches = get_serpapi_client(SERPAPI_KEY).search_many(
+        SEARCH_TERMS, {"engine": "google", "timeout": 10}, rate_limiter=get_rate_limiter("linkedin"),
+        ttl=SEARCH_CACHE_TTL, start_pages=start_pages
+    )
+
+    def save_new_leads(inserted):
+        nonlocal found
+        # Pending leads reach the sheet once combined scoring clears them (see confirm_pending_leads)
+        sheet.append_many([profile_row(lead) for lead in inserted if lead.get("competitor_check") != "pending"])
+        found += len(inserted)
+        for lead in inserted:
+            stored.append(lead)
+            logging.info(f"🔎 Added LinkedIn Profile: {lead['name']} - {lead['job_title']} - {lead['url']}")
+
+    # New profiles are upserted in batches; the sheet is updated once per batch
+    with LeadWriter(get_db()["leads"], on_insert=save_new_leads) as writer:
+        for term, results in searches:
+            logging.debug(f"Google Search found {len(results)} results for {term}")
         
-        for result in results:
-            profile_url = result.get("link", "")
-            name = result.get("title", "").split("-")[0].strip()
-            job_title = result.get("title", "").split("-")[-1].strip()
-            description = result.get("snippet", "")
-
-            if "linkedin.com/in/" in profile_url:
-                # Check if profile is a coach/competitor
-                is_competitor, reason = is_coach_competitor(name, job_title, description)
+            for result in results:
+                profile_url = canonicalize_url(result.get("link", ""))
+                name = result.get("title", "").split("-")[0].strip()
+                job_title = result.get("title", "").split("-")[-1].strip()
+                description = result.get("snippet", "")
+
+                if "linkedin.com/in/" in profile_url:
+                    # Check if profile is a coach/competitor
+                    is_competitor, reason = is_coach_competitor(name, job_title, description, profile_url, defer_competitor_check)
                 
-                if is_competitor:
-                    logging.info(f"⏩ Skipping {name} - {job_title} ({reason})")
-                    continue
+                    if is_competitor:
+                        logging.info(f"⏩ Skipping {name} - {job_title} ({reason})")
+                        continue
                 
-                lead = {"name": name, "job_title": job_title, "platform": "linkedin", "url": profile_url}
+                    lead = {"name": name, "job_title": job_title, "platform": "linkedin", "url": profile_url}
+                    if reason == DEFERRED_REASON:
+                        lead["competitor_check"] = "pending"
 
-                if not leads_collection.find_one({"url": profile_url}):
-                    leads_collection.insert_one(lead)
-                    sheet.append_row([name, job_title, profile_url])
-                    leads.append(lead)
-                    logging.info(f"🔎 Added LinkedIn Profile: {name} - {job_title} - {profile_url}")
+                    writer.add(lead)
 
-                if len(leads) >= max_profiles:
-                    return leads
-            time.sleep(random.uniform(3, 6))
+                    # Only flush early to find out whether the limit has really been reached
+                    if found + writer.pending >= max_profiles:
+                        writer.flush()
+                        if found >= max_profiles:
+                            while stored:
+                                yield stored.popleft()
+                            competitor_detector.log_stats()
+                            return
 
-    return leads
+                while stored:
+                    yield stored.popleft()
+
+            # Term finished: persist its leads, then move its checkpoint to the next page
+            writer.flush()
+            start_page = start_pages.get(term, 0)
+            checkpoints.save("serpapi_linkedin", term, {
+                "next_page": next_start_page(start_page, SERPAPI_PAGES_PER_QUERY, bool(results))
+            })
+            while stored:
+                yield stored.popleft()
+
+    while stored:
+        yield stored.popleft()
+    competitor_detector.log_stats()
+
+# Warm browsers shared across post scrapes
+browser_pool = get_browser_pool("linkedin")
 
 def scrape_linkedin_posts():
     """Scrape LinkedIn posts related to career struggles."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
     logging.debug("Starting LinkedIn Post Scraper")
-    options = uc.ChromeOptions()
-    driver = uc.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    try:
+        driver = browser_pool.acquire()
+    except (BrowserSetupError, TimeoutError) as e:
+        logging.error(f"❌ No LinkedIn browser available: {e}")
+        return
     
     try:
         driver.get("https://www.linkedin.com/feed/")
@@ -165,49 +211,49 @@ def scrape_linkedin_posts():
         time.sleep(5)
 
         if "login" in driver.current_url:
+            # The pooled browser keeps its session, so a manual login only has to happen once
             logging.error("❌ LinkedIn requires login. Please log in manually.")
-            driver.quit()
             return
 
         posts = WebDriverWait(driver, 10).until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.feed-shared-update-v2")))
         logging.info(f"✅ Found {len(posts)} posts on LinkedIn Feed")
 
-        sheet = connect_to_google_sheets()
-        if not sheet:
-            logging.error("❌ Google Sheets connection failed. Skipping post scraping.")
-            return
+        sheet = get_sheets_sink(SHEET_NAME, connect_to_google_sheets)
+
+        def save_new_posts(inserted):
+            sheet.append_many([[lead["url"], lead["post_text"], lead["author"]] for lead in inserted])
+            for lead in inserted:
+                logging.info(f"🔎 Saved LinkedIn Post: {lead['url']}")
 
-        for post in posts[:10]:
-            try:
-                post_text = post.text[:500]  # Extract preview of post text
-                author_element = post.find_element(By.CSS_SELECTOR, "span.feed-shared-actor__title")
-                author_name = author_element.text.strip() if author_element else "Unknown"
-                author_description = post.find_element(By.CSS_SELECTOR, "span.feed-shared-actor__description").text.strip() if post.find_elements(By.CSS_SELECTOR, "span.feed-shared-actor__description") else ""
+        with LeadWriter(get_db()["leads"], on_insert=save_new_posts) as writer:
+            for post in posts[:10]:
+                try:
+                    post_text = post.text[:500]  # Extract preview of post text
+                    author_element = post.find_element(By.CSS_SELECTOR, "span.feed-shared-actor__title")
+                    author_name = author_element.text.strip() if author_element else "Unknown"
+                    author_description = post.find_element(By.CSS_SELECTOR, "span.feed-shared-actor__description").text.strip() if post.find_elements(By.CSS_SELECTOR, "span.feed-shared-actor__description") else ""
                 
-                post_url_element = post.find_element(By.TAG_NAME, "a")
-                post_url = post_url_element.get_attribute("href") if post_url_element else ""
+                    post_url_element = post.find_element(By.TAG_NAME, "a")
+                    post_url = canonicalize_url(post_url_element.get_attribute("href")) if post_url_element else ""
 
-                # Check if post author is a coach/competitor
-                is_competitor, reason = is_coach_competitor(author_name, author_description, post_text)
+                    # Check if post author is a coach/competitor
+                    is_competitor, reason = is_coach_competitor(author_name, author_description, post_text)
                 
-                if is_competitor:
-                    logging.info(f"⏩ Skipping post from {author_name} ({reason}): {post_url}")
-                    continue
+                    if is_competitor:
+                        logging.info(f"⏩ Skipping post from {author_name} ({reason}): {post_url}")
+                        continue
 
-                if any(keyword in post_text.lower() for keyword in ["burnout", "career change", "stressed", "overwhelmed", "feeling stuck"]):
-                    lead = {"platform": "linkedin", "url": post_url, "post_text": post_text, "author": author_name}
+                    if any(keyword in post_text.lower() for keyword in ["burnout", "career change", "stressed", "overwhelmed", "feeling stuck"]):
+                        lead = {"platform": "linkedin", "url": post_url, "post_text": post_text, "author": author_name}
 
-                    if not leads_collection.find_one({"url": post_url}):
-                        leads_collection.insert_one(lead)
-                        sheet.append_row([post_url, post_text, author_name])
-                        logging.info(f"🔎 Saved LinkedIn Post: {post_url}")
+                        writer.add(lead)
 
-            except Exception as e:
-                logging.warning(f"⚠️ Error processing post: {e}")
-                continue  
+                except Exception as e:
+                    logging.warning(f"⚠️ Error processing post: {e}")
+                    continue  
 
     finally:
-        driver.quit()
+        browser_pool.release(driver)
 
 if __name__ == "__main__":
     logging.info("🚀 Starting LinkedIn Lead Generation Scraper")
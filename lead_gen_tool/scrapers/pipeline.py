@@ -0,0 +1,246 @@
+import os
+import time
+import queue
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from scrapers.dedup import LeadDeduplicator
+
+# Configure Logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "100"))  # Leads buffered between two stages
+PIPELINE_BATCH_SIZE = int(os.getenv("PIPELINE_BATCH_SIZE", "20"))  # Leads per scoring/persist call
+PIPELINE_BATCH_WAIT_SECONDS = float(os.getenv("PIPELINE_BATCH_WAIT_SECONDS", "2"))  # Max wait to fill a batch
+PIPELINE_SCORE_WORKERS = int(os.getenv("PIPELINE_SCORE_WORKERS", "2"))  # Scoring batches in flight at once
+POLL_SECONDS = 0.2
+
+Lead = Dict[str, Any]
+_END = object()  # Marks the end of a channel
+
+
+class PipelineAborted(RuntimeError):
+    """Raised inside a stage when another stage failed and the pipeline is unwinding."""
+
+
+class Channel:
+    """
+    Bounded queue between two pipeline stages. put() blocks while the channel is
+    full, so a slow stage holds back the ones feeding it instead of letting
+    leads pile up in memory.
+    """
+
+    def __init__(self, name: str, maxsize: int, abort: threading.Event, producers: int = 1):
+        self.name = name
+        self.peak = 0  # Highest depth seen, reported in the pipeline timings
+        self._queue: "queue.Queue" = queue.Queue(maxsize)
+        self._abort = abort
+        self._producers = producers
+        self._lock = threading.Lock()
+
+    def put(self, item):
+        while True:
+            if self._abort.is_set():
+                raise PipelineAborted(f"{self.name} channel aborted")
+            try:
+                self._queue.put(item, timeout=POLL_SECONDS)
+            except queue.Full:
+                continue
+            self.peak = max(self.peak, self._queue.qsize())
+            return
+
+    def close(self):
+        """Called once by each producer; the last one marks the end of the channel."""
+        with self._lock:
+            self._producers -= 1
+            last = self._producers == 0
+        if last:
+            self.put(_END)
+
+    def get_batch(self, max_items: int, wait: float) -> List:
+        """
+        Wait for one item, then take whatever else arrives within `wait` seconds,
+        up to `max_items`. Returns an empty list once the channel has ended.
+        """
+        batch = []
+        deadline = None
+        while len(batch) < max_items:
+            timeout = POLL_SECONDS if deadline is None else min(POLL_SECONDS, deadline - time.monotonic())
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                if self._abort.is_set():
+                    raise PipelineAborted(f"{self.name} channel aborted")
+                continue
+            if item is _END:
+                self._queue.put(_END)  # Leave the marker for the other consumers
+                break
+            batch.append(item)
+            if deadline is None:
+                deadline = time.monotonic() + wait
+        return batch
+
+
+class PipelineResult(NamedTuple):
+    """Summary of a pipeline run."""
+    leads_found: Dict[str, int]      # Leads yielded per platform
+    duplicates: List[Tuple[Lead, Lead]]  # (duplicate, original) pairs, originals scored
+    timings: Dict[str, float]        # Per-platform scrape seconds, first_saved, total
+    errors: Dict[str, str]           # Per-platform scraper errors
+    queue_peaks: Dict[str, int]      # Highest depth each channel reached
+
+
+def run_pipeline(sources: Dict[str, Callable[[], Iterable[Lead]]],
+                 score: Callable[[List[Lead]], Any],
+                 persist: Callable[[List[Lead]], Any],
+                 on_lead: Optional[Callable[[str, Lead], None]] = None,
+                 on_duplicate: Optional[Callable[[Lead, Lead], None]] = None,
+                 queue_size: int = PIPELINE_QUEUE_SIZE,
+                 batch_size: int = PIPELINE_BATCH_SIZE,
+                 batch_wait: float = PIPELINE_BATCH_WAIT_SECONDS,
+                 score_workers: int = PIPELINE_SCORE_WORKERS) -> PipelineResult:
+    """
+    Stream leads from the scrapers through dedup -> score -> persist, with a
+    bounded channel between stages so every stage runs concurrently:
+
+        sources (one thread per platform, each a generator of filtered leads)
+          -> dedup (one thread; cross-platform MinHash/LSH, see scrapers.dedup)
+          -> score (score_workers threads, micro-batches of up to batch_size)
+          -> persist (calling thread, one call per scored batch)
+
+    The first qualified leads are saved while the scrapers are still running,
+    and at most about 3 * queue_size leads are in flight at any time. A failing
+    scraper is logged and reported in `errors` without stopping the others; a
+    failing score or persist call stops the whole pipeline and is re-raised.
+
+    Args:
+        sources: Platform name -> zero-argument callable returning an iterable of leads
+        score: Scores a batch of leads in place (e.g. ai.lead_scoring.score_leads_batched)
+        persist: Stores a batch of scored leads
+        on_lead: Called with (platform, lead) for every lead a scraper yields
+        on_duplicate: Called with (duplicate, original) as duplicates are found;
+            the original may not be scored yet
+        queue_size: Capacity of each channel
+        batch_size: Maximum leads per score/persist call
+        batch_wait: Seconds to wait for a batch to fill before sending it anyway
+        score_workers: Scoring calls in flight at once
+
+    Returns:
+        PipelineResult
+    """
+    if not sources:
+        return PipelineResult({}, [], {"total": 0.0}, {}, {})
+
+    started = time.perf_counter()
+    abort = threading.Event()
+    scraped = Channel("scraped", queue_size, abort, producers=len(sources))
+    unique = Channel("unique", queue_size, abort)
+    scored = Channel("scored", max(1, queue_size // batch_size), abort, producers=score_workers)
+
+    leads_found = {platform: 0 for platform in sources}
+    duplicates: List[Tuple[Lead, Lead]] = []
+    timings: Dict[str, float] = {}
+    errors: Dict[str, str] = {}
+    failures: List[BaseException] = []
+
+    def fail(stage: str, error: BaseException):
+        if not isinstance(error, PipelineAborted):
+            logging.error(f"❌ Pipeline {stage} stage failed: {error}")
+            failures.append(error)
+        abort.set()
+
+    def scrape(platform: str, source: Callable[[], Iterable[Lead]]):
+        logging.info(f"🚀 Running {platform} scraper...")
+        start = time.perf_counter()
+        leads = None
+        try:
+            leads = iter(source() or [])
+            for lead in leads:
+                leads_found[platform] += 1
+                if on_lead:
+                    on_lead(platform, lead)
+                scraped.put(lead)
+            logging.info(f"✅ {platform} scraper yielded {leads_found[platform]} leads in "
+                         f"{time.perf_counter() - start:.2f}s")
+        except PipelineAborted:
+            pass
+        except Exception as e:
+            logging.error(f"❌ {platform} scraper failed after {time.perf_counter() - start:.2f}s: {e}")
+            errors[platform] = str(e)
+        finally:
+            close = getattr(leads, "close", None)
+            if close:
+                close()  # Stop the scraper's own workers if it ended early
+            timings[platform] = round(time.perf_counter() - start, 2)
+            try:
+                scraped.close()
+            except PipelineAborted:
+                pass
+
+    def deduplicate():
+        deduplicator = LeadDeduplicator()
+        try:
+            while True:
+                batch = scraped.get_batch(queue_size, 0)
+                if not batch:
+                    break
+                for lead in batch:
+                    original = deduplicator.check(lead)
+                    if original is None:
+                        unique.put(lead)
+                        continue
+                    lead["duplicate_of"] = original.get("url")
+                    duplicates.append((lead, original))
+                    if on_duplicate:
+                        on_duplicate(lead, original)
+            unique.close()
+        except BaseException as e:
+            fail("dedup", e)
+
+    def score_batches():
+        try:
+            while True:
+                batch = unique.get_batch(batch_size, batch_wait)
+                if not batch:
+                    break
+                score(batch)
+                scored.put(batch)
+            scored.close()
+        except BaseException as e:
+            fail("score", e)
+
+    threads = [threading.Thread(target=scrape, args=item, name=f"pipeline-{item[0]}", daemon=True)
+               for item in sources.items()]
+    threads.append(threading.Thread(target=deduplicate, name="pipeline-dedup", daemon=True))
+    threads += [threading.Thread(target=score_batches, name=f"pipeline-score-{i}", daemon=True)
+                for i in range(score_workers)]
+    for thread in threads:
+        thread.start()
+
+    try:
+        while True:
+            batch = scored.get_batch(1, 0)
+            if not batch:
+                break
+            persist(batch[0])
+            if "first_saved" not in timings:
+                timings["first_saved"] = round(time.perf_counter() - started, 2)
+    except BaseException as e:
+        fail("persist", e)
+    finally:
+        for thread in threads:
+            thread.join()
+
+    if failures:
+        raise failures[0]
+
+    if duplicates:
+        logging.info(f"🧬 Deduplication: {len(duplicates)} of {sum(leads_found.values())} leads were duplicates")
+    timings["total"] = round(time.perf_counter() - started, 2)
+    return PipelineResult(
+        leads_found, duplicates, timings, errors,
+        {channel.name: channel.peak for channel in (scraped, unique, scored)}
+    )
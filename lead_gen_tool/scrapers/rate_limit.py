@@ -0,0 +1,67 @@
+import os
+import time
+import threading
+from typing import Dict
+
+# Default request budgets per platform: (requests per second, burst capacity)
+DEFAULT_RATE_LIMITS = {
+    "linkedin": (1.0, 4),   # SerpAPI searches, fanned out across queries and pages
+    "twitter": (1.0, 4),    # SerpAPI searches, fanned out across queries and pages
+    "instagram": (0.33, 2)  # ~1 page navigation every 3s
+}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. Each request takes one token; tokens refill at
+    `rate` per second up to `capacity`, so short bursts are allowed while the
+    long-run rate stays bounded.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Block until `tokens` are available and take them.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(platform: str) -> TokenBucket:
+    """
+    Return the shared token bucket for a platform. Budgets can be overridden with
+    <PLATFORM>_RATE_LIMIT (requests per second) and <PLATFORM>_RATE_BURST.
+    """
+    with _limiters_lock:
+        if platform not in _limiters:
+            rate, burst = DEFAULT_RATE_LIMITS.get(platform, (1.0, 1))
+            rate = float(os.getenv(f"{platform.upper()}_RATE_LIMIT", rate))
+            burst = float(os.getenv(f"{platform.upper()}_RATE_BURST", burst))
+            _limiters[platform] = TokenBucket(rate, burst)
+        return _limiters[platform]
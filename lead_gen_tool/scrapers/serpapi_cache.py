@@ -0,0 +1,142 @@
+import os
+import gzip
+import json
+import time
+import uuid
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+# Configure Logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SERPAPI_CACHE_DIR = os.getenv("SERPAPI_CACHE_DIR", os.path.join(BASE_DIR, "../cache/serpapi"))
+SERPAPI_CACHE_ENABLED = os.getenv("SERPAPI_CACHE_ENABLED", "true").lower() == "true"
+SERPAPI_CACHE_TTL_SECONDS = int(os.getenv("SERPAPI_CACHE_TTL_SECONDS", str(6 * 3600)))
+# Serve only from the cache and never touch the network (re-run filtering/scoring on past results)
+SERPAPI_REPLAY = os.getenv("SERPAPI_REPLAY", "false").lower() == "true"
+
+# Parameters that do not change the results and must not split the cache
+IGNORED_PARAMS = {"api_key", "timeout", "no_cache", "async"}
+
+
+class SerpApiCacheMiss(LookupError):
+    """Raised in replay mode when a search has no cached response."""
+
+
+class CachedResponse:
+    """A cached SerpAPI response and the validators needed to revalidate it."""
+
+    def __init__(self, response: Dict[str, Any], fetched_at: float, etag: Optional[str] = None,
+                 last_modified: Optional[str] = None):
+        self.response = response
+        self.fetched_at = fetched_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def is_fresh(self, ttl: int) -> bool:
+        return self.age() < ttl
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for a revalidation request."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class SerpApiCache:
+    """
+    On-disk SerpAPI response cache.
+
+    Responses are keyed on a hash of the engine, query and every other parameter
+    that shapes the results (the API key and transport options are ignored), and
+    stored as one gzip-compressed JSON file per search, sharded by key prefix.
+    Writes go to a temporary file and are renamed into place, so concurrent
+    fan-out threads and interrupted runs never leave a torn entry behind.
+    """
+
+    def __init__(self, cache_dir: str = SERPAPI_CACHE_DIR, default_ttl: int = SERPAPI_CACHE_TTL_SECONDS):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._stats = {"fresh_hits": 0, "revalidated": 0, "stale_hits": 0, "misses": 0, "writes": 0}
+
+    @staticmethod
+    def key(params: Dict[str, Any]) -> str:
+        """Stable cache key for a search's result-shaping parameters."""
+        relevant = {k: str(v) for k, v in params.items() if k not in IGNORED_PARAMS}
+        payload = json.dumps(relevant, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json.gz")
+
+    def count(self, stat: str):
+        with self._lock:
+            self._stats[stat] += 1
+
+    def get(self, params: Dict[str, Any]) -> Optional[CachedResponse]:
+        """Return the cached response for a search regardless of age, or None."""
+        try:
+            with gzip.open(self._path(self.key(params)), "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logging.warning(f"⚠️ Ignoring unreadable SerpAPI cache entry for {params.get('q')}: {e}")
+            return None
+        return CachedResponse(entry["response"], entry["fetched_at"], entry.get("etag"), entry.get("last_modified"))
+
+    def set(self, params: Dict[str, Any], response: Dict[str, Any], etag: Optional[str] = None,
+            last_modified: Optional[str] = None, fetched_at: Optional[float] = None):
+        """Store (or refresh) the response for a search."""
+        path = self._path(self.key(params))
+        entry = {
+            "params": {k: v for k, v in params.items() if k not in IGNORED_PARAMS},
+            "fetched_at": fetched_at or time.time(),
+            "etag": etag,
+            "last_modified": last_modified,
+            "response": response
+        }
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump(entry, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+            self.count("writes")
+        except OSError as e:
+            logging.warning(f"⚠️ SerpAPI cache write failed for {params.get('q')}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def touch(self, params: Dict[str, Any], cached: CachedResponse):
+        """Mark a revalidated entry as fresh again without re-downloading it."""
+        self.set(params, cached.response, cached.etag, cached.last_modified)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+
+_cache: Optional[SerpApiCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_serpapi_cache() -> Optional[SerpApiCache]:
+    """Return the process-wide SerpAPI cache, or None when caching is disabled."""
+    global _cache
+    if not (SERPAPI_CACHE_ENABLED or SERPAPI_REPLAY):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = SerpApiCache()
+        return _cache
@@ -0,0 +1,187 @@
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from scrapers.rate_limit import TokenBucket
+from scrapers.serpapi_cache import SerpApiCache, SerpApiCacheMiss, get_serpapi_cache, SERPAPI_REPLAY
+
+# Configure Logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+SERPAPI_URL = "https://serpapi.com/search"
+SERPAPI_MAX_WORKERS = int(os.getenv("SERPAPI_MAX_WORKERS", "4"))  # Concurrent SerpAPI requests per fan-out
+SERPAPI_PAGES_PER_QUERY = int(os.getenv("SERPAPI_PAGES_PER_QUERY", "1"))
+SERPAPI_MAX_PAGE_OFFSET = int(os.getenv("SERPAPI_MAX_PAGE_OFFSET", "5"))  # Deepest page checkpoints advance to before wrapping
+SERPAPI_TIMEOUT = 10
+
+
+class SerpApiClient:
+    """
+    Shared SerpAPI client: one pooled keep-alive HTTP session, concurrent fan-out
+    across queries and result pages, and pacing through a token bucket rather
+    than fixed sleeps.
+
+    Responses go through the on-disk cache (see scrapers.serpapi_cache): fresh
+    entries are served without a request or a rate-limit token, stale ones are
+    revalidated conditionally, and in replay mode the network is never used.
+    """
+
+    def __init__(self, api_key: str, max_workers: int = SERPAPI_MAX_WORKERS,
+                 cache: Optional[SerpApiCache] = None, replay: bool = SERPAPI_REPLAY):
+        self.api_key = api_key
+        self.max_workers = max_workers
+        self.cache = cache
+        self.replay = replay
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=max(max_workers, 10),
+            max_retries=Retry(total=2, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["GET"])
+        )
+        self._session.mount("https://", adapter)
+
+    def search(self, params: Dict[str, Any], rate_limiter: Optional[TokenBucket] = None,
+               ttl: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Run a single SerpAPI search, served from the cache when possible.
+
+        Args:
+            params: SerpAPI parameters (engine, q, num, start, ...); the API key is added
+            rate_limiter: Token bucket to acquire from before sending a network request
+            ttl: Seconds a cached response for this search stays fresh (cache default if None)
+
+        Returns:
+            The decoded JSON response
+
+        Raises:
+            requests.RequestException: If the request fails and nothing is cached
+            SerpApiCacheMiss: In replay mode, if the search was never cached
+        """
+        cache = self.cache
+        cached = cache.get(params) if cache else None
+        if cache and ttl is None:
+            ttl = cache.default_ttl
+
+        if self.replay:
+            if cached is None:
+                if cache:
+                    cache.count("misses")
+                raise SerpApiCacheMiss(f"No cached SerpAPI response for {params.get('q')} (replay mode)")
+            cache.count("fresh_hits" if cached.is_fresh(ttl) else "stale_hits")
+            return cached.response
+
+        if cached and cached.is_fresh(ttl):
+            cache.count("fresh_hits")
+            return cached.response
+
+        if rate_limiter:
+            rate_limiter.acquire()
+        try:
+            response = self._session.get(
+                SERPAPI_URL,
+                params={**params, "api_key": self.api_key},
+                headers=cached.conditional_headers() if cached else None,
+                timeout=SERPAPI_TIMEOUT
+            )
+            if response.status_code == 304 and cached:
+                cache.touch(params, cached)
+                cache.count("revalidated")
+                return cached.response
+            response.raise_for_status()
+            data = response.json()
+        except (requests.RequestException, ValueError) as e:
+            if cached is None:
+                raise
+            # Stale results beat no results when SerpAPI is down or out of quota
+            logging.warning(f"⚠️ SerpAPI request failed for {params.get('q')}, serving cached response "
+                            f"from {int(cached.age())}s ago: {e}")
+            cache.count("stale_hits")
+            return cached.response
+
+        if cache:
+            cache.count("misses")
+            if "error" not in data:
+                cache.set(params, data, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return data
+
+    def _search_page(self, params: Dict[str, Any], rate_limiter: Optional[TokenBucket],
+                     ttl: Optional[int]) -> List[Dict[str, Any]]:
+        try:
+            return self.search(params, rate_limiter, ttl).get("organic_results", [])
+        except (requests.RequestException, ValueError, SerpApiCacheMiss) as e:
+            logging.error(f"❌ SerpAPI request failed for {params.get('q')} (start={params.get('start', 0)}): {e}")
+            return []
+
+    def search_many(self, queries: List[str], params: Optional[Dict[str, Any]] = None,
+                    pages: int = SERPAPI_PAGES_PER_QUERY, rate_limiter: Optional[TokenBucket] = None,
+                    ttl: Optional[int] = None, start_pages: Optional[Dict[str, int]] = None
+                    ) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Fetch every query (and `pages` result pages per query) concurrently.
+
+        Results are yielded per query, in query order, as soon as that query's
+        pages are in. Closing the generator early (e.g. once enough leads have
+        been collected) cancels the requests that have not started yet.
+
+        Args:
+            queries: Search queries
+            params: Extra SerpAPI parameters shared by every query
+            pages: Result pages per query, fetched in parallel via start/num
+            rate_limiter: Token bucket every network request acquires from
+            ttl: Seconds cached responses for these queries stay fresh
+            start_pages: Per-query page offset to start from (e.g. from a checkpoint)
+
+        Yields:
+            (query, organic_results) tuples
+        """
+        params = dict(params or {})
+        page_size = int(params.get("num", 10))
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="serpapi")
+        try:
+            futures = []
+            for query in queries:
+                first_page = (start_pages or {}).get(query, 0)
+                for page in range(first_page, first_page + pages):
+                    page_params = {**params, "q": query}
+                    if page:
+                        page_params.update(start=page * page_size, num=page_size)
+                    futures.append(executor.submit(self._search_page, page_params, rate_limiter, ttl))
+
+            for index, query in enumerate(queries):
+                results = []
+                for future in futures[index * pages:(index + 1) * pages]:
+                    results.extend(future.result())
+                yield query, results
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def next_start_page(start_page: int, pages: int, found_results: bool) -> int:
+    """
+    Page offset a query's checkpoint should resume from next run: past the pages
+    just read, or back to the first page once results run out or the offset
+    reaches SERPAPI_MAX_PAGE_OFFSET.
+    """
+    next_page = start_page + pages
+    if not found_results or next_page >= SERPAPI_MAX_PAGE_OFFSET:
+        return 0
+    return next_page
+
+
+_clients: Dict[str, SerpApiClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_serpapi_client(api_key: str) -> SerpApiClient:
+    """Return the process-wide client (and connection pool) for an API key."""
+    with _clients_lock:
+        if api_key not in _clients:
+            _clients[api_key] = SerpApiClient(api_key, cache=get_serpapi_cache())
+        return _clients[api_key]
@@ -0,0 +1,68 @@
+import os
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+# Configure Logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # lead_gen_tool/
+GOOGLE_SHEETS_CREDENTIALS = os.getenv(
+    "GOOGLE_SHEETS_CREDENTIALS", os.path.join(BASE_DIR, "config", "google_sheets_credentials.json")
+)
+SHEETS_SCOPE = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+
+_client = None
+_worksheets: Dict[str, Any] = {}
+_lock = threading.Lock()
+
+
+def get_sheets_client():
+    """
+    Return the process-wide gspread client, authorizing on first use.
+
+    Raises:
+        FileNotFoundError: If the service account credentials file is missing
+    """
+    global _client
+    with _lock:
+        if _client is None:
+            if not os.path.exists(GOOGLE_SHEETS_CREDENTIALS):
+                raise FileNotFoundError(f"Google Sheets credentials file not found: {GOOGLE_SHEETS_CREDENTIALS}")
+            # gspread and oauth2client are only imported once Sheets is actually used
+            import gspread
+            from oauth2client.service_account import ServiceAccountCredentials
+
+            creds = ServiceAccountCredentials.from_json_keyfile_name(GOOGLE_SHEETS_CREDENTIALS, SHEETS_SCOPE)
+            _client = gspread.authorize(creds)
+            logging.info("✅ Connected to Google Sheets.")
+        return _client
+
+
+def open_worksheet(sheet_name: str, header: Optional[List[str]] = None):
+    """
+    Return the first worksheet of a spreadsheet, opened once per process.
+
+    Args:
+        sheet_name: Spreadsheet title
+        header: If given, a missing spreadsheet is created with this header row
+
+    Raises:
+        gspread.exceptions.SpreadsheetNotFound: If the spreadsheet does not exist and no header was given
+    """
+    worksheet = _worksheets.get(sheet_name)
+    if worksheet is not None:
+        return worksheet
+
+    import gspread
+
+    client = get_sheets_client()
+    try:
+        worksheet = client.open(sheet_name).sheet1
+    except gspread.exceptions.SpreadsheetNotFound:
+        if header is None:
+            raise
+        worksheet = client.create(sheet_name).sheet1
+        worksheet.append_row(header)
+    with _lock:
+        return _worksheets.setdefault(sheet_name, worksheet)
@@ -0,0 +1,220 @@
+import os
+import time
+import queue
+import atexit
+import random
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+# Configure Logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+SHEETS_CHUNK_SIZE = int(os.getenv("SHEETS_CHUNK_SIZE", "500"))  # Rows per append_rows request
+SHEETS_FLUSH_SECONDS = float(os.getenv("SHEETS_FLUSH_SECONDS", "2"))  # How long to wait for a chunk to fill
+SHEETS_MAX_RETRIES = int(os.getenv("SHEETS_MAX_RETRIES", "6"))
+SHEETS_BACKOFF_BASE_SECONDS = 2.0
+SHEETS_BACKOFF_MAX_SECONDS = 64.0
+# After a failed connect (missing credentials, unknown sheet...), chunks are dropped without retrying this long
+SHEETS_CONNECT_COOLDOWN_SECONDS = float(os.getenv("SHEETS_CONNECT_COOLDOWN_SECONDS", "300"))
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_STOP = object()
+
+
+class SheetsSink:
+    """
+    Write-behind Google Sheets writer.
+
+    Rows are queued without blocking the caller and appended by a background
+    thread in chunks of up to `chunk_size` rows per append_rows request. Quota
+    (429) and transient 5xx/network errors are retried with jittered exponential
+    backoff. A failed connect is a configuration problem rather than a transient
+    one: the chunk is dropped at once and so are the following ones for
+    SHEETS_CONNECT_COOLDOWN_SECONDS, so the queue keeps draining. close() (also
+    run at interpreter exit) flushes whatever is still queued.
+    """
+
+    def __init__(self, name: str, connect: Callable[[], Any], chunk_size: int = SHEETS_CHUNK_SIZE,
+                 flush_interval: float = SHEETS_FLUSH_SECONDS,
+                 on_written: Optional[Callable[[List[List[Any]]], None]] = None,
+                 on_dropped: Optional[Callable[[List[List[Any]]], None]] = None):
+        """
+        Args:
+            name: Sheet name, used in logs
+            connect: Returns the gspread worksheet (or None on failure); called lazily
+                     from the background thread so callers never wait on it
+            chunk_size: Maximum rows per Sheets request
+            flush_interval: Seconds to wait for more rows before sending a partial chunk
+            on_written: Called from the background thread with each chunk once it is in the sheet
+            on_dropped: Called from the background thread with each chunk given up on
+        """
+        self.name = name
+        self.connect = connect
+        self.on_written = on_written
+        self.on_dropped = on_dropped
+        self.chunk_size = chunk_size
+        self.flush_interval = flush_interval
+        self._worksheet = None
+        self._connect_retry_at = 0.0  # Monotonic time before which connecting is not retried
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._stats = {"queued": 0, "written": 0, "requests": 0, "retries": 0, "dropped": 0}
+        self._thread = threading.Thread(target=self._run, name="sheets-sink", daemon=True)
+        self._thread.start()
+
+    def append(self, row: List[Any]):
+        """Queue one row."""
+        self.append_many([row])
+
+    def append_many(self, rows: Iterable[List[Any]]):
+        """Queue rows; returns immediately."""
+        count = 0
+        for row in rows:
+            self._queue.put(list(row))
+            count += 1
+        with self._lock:
+            self._stats["queued"] += count
+
+    def _count(self, stat: str, amount: int = 1):
+        with self._lock:
+            self._stats[stat] += amount
+
+    def _next_chunk(self) -> Tuple[List[List[Any]], bool]:
+        """Block for the first row, then gather more until the chunk is full or the window closes."""
+        item = self._queue.get()
+        if item is _STOP:
+            return [], True
+        chunk = [item]
+        deadline = time.monotonic() + self.flush_interval
+        while len(chunk) < self.chunk_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return chunk, True
+            chunk.append(item)
+        return chunk, False
+
+    def _run(self):
+        while True:
+            chunk, stop = self._next_chunk()
+            if chunk:
+                self._write(chunk)
+            # One task_done per queued item, including the stop marker
+            for _ in range(len(chunk) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _notify(self, callback: Optional[Callable[[List[List[Any]]], None]], rows: List[List[Any]]):
+        if callback:
+            try:
+                callback(rows)
+            except Exception as e:
+                logging.error(f"❌ {self.name} sink callback failed: {e}")
+
+    def _drop(self, rows: List[List[Any]], reason: str):
+        logging.error(f"❌ Dropped {len(rows)} rows for {self.name}: {reason}")
+        self._count("dropped", len(rows))
+        self._notify(self.on_dropped, rows)
+
+    def _connected(self) -> bool:
+        """Connect on first use; a failure is not retried until the cooldown has passed."""
+        if self._worksheet is not None:
+            return True
+        if time.monotonic() < self._connect_retry_at:
+            return False
+        try:
+            self._worksheet = self.connect()
+        except Exception as e:
+            logging.error(f"❌ Could not connect to {self.name}: {e}")
+        if self._worksheet is None:
+            self._connect_retry_at = time.monotonic() + SHEETS_CONNECT_COOLDOWN_SECONDS
+            return False
+        return True
+
+    def _write(self, rows: List[List[Any]]):
+        if not self._connected():
+            self._drop(rows, f"no connection (retrying the connection after {SHEETS_CONNECT_COOLDOWN_SECONDS:.0f}s)")
+            return
+        for attempt in range(SHEETS_MAX_RETRIES + 1):
+            try:
+                self._worksheet.append_rows(rows)
+                self._count("requests")
+                self._count("written", len(rows))
+                logging.debug(f"📄 Appended {len(rows)} rows to {self.name}")
+                self._notify(self.on_written, rows)
+                return
+            except Exception as e:
+                from gspread.exceptions import APIError  # Loaded by connect() already
+
+                status = getattr(getattr(e, "response", None), "status_code", None)
+                # Network errors (requests' included, they are OSErrors) and quota/5xx responses are transient
+                retryable = isinstance(e, OSError) or (isinstance(e, APIError) and status in RETRYABLE_STATUS_CODES)
+                if not retryable or attempt == SHEETS_MAX_RETRIES:
+                    self._drop(rows, f"{e} (after {attempt + 1} attempts)")
+                    return
+                delay = min(SHEETS_BACKOFF_MAX_SECONDS, SHEETS_BACKOFF_BASE_SECONDS * 2 ** attempt)
+                delay = random.uniform(delay / 2, delay)
+                logging.warning(f"⚠️ Sheets write to {self.name} failed ({e}). Retrying in {delay:.1f}s...")
+                self._count("retries")
+                time.sleep(delay)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued row has been written (or dropped).
+
+        Returns:
+            False if the timeout expired first
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = 60):
+        """Flush the queue and stop the background thread."""
+        if not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        pending = self._queue.qsize()
+        if pending:
+            logging.error(f"❌ {self.name}: {pending} rows were still queued at shutdown")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["pending"] = self._queue.unfinished_tasks
+        return stats
+
+
+_sinks: Dict[str, SheetsSink] = {}
+_sinks_lock = threading.Lock()
+
+
+def get_sheets_sink(name: str, connect: Callable[[], Any], **options) -> SheetsSink:
+    """Return the process-wide sink for a sheet, creating it (with SheetsSink `options`) on first use."""
+    with _sinks_lock:
+        if name not in _sinks:
+            _sinks[name] = SheetsSink(name, connect, **options)
+        return _sinks[name]
+
+
+def close_sheets_sinks(timeout: Optional[float] = 60):
+    """Final flush of every sink; runs at interpreter exit and on API shutdown."""
+    with _sinks_lock:
+        sinks = list(_sinks.values())
+    for sink in sinks:
+        sink.close(timeout)
+
+
+atexit.register(close_sheets_sinks)
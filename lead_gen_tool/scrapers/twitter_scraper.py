@@ -1,24 +1,27 @@
 import time
 import logging
-import requests
-import gspread
-from pymongo import MongoClient
-from oauth2client.service_account import ServiceAccountCredentials
 import os
 import re
-from typing import List, Dict, Any, Optional
+from collections import deque
+from typing import List, Dict, Any, Iterator, Optional
+from scrapers.competitor_filter import TWITTER_COMPETITOR_MATCHER, match_offering_transformation
+from scrapers.rate_limit import get_rate_limiter
+from scrapers.serpapi_client import get_serpapi_client, next_start_page, SERPAPI_PAGES_PER_QUERY
+from scrapers.serpapi_cache import SERPAPI_REPLAY
+from scrapers.sheets_sink import get_sheets_sink
+from scrapers.sheets_client import GOOGLE_SHEETS_CREDENTIALS, open_worksheet
+from scrapers.dedup import canonicalize_url
+from database.lead_writer import LeadWriter
+from database.checkpoints import CheckpointStore, CHECKPOINTS_ENABLED
+from database.mongodb import get_db
 
 # Configure Advanced Logging
 logging.basicConfig(level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s")
 
-# MongoDB Setup
-MONGO_URI = "mongodb://localhost:27017/"
-client = MongoClient(MONGO_URI)
-db = client["lead_generator"]
-leads_collection = db["leads"]
+# MongoDB Setup (shared client, connected on first use)
+# Replay runs read back cached responses from page 0 and leave the live checkpoints alone
+checkpoints = CheckpointStore(enabled=CHECKPOINTS_ENABLED and not SERPAPI_REPLAY)
 
-# Define Explicit Path for Google Sheets Credentials
-GOOGLE_SHEETS_CREDENTIALS = r"D:\SCRIPTS\lead_gen_tool\config\google_sheets_credentials.json"
 SHEET_NAME = "Peak Transformation Coaching Leads"
 
 def connect_to_google_sheets():
@@ -27,13 +30,7 @@ def connect_to_google_sheets():
         return None
 
     try:
-        creds = ServiceAccountCredentials.from_json_keyfile_name(
-            GOOGLE_SHEETS_CREDENTIALS, 
-            ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-        )
-        client = gspread.authorize(creds)
-        logging.info("✅ Connected to Google Sheets.")
-        return client.open(SHEET_NAME).sheet1
+        return open_worksheet(SHEET_NAME)
     except Exception as e:
         logging.error(f"⚠️ Error connecting to Google Sheets: {e}")
         return None
@@ -50,27 +47,9 @@ SEARCH_QUERIES = [
     "site:twitter.com \"Career anxiety\""
 ]
 
-# Enhanced exclusion keywords to filter out competitors and coaches
-COMPETITOR_KEYWORDS = [
-    # Personal coaching terms
-    "coach", "coaching", "mentor", "mentoring", "consultant", "consulting",
-    "trainer", "advisor", "strategist", "counselor", "therapist",
-    
-    # Specific coaching types
-    "life coach", "career coach", "business coach", "personal coach", 
-    "executive coach", "leadership coach", "mindset coach", "transformation coach",
-    "wellness coach", "health coach", "success coach", "performance coach",
-    
-    # Marketing phrases used by coaches
-    "grow your", "scale your", "transform your", "unlock your potential",
-    "achieve your goals", "overcome obstacles", "mindfulness practice",
-    "self-improvement", "personal growth", "life changing", "breakthrough",
-    
-    # Call-to-action phrases
-    "free webinar", "free consultation", "book a call", "schedule a session",
-    "DM me for", "link in bio", "join my", "follow for more tips", 
-    "click the link", "sign up now", "limited spots", "exclusive offer"
-]
+# Cached search responses: new tweets surface within hours, profile bios rarely change
+SEARCH_CACHE_TTL = 3 * 3600
+BIO_CACHE_TTL = 7 * 24 * 3600
 
 def is_competitor_content(text: str) -> bool:
     """
@@ -83,36 +62,14 @@ def is_competitor_content(text: str) -> bool:
     Returns:
         bool: True if the content appears to be from a competitor, False otherwise
     """
-    text = text.lower()
-    
-    # Quick check for common coaching phrases
-    for keyword in COMPETITOR_KEYWORDS:
-        if keyword in text:
-            return True
-    
-    # Check for coach in bio patterns
-    coach_patterns = [
-        r"(^|\s)coach(\s|$|ing|ed|es)",
-        r"(^|\s)mentor(\s|$|ing|ed|s)",
-        r"(career|life|business|executive)\s+(coach|mentor|consultant)",
-        r"helping (people|professionals|individuals|clients) (to )?(\w+ ){1,3}(goals|dreams|potential)",
-        r"transform(ing|ative)? (your|lives)",
-        r"I help \w+ (to )?(\w+ )+",  # "I help professionals to achieve their goals" pattern
-    ]
-    
-    for pattern in coach_patterns:
-        if re.search(pattern, text):
-            return True
+    # Single-pass check for common coaching phrases and coach-in-bio patterns
+    if TWITTER_COMPETITOR_MATCHER.match(text):
+        return True
     
     # Check bios that contain both offering + transformation words
-    offering_terms = ["offer", "provide", "help", "guide", "teach", "support", "coach", "mentor"]
-    transformation_terms = ["transform", "improve", "change", "develop", "grow", "achieve", "succeed"]
-    
-    if any(term in text for term in offering_terms) and any(term in text for term in transformation_terms):
-        # Look for personal development context
-        personal_dev_terms = ["life", "career", "personal", "professional", "mindset", "growth", "journey"]
-        if any(term in text for term in personal_dev_terms):
-            return True
+    # in a personal development context
+    if match_offering_transformation(text):
+        return True
     
     return False
 
@@ -126,71 +83,97 @@ def scrape_serpapi_for_tweets(max_tweets: int = 50) -> List[Dict[str, Any]]:
     Returns:
         List of collected tweet data
     """
+    return list(iter_serpapi_tweets(max_tweets))
+
+def iter_serpapi_tweets(max_tweets: int = 50) -> Iterator[Dict[str, Any]]:
+    """
+    Generator version of scrape_serpapi_for_tweets: yields each new tweet as
+    soon as it has been stored, so scoring can start mid-scrape.
+    """
     logging.debug("Starting SerpAPI Google Search for Tweets with Competitor Filtering")
-    sheet = connect_to_google_sheets()
-    if not sheet:
-        logging.error("❌ Cannot proceed with Twitter scraping. Google Sheets connection failed.")
-        return []
+    sheet = get_sheets_sink(SHEET_NAME, connect_to_google_sheets)  # Write-behind; never blocks the scrape
 
-    tweets_collected = []
-    total_count = 0
+    found = 0
+    stored = deque()  # Filled by the writer's flushes, drained by this generator
     filtered_count = 0
 
-    for query in SEARCH_QUERIES:
-        if total_count >= max_tweets:
-            break
-        
-        logging.info(f"🔍 Searching Google for tweets via SerpAPI: {query}")
-        search_url = "https://serpapi.com/search"
-        params = {"engine": "google", "q": query, "api_key": SERPAPI_KEY, "num": 20}
-        
-        try:
-            response = requests.get(search_url, params=params, timeout=10)
-            response.raise_for_status()
-        except requests.RequestException as e:
-            logging.error(f"❌ SerpAPI request failed: {e}")
-            continue
+    # All queries (and result pages) are fetched concurrently over one pooled
+    # session, paced by the Twitter request budget instead of fixed sleeps
+    # Each query resumes from the result page its checkpoint reached last run
+    logging.info(f"🔍 Searching Google for tweets via SerpAPI: {len(SEARCH_QUERIES)} queries")
+    start_pages = {
+        query: checkpoint.get("next_page", 0)
+        for query, checkpoint in checkpoints.get_many("serpapi_twitter", SEARCH_QUERIES).items()
+    }
+    searches = get_serpapi_client(SERPAPI_KEY).search_many(
+        SEARCH_QUERIES, {"engine": "google", "num": 20}, rate_limiter=get_rate_limiter("twitter"),
+        ttl=SEARCH_CACHE_TTL, start_pages=start_pages
+    )
+
+    def save_new_tweets(inserted):
+        nonlocal found
+        sheet.append_many([[lead["url"], lead["text"]] for lead in inserted])
+        found += len(inserted)
+        for lead in inserted:
+            stored.append(lead)
+            logging.info(f"✅ Saved Tweet: {lead['url']}")
+
+    # New tweets are upserted in batches; the sheet is updated once per batch
+    with LeadWriter(get_db()["leads"], on_insert=save_new_tweets) as writer:
+        for query, results in searches:
+            if found >= max_tweets:
+                break
         
-        results = response.json().get("organic_results", [])
-        logging.debug(f"SerpAPI returned {len(results)} results for {query}")
+            logging.debug(f"SerpAPI returned {len(results)} results for {query}")
         
-        for result in results:
-            tweet_url = result.get("link")
-            tweet_text = result.get("title", "")
-            tweet_snippet = result.get("snippet", "")
+            for result in results:
+                tweet_url = canonicalize_url(result.get("link", ""))  # x.com and twitter.com links are one tweet
+                tweet_text = result.get("title", "")
+                tweet_snippet = result.get("snippet", "")
             
-            # Combine title and snippet for better context
-            full_content = f"{tweet_text} {tweet_snippet}"
+                # Combine title and snippet for better context
+                full_content = f"{tweet_text} {tweet_snippet}"
             
-            if "twitter.com" in tweet_url and "/status/" in tweet_url:
-                # Apply AI-powered competitor filtering
-                if is_competitor_content(full_content):
-                    logging.info(f"🚫 Filtered competitor content: {tweet_text[:50]}...")
-                    filtered_count += 1
-                    continue
+                if "twitter.com" in tweet_url and "/status/" in tweet_url:
+                    # Apply AI-powered competitor filtering
+                    if is_competitor_content(full_content):
+                        logging.info(f"🚫 Filtered competitor content: {tweet_text[:50]}...")
+                        filtered_count += 1
+                        continue
                 
-                lead = {
-                    "platform": "twitter", 
-                    "url": tweet_url, 
-                    "text": tweet_text,
-                    "content": full_content,
-                    "filtered_date": time.strftime("%Y-%m-%d")
-                }
+                    lead = {
+                        "platform": "twitter", 
+                        "url": tweet_url, 
+                        "text": tweet_text,
+                        "content": full_content,
+                        "filtered_date": time.strftime("%Y-%m-%d")
+                    }
                 
-                if not leads_collection.find_one({"url": tweet_url}):
-                    leads_collection.insert_one(lead)
-                    sheet.append_row([tweet_url, tweet_text])
-                    tweets_collected.append(lead)
-                    total_count += 1
-                    logging.info(f"✅ Saved Tweet: {tweet_url}")
+                    writer.add(lead)
                 
-                if total_count >= max_tweets:
-                    break
-            
-        time.sleep(5)  # Delay to prevent hitting SerpAPI limits
-    
-    logging.info(f"✅ Scraped {total_count} relevant tweets via SerpAPI. Filtered out {filtered_count} competitor tweets.")
-    return tweets_collected
+                    # Only flush early to find out whether the limit has really been reached
+                    if found + writer.pending >= max_tweets:
+                        writer.flush()
+                        if found >= max_tweets:
+                            break
+
+                while stored:
+                    yield stored.popleft()
+
+            if found >= max_tweets:
+                break  # Stopped mid-query, so its checkpoint stays where it was
+
+            # Query finished: persist its leads, then move its checkpoint to the next page
+            writer.flush()
+            checkpoints.save("serpapi_twitter", query, {
+                "next_page": next_start_page(start_pages.get(query, 0), SERPAPI_PAGES_PER_QUERY, bool(results))
+            })
+            while stored:
+                yield stored.popleft()
+
+    while stored:
+        yield stored.popleft()
+    logging.info(f"✅ Scraped {found} relevant tweets via SerpAPI. Filtered out {filtered_count} competitor tweets.")
 
 def analyze_profile_bio(profile_url: str) -> Optional[str]:
     """
@@ -211,13 +194,10 @@ def analyze_profile_bio(profile_url: str) -> Optional[str]:
     username = username_match.group(1)
     
     # Try to get profile bio via Google search
-    search_url = "https://serpapi.com/search"
-    params = {"engine": "google", "q": f"site:twitter.com {username} bio", "api_key": SERPAPI_KEY}
+    params = {"engine": "google", "q": f"site:twitter.com {username} bio"}
     
     try:
-        response = requests.get(search_url, params=params, timeout=10)
-        response.raise_for_status()
-        results = response.json().get("organic_results", [])
+        results = get_serpapi_client(SERPAPI_KEY).search(params, get_rate_limiter("twitter"), BIO_CACHE_TTL).get("organic_results", [])
         
         if results:
             # Look for bio in the snippet